@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmarks des composants du YouTube to Spotify automator
+
+Usage:
+    python benchmark.py [--titles 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from playlist_naming import PlaylistNamingEngine
+
+
+SAMPLE_TITLES = [
+    "Rema - DND (Official Music Video)",
+    "Omah Lay - Understand (Official Music Video)",
+    "Fireboy DML, Asake - Bandana (Official Video)",
+    "Burna Boy - Common Person [Official Music Video]",
+    "Asake - Joha (Official Video) #afrobeats",
+    "Wizkid - Ghetto Love (Live Performance)",
+    "Tayc - Forévà (Clip Officiel)",
+    "Asake & Tiakola - BADMAN GANGSTA",
+    "Kabza De Small - Amapiano Mix 2024",
+    "Central Cee - Drill Freestyle",
+]
+
+
+def make_titles(count: int) -> list:
+    """Génère une playlist synthétique de `count` titres."""
+    rng = random.Random(42)
+    return [f"{rng.choice(SAMPLE_TITLES)} {i}" for i in range(count)]
+
+
+def naive_keyword_scores(engine: PlaylistNamingEngine, titles: list) -> dict:
+    """Ancien algorithme: `keyword in all_text` pour chaque mot-clé."""
+    all_text = ' '.join(titles).lower()
+    scores = {}
+    for genre, keywords in engine.genre_keywords.items():
+        scores[genre] = sum(1 for keyword in keywords if keyword in all_text)
+    for context, keywords in engine.context_keywords.items():
+        scores[context] = int(any(keyword in all_text for keyword in keywords))
+    return scores
+
+
+def bench_analyze_tracks(title_count: int, extra_keywords: int = 5000) -> None:
+    """Compare l'analyse naïve et l'automate sur une grande taxonomie."""
+    print(f"\n🧠 analyze_tracks - {title_count} titres, +{extra_keywords} mots-clés")
+    print("-" * 50)
+
+    titles = make_titles(title_count)
+    engine = PlaylistNamingEngine()
+
+    # Taxonomie élargie (mots-clés synthétiques répartis sur les genres)
+    genres = list(engine.genre_keywords)
+    for i in range(extra_keywords):
+        engine.genre_keywords[genres[i % len(genres)]].append(f"kw{i}x")
+
+    start = time.perf_counter()
+    engine.keyword_matcher = engine._build_keyword_matcher()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_keyword_scores(engine, titles)
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.analyze_tracks(titles)
+    automaton_time = time.perf_counter() - start
+
+    print(f"Construction de l'automate: {build_time * 1000:.1f} ms")
+    print(f"Recherche naïve:            {naive_time * 1000:.1f} ms")
+    print(f"Automate (analyse complète): {automaton_time * 1000:.1f} ms")
+    print(f"Gain: x{naive_time / max(automaton_time, 1e-9):.1f}")
+
+
+def main():
+    """Lance les benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmarks des composants")
+    parser.add_argument('--titles', type=int, default=10000, help='Nombre de titres simulés')
+    args = parser.parse_args()
+
+    print("⏱️  YouTube to Spotify Automator - Benchmarks")
+    print("=" * 50)
+
+    bench_analyze_tracks(args.titles)
+
+
+if __name__ == "__main__":
+    main()
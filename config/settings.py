@@ -16,6 +16,16 @@ SPOTIFY_CONFIG = {
     'relevance_threshold': 0.3,  # Minimum relevance score to accept a match
     'max_search_queries': 5,  # Maximum number of search variations per title
     'rate_limit_delay': 0.1,  # Delay between API calls in seconds
+    'max_concurrency': 8,  # Concurrent HTTP requests for AsyncSpotifyManager
+    'token_cache_path': '.spotify_cache',  # OAuth token cache file
+    'token_refresh_margin': 300,  # Refresh the token this many seconds before it expires
+    'market': None,  # Market used to check cached tracks are playable (e.g. 'FR'), None = no check
+    'duration_tolerance': 0.3,  # A track may run up to 30% longer than the video...
+    'duration_overrun': 1.0,  # ...and the video up to 100% longer than the track (music video scenes)...
+    'duration_slack': 20,  # ...or either by this many seconds, whichever is larger (video intros/outros)
+    'duration_weight': 0.15,  # Share of the relevance score given to duration agreement
+    'duration_prune': False,  # Drop candidates outside the tolerance instead of only lowering their score
+    'early_accept': True,  # Stop sending queries once a candidate agrees on title and duration
 }
 
 # Title cleaning settings
@@ -51,3 +61,75 @@ ERROR_CONFIG = {
     'continue_on_error': True,  # Continue processing even if some tracks fail
     'log_errors': True,  # Log errors to file
 }
+
+# Match cache (--cache)
+CACHE_CONFIG = {
+    'negative_ttl': 86400,  # Seconds before a title that found nothing is searched again
+    'negative_backoff': 2.0,  # Multiply the re-check delay after each new miss
+    'negative_max_ttl': 30 * 86400,  # Upper bound for the re-check delay
+}
+
+
+# Performance profiles (--profile): trade recall against API calls and latency.
+# Each profile overrides the sections above. 'balanced' restores the values the modules
+# used before the settings were wired in, so the default run behaves as it always did.
+PERFORMANCE_PROFILES = {
+    'fast': {
+        'spotify': {
+            'search_limit': 5,
+            'relevance_threshold': 0.35,
+            'max_search_queries': 2,
+            'rate_limit_delay': 0.0,
+            'duration_prune': True,
+        },
+    },
+    'balanced': {
+        'youtube': {
+            'max_duration': None,
+            'skip_shorts': False,
+            'extraction_timeout': None,
+        },
+        'spotify': {
+            'search_limit': 5,
+            'rate_limit_delay': 0.0,
+        },
+    },
+    'thorough': {
+        'youtube': {
+            'min_duration': 20,
+            'max_duration': 900,
+        },
+        'spotify': {
+            'search_limit': 20,
+            'relevance_threshold': 0.25,
+            'max_search_queries': 8,
+            'rate_limit_delay': 0.2,
+        },
+    },
+}
+
+DEFAULT_PROFILE = 'balanced'
+
+
+def load_config(profile: str = DEFAULT_PROFILE) -> dict:
+    """
+    Build the runtime configuration for a performance profile.
+
+    Args:
+        profile: Profile name ('fast', 'balanced' or 'thorough')
+
+    Returns:
+        Dict {'profile', 'youtube', 'spotify', 'cleaning', 'errors', 'cache'} passed to the modules
+    """
+    if profile not in PERFORMANCE_PROFILES:
+        raise ValueError(f"Unknown profile: {profile} (choices: {', '.join(PERFORMANCE_PROFILES)})")
+
+    overrides = PERFORMANCE_PROFILES[profile]
+    return {
+        'profile': profile,
+        'youtube': {**YOUTUBE_CONFIG, **overrides.get('youtube', {})},
+        'spotify': {**SPOTIFY_CONFIG, **overrides.get('spotify', {})},
+        'cleaning': {**CLEANING_CONFIG, **overrides.get('cleaning', {})},
+        'errors': {**ERROR_CONFIG, **overrides.get('errors', {})},
+        'cache': {**CACHE_CONFIG, **overrides.get('cache', {})},
+    }
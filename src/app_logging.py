@@ -0,0 +1,236 @@
+"""
+App Logging Module
+Journalisation du projet: niveaux, écriture en arrière-plan (QueueHandler), format texte ou JSON,
+et barre de progression limitée en fréquence
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+
+
+ROOT_LOGGER = 'yt2spotify'
+LOG_FORMATS = ('text', 'json')
+
+_listener: Optional[QueueListener] = None
+_progress_bar = True  # barre interactive autorisée (désactivée par --quiet, le format JSON et les services)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger d'un module du projet.
+
+    Args:
+        name: Nom court du module (ex: 'spotify_manager')
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class StdoutHandler(logging.StreamHandler):
+    """Écrit sur le sys.stdout courant (redirigé par les tests ou un appelant)."""
+
+    @property
+    def stream(self) -> IO:
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value: IO) -> None:
+        pass
+
+
+class TextFormatter(logging.Formatter):
+    """Message seul: les messages portent déjà leur emoji, l'affichage reste celui de la CLI."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par événement: horodatage, niveau, module, message et champs passés en `extra`."""
+
+    RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name.removeprefix(f"{ROOT_LOGGER}."),
+            'message': record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self.RESERVED})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: str = 'info', log_format: str = 'text', quiet: bool = False,
+                  stream: Optional[IO] = None, progress: bool = True) -> None:
+    """
+    Configure la journalisation: les appels de log ne font que déposer l'événement dans une file,
+    un thread l'écrit (pas d'écriture bloquante dans les boucles de recherche).
+
+    Args:
+        level: Niveau minimal ('debug' affiche chaque vidéo)
+        log_format: 'text' (messages de la CLI) ou 'json' (une ligne JSON par événement)
+        quiet: Avertissements et erreurs seulement, sans barre de progression
+        stream: Sortie (par défaut: sys.stdout)
+        progress: Autoriser la barre de progression interactive (sur un terminal)
+    """
+    global _listener, _progress_bar
+
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Format de journal inconnu: {log_format}")
+
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream) if stream is not None else StdoutHandler()
+    handler.setFormatter(JsonFormatter() if log_format == 'json' else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(logging.WARNING if quiet else getattr(logging, level.upper()))
+    root.propagate = False
+    _progress_bar = progress and not quiet and log_format == 'text'
+
+
+def shutdown_logging() -> None:
+    """Écrit les événements encore en file, arrête le thread d'écriture et revient à l'écriture directe."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        logging.getLogger(ROOT_LOGGER).handlers = []
+        _default_logging()
+
+
+def _default_logging() -> None:
+    """Sans setup_logging (import comme bibliothèque, tests): écriture directe, niveau info."""
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        handler = StdoutHandler()
+        handler.setFormatter(TextFormatter())
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        root.propagate = False
+
+
+_default_logging()
+atexit.register(shutdown_logging)
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    """Durée restante lisible."""
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class ProgressBar:
+    """
+    Progression d'une longue boucle avec débit et temps restant.
+
+    Sur un terminal: barre redessinée au plus toutes les `refresh` secondes (sur stderr).
+    Sinon (fichier, service, JSON): un événement de log toutes les `log_interval` secondes.
+
+    Usage:
+        with ProgressBar(len(videos), "🔍 Recherche") as progress:
+            for video in videos:
+                ...
+                progress.update(found=bool(match))
+    """
+
+    BAR_WIDTH = 24
+
+    def __init__(self, total: int, label: str = "", logger: Optional[logging.Logger] = None,
+                 refresh: float = 0.2, log_interval: float = 10.0, stream: Optional[IO] = None):
+        """
+        Initialise la progression.
+
+        Args:
+            total: Nombre d'éléments à traiter
+            label: Libellé affiché devant la progression
+            logger: Logger des lignes de progression (hors terminal)
+            refresh: Intervalle minimal entre deux affichages de la barre (secondes)
+            log_interval: Intervalle minimal entre deux lignes de log (secondes)
+            stream: Sortie de la barre (par défaut: sys.stderr)
+        """
+        self.total = total
+        self.label = label
+        self.logger = logger or get_logger('progress')
+        self.stream = stream or sys.stderr
+        self.interactive = _progress_bar and self.stream.isatty()
+        self.interval = refresh if self.interactive else log_interval
+
+        self.count = 0
+        self.found = 0
+        self.started = time.perf_counter()
+        self._last_render: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'ProgressBar':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def update(self, count: int = 1, found: int = 0) -> None:
+        """
+        Avance la progression (n'affiche que si l'intervalle minimal est écoulé ou à la fin).
+
+        Args:
+            count: Éléments traités depuis le dernier appel
+            found: Dont éléments réussis (pistes trouvées)
+        """
+        with self._lock:
+            self.count += count
+            self.found += found
+            now = time.perf_counter()
+            if (self._last_render is not None and now - self._last_render < self.interval
+                    and self.count < self.total):
+                return
+            self._last_render = now
+            elapsed = now - self.started
+        self._render(elapsed)
+
+    def status(self, elapsed: Optional[float] = None) -> str:
+        """Ligne de progression: avancement, réussites, débit et temps restant."""
+        elapsed = time.perf_counter() - self.started if elapsed is None else elapsed
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.count) / rate if rate else None
+        percent = self.count / self.total * 100 if self.total else 100.0
+        return (f"{self.label} {self.count}/{self.total} ({percent:.0f}%) · {self.found} trouvées · "
+                f"{rate:.1f}/s · reste {_format_eta(remaining)}")
+
+    def _render(self, elapsed: float) -> None:
+        line = self.status(elapsed)
+        if self.interactive:
+            filled = int(self.BAR_WIDTH * self.count / self.total) if self.total else self.BAR_WIDTH
+            self.stream.write(f"\r{'█' * filled}{'░' * (self.BAR_WIDTH - filled)} {line}\033[K")
+            self.stream.flush()
+        else:
+            self.logger.info(line, extra={
+                'event': 'progress', 'done': self.count, 'total': self.total,
+                'found': self.found, 'elapsed': round(elapsed, 3)
+            })
+
+    def close(self) -> None:
+        """Termine la barre (retour à la ligne sur un terminal)."""
+        if self.interactive and self._last_render is not None:
+            self.stream.write("\n")
+            self.stream.flush()
@@ -0,0 +1,156 @@
+"""
+Artist Dictionary Module
+Dictionnaire local d'artistes indexé dans un automate pour détecter les artistes dans un titre
+"""
+
+import os
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+
+
+# Fichier d'artistes livré avec le projet
+DEFAULT_ARTISTS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'artists.txt')
+
+# Connecteurs entre plusieurs artistes ("Asake & Tiakola", "Wizkid ft. Tems", ...)
+ARTIST_CONNECTOR = re.compile(r'\s*(?:,|&|\+|\bx\b|\bfeat\b\.?|\bft\b\.?|\bfeaturing\b|\bwith\b|\band\b|\bet\b)\s*', re.IGNORECASE)
+
+# Séparateurs à retirer entre le bloc d'artistes et le titre
+SEPARATOR_CHARS = ' -–—|•:/\\'
+
+
+class ArtistDictionary:
+    """
+    Dictionnaire d'artistes connus.
+
+    Les noms sont compilés dans un automate Aho-Corasick: la détection des artistes
+    dans un titre se fait en une seule passe, quelle que soit la taille du dictionnaire.
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None):
+        """
+        Initialise le dictionnaire.
+
+        Args:
+            names: Noms d'artistes optionnels à ajouter immédiatement
+        """
+        self._matcher = KeywordMatcher()
+        self._names = set()
+
+        if names:
+            for name in names:
+                self.add_artist(name)
+            self._matcher.compile()
+
+    @classmethod
+    def load_default(cls) -> 'ArtistDictionary':
+        """Crée un dictionnaire depuis le fichier d'artistes du projet (vide s'il est absent)."""
+        dictionary = cls()
+        if os.path.exists(DEFAULT_ARTISTS_FILE):
+            dictionary.load_file(DEFAULT_ARTISTS_FILE)
+        return dictionary
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name.strip().lower() in self._names
+
+    def add_artist(self, name: str) -> None:
+        """
+        Ajoute un artiste au dictionnaire.
+
+        Args:
+            name: Nom de l'artiste (tel qu'il doit être renvoyé)
+        """
+        name = name.strip()
+        if len(name) < 2 or name.lower() in self._names:
+            return
+
+        self._names.add(name.lower())
+        self._matcher.add_keyword(name, name)
+
+    def load_file(self, path: str) -> int:
+        """
+        Charge des artistes depuis un fichier texte (un nom par ligne, # pour les commentaires).
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            Nombre d'artistes ajoutés
+        """
+        before = len(self._names)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    self.add_artist(line)
+
+        # Compilé dès le chargement: les threads de recherche trouvent un automate prêt
+        self._matcher.compile()
+        return len(self._names) - before
+
+    def find_artists(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Trouve les artistes connus dans un texte (correspondances les plus longues, sans chevauchement).
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Liste de tuples (début, fin, nom de l'artiste) triée par position
+        """
+        matches = sorted(self._matcher.iter_matches(text), key=lambda m: (m[0], m[0] - m[1]))
+
+        spans: List[Tuple[int, int, str]] = []
+        last_end = 0
+        for start, end, name in matches:
+            if start >= last_end:
+                spans.append((start, end, name))
+                last_end = end
+
+        return spans
+
+    def split_title(self, title: str) -> Optional[Tuple[str, str]]:
+        """
+        Sépare artiste(s) et titre quand le titre commence par des artistes connus.
+
+        Exemple: "Asake & Tiakola BADMAN GANGSTA" -> ("Asake & Tiakola", "BADMAN GANGSTA")
+
+        Args:
+            title: Titre déjà nettoyé
+
+        Returns:
+            Tuple (artistes, titre) ou None si le titre ne commence pas par un artiste connu
+        """
+        text = title.strip()
+        spans = {start: end for start, end, _ in self.find_artists(text)}
+
+        if 0 not in spans:
+            return None
+
+        position = spans[0]
+        while True:
+            connector = ARTIST_CONNECTOR.match(text, position)
+            if not connector or connector.end() not in spans:
+                break
+            position = spans[connector.end()]
+
+        # Un connecteur suivi d'un artiste inconnu: laisser les séparateurs décider
+        connector = ARTIST_CONNECTOR.match(text, position)
+        if connector and connector.end() > position:
+            return None
+
+        artist = text[:position].strip()
+        song_title = text[position:].strip(SEPARATOR_CHARS)
+
+        if len(song_title) > 1:
+            return artist, song_title
+
+        return None
@@ -0,0 +1,330 @@
+"""
+Async Spotify Manager Module
+Version asyncio de SpotifyManager pour lancer des milliers de recherches concurrentes
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from spotipy.oauth2 import SpotifyOAuth
+
+from app_logging import get_logger
+from match_scoring import MatchScoringMixin
+from models import TrackCandidate
+from query_planner import plan_queries
+
+try:
+    import aiohttp
+except ImportError:  # Dépendance optionnelle
+    aiohttp = None
+
+logger = get_logger('async_spotify_manager')
+
+
+API_BASE_URL = "https://api.spotify.com/v1"
+
+
+class AsyncSpotifyManager(MatchScoringMixin):
+    """
+    Gestionnaire Spotify asynchrone (aiohttp).
+
+    Même interface que SpotifyManager, mais les méthodes sont des coroutines.
+    Le token OAuth est partagé avec SpotifyManager via son cache (token_cache_path).
+
+    Usage:
+        async with AsyncSpotifyManager() as spotify:
+            await spotify.authenticate()
+            matches = await spotify.find_best_matches(items)
+    """
+
+    def __init__(self, config: Optional[Dict] = None, max_concurrency: Optional[int] = None):
+        """
+        Initialise le gestionnaire asynchrone.
+
+        Args:
+            config: Section 'spotify' de la configuration (voir config/settings.py)
+            max_concurrency: Nombre maximum de requêtes HTTP simultanées
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "❌ aiohttp n'est pas installé!\n"
+                "Installez-le avec: pip install aiohttp"
+            )
+
+        load_dotenv()
+
+        self.client_id = os.getenv('SPOTIFY_CLIENT_ID')
+        self.client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
+        self.redirect_uri = os.getenv('SPOTIFY_REDIRECT_URI', 'http://localhost:8888/callback')
+
+        if not self.client_id or not self.client_secret:
+            raise ValueError(
+                "❌ Variables d'environnement manquantes!\n"
+                "Assurez-vous d'avoir SPOTIFY_CLIENT_ID et SPOTIFY_CLIENT_SECRET dans votre fichier .env"
+            )
+
+        config = config or {}
+        self.search_limit = config.get('search_limit', 5)
+        self.relevance_threshold = config.get('relevance_threshold', 0.3)
+        self.configure_duration(config)
+        self.max_concurrency = max_concurrency or config.get('max_concurrency', 8)
+        self.max_retries = config.get('max_retries', 3)
+        self.token_cache_path = config.get('token_cache_path', '.spotify_cache')
+        self.token_refresh_margin = config.get('token_refresh_margin', 300)
+
+        # Même cache de token que SpotifyManager: aucune nouvelle autorisation nécessaire
+        self.scope = "playlist-modify-public playlist-modify-private user-library-read"
+        self.auth_manager = SpotifyOAuth(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            redirect_uri=self.redirect_uri,
+            scope=self.scope,
+            cache_path=self.token_cache_path,
+            open_browser=False
+        )
+
+        self.user_id: Optional[str] = None
+        self._session: Optional[Any] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._token_info: Optional[Dict] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> 'AsyncSpotifyManager':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Ouvre la session HTTP (une seule connexion partagée par toutes les requêtes)."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._token_lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        """Ferme la session HTTP."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_token(self, rejected_token: Optional[str] = None) -> str:
+        """
+        Renvoie un access token valide, rafraîchi avant son expiration (token_refresh_margin).
+
+        Un seul rafraîchissement pour toutes les tâches: celles qui attendaient le verrou
+        repartent avec le token remplacé entre-temps.
+
+        Args:
+            rejected_token: Token refusé par l'API (401), à remplacer
+
+        Raises:
+            RuntimeError: si aucun token n'est en cache
+        """
+        assert self._token_lock is not None, "Session non ouverte (utilisez 'async with')"
+
+        def needs_refresh(info: Optional[Dict]) -> bool:
+            return (info is None or info['access_token'] == rejected_token
+                    or info.get('expires_at', 0) - time.time() < self.token_refresh_margin)
+
+        async with self._token_lock:
+            token_info = self._token_info
+            if needs_refresh(token_info):
+                # spotipy est synchrone: lecture/rafraîchissement hors de la boucle d'événements.
+                # Le cache a pu être rafraîchi par SpotifyManager: le relire d'abord
+                token_info = await asyncio.to_thread(self.auth_manager.cache_handler.get_cached_token)
+            if token_info and needs_refresh(token_info):
+                token_info = await asyncio.to_thread(self.auth_manager.refresh_access_token,
+                                                     token_info['refresh_token'])
+
+            if not token_info:
+                raise RuntimeError(
+                    "Aucun token Spotify en cache. Lancez d'abord yt2spotify.py une fois pour vous authentifier."
+                )
+
+            self._token_info = token_info
+            return token_info['access_token']
+
+    async def _request(self, method: str, path: str, params: Optional[Dict] = None,
+                       json: Optional[Any] = None) -> Optional[Dict]:
+        """
+        Envoie une requête à l'API Spotify (concurrence bornée, retry sur 429 et 401).
+
+        Args:
+            method: Méthode HTTP
+            path: Chemin de l'endpoint (ex: '/search')
+            params: Paramètres de requête
+            json: Corps JSON
+
+        Returns:
+            Réponse JSON décodée
+        """
+        assert self._semaphore is not None, "Session non ouverte (utilisez 'async with')"
+
+        rejected_token: Optional[str] = None
+        for attempt in range(self.max_retries + 1):
+            token = await self._get_token(rejected_token)
+
+            async with self._semaphore:
+                status, headers, body = await self._send(method, f"{API_BASE_URL}{path}", token, params, json)
+
+            if status == 429 and attempt < self.max_retries:
+                # Rate limit: attendre le délai indiqué par Spotify
+                await asyncio.sleep(float(headers.get('Retry-After', 1)))
+                continue
+            if status == 401 and rejected_token is None:
+                rejected_token = token
+                continue
+            if status >= 400:
+                raise RuntimeError(f"HTTP {status} sur {path}: {body}")
+
+            return body
+
+        raise RuntimeError(f"Rate limit persistant sur {path}")
+
+    async def _send(self, method: str, url: str, token: str, params: Optional[Dict],
+                    json: Optional[Any]) -> Tuple[int, Dict, Optional[Dict]]:
+        """Envoie la requête HTTP et renvoie (statut, en-têtes, corps JSON)."""
+        assert self._session is not None, "Session non ouverte (utilisez 'async with')"
+
+        headers = {'Authorization': f"Bearer {token}"}
+        async with self._session.request(method, url, params=params, json=json, headers=headers) as response:
+            body = await response.json(content_type=None) if response.content_length != 0 else None
+            return response.status, dict(response.headers), body
+
+    async def authenticate(self) -> bool:
+        """
+        Vérifie le token en cache et récupère l'utilisateur.
+
+        Returns:
+            True si l'authentification réussit, False sinon
+        """
+        try:
+            user_info = await self._request('GET', '/me')
+            if user_info:
+                self.user_id = user_info['id']
+                logger.info(f"✅ Authentifié en tant que: {user_info['display_name']} ({self.user_id})")
+                return True
+            logger.error("❌ Impossible d'obtenir les informations utilisateur")
+            return False
+        except Exception as e:
+            logger.error(f"❌ Erreur d'authentification Spotify: {e}")
+            return False
+
+    async def search_track(self, query: str, limit: int = 10) -> List[TrackCandidate]:
+        """
+        Recherche des pistes sur Spotify.
+
+        Args:
+            query: Requête de recherche
+            limit: Nombre maximum de résultats
+
+        Returns:
+            Liste des pistes trouvées
+        """
+        try:
+            results = await self._request('GET', '/search', params={'q': query, 'type': 'track', 'limit': limit})
+            if results and results.get('tracks'):
+                return [self._track_to_info(track) for track in results['tracks']['items']]
+            return []
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la recherche: {e}")
+            return []
+
+    async def find_best_match(self, search_queries: List[str], original_title: str,
+                              duration: Optional[float] = None) -> Optional[TrackCandidate]:
+        """
+        Trouve la meilleure correspondance (toutes les requêtes sont lancées en parallèle).
+
+        Args:
+            search_queries: Liste des requêtes de recherche
+            original_title: Titre original pour comparaison
+            duration: Durée de la vidéo en secondes (pénalise les versions de durée incompatible)
+
+        Returns:
+            Meilleure piste trouvée ou None
+        """
+        plan = plan_queries(search_queries)
+        queries = plan.queries
+        results = await asyncio.gather(*(self.search_track(q, limit=self.search_limit) for q in queries))
+
+        candidates: Dict[str, TrackCandidate] = {}
+        for query, tracks in zip(queries, results):
+            self._score_results(plan, tracks, original_title, query, candidates, duration)
+
+        return self._select_best_match(candidates.values())
+
+    async def find_best_matches(self, items: List[Tuple]) -> List[Optional[TrackCandidate]]:
+        """
+        Cherche de nombreux titres simultanément (concurrence bornée par le sémaphore).
+
+        Args:
+            items: Liste de tuples (requêtes, titre original[, durée de la vidéo])
+
+        Returns:
+            Meilleure piste (ou None) pour chaque titre, dans le même ordre
+        """
+        return list(await asyncio.gather(*(self.find_best_match(*item) for item in items)))
+
+    async def create_playlist(self, name: str, description: str = "", public: bool = True) -> Optional[str]:
+        """
+        Crée une nouvelle playlist Spotify.
+
+        Args:
+            name: Nom de la playlist
+            description: Description de la playlist
+            public: Si la playlist doit être publique
+
+        Returns:
+            ID de la playlist créée ou None
+        """
+        try:
+            if not self.user_id:
+                if not await self.authenticate():
+                    return None
+
+            playlist = await self._request(
+                'POST', f"/users/{self.user_id}/playlists",
+                json={'name': name, 'public': public, 'description': description}
+            )
+            if playlist:
+                logger.info(f"✅ Playlist créée: {name}")
+                return playlist['id']
+            logger.error("❌ Erreur lors de la création de la playlist")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la création de la playlist: {e}")
+            return None
+
+    async def add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str]) -> bool:
+        """
+        Ajoute des pistes à une playlist (lots séquentiels pour conserver l'ordre).
+
+        Args:
+            playlist_id: ID de la playlist
+            track_uris: Liste des URIs des pistes
+
+        Returns:
+            True si succès, False sinon
+        """
+        try:
+            # Spotify limite à 100 pistes par requête
+            batch_size = 100
+            for i in range(0, len(track_uris), batch_size):
+                await self._request('POST', f"/playlists/{playlist_id}/tracks",
+                                    json={'uris': track_uris[i:i + batch_size]})
+
+            logger.info(f"✅ {len(track_uris)} pistes ajoutées à la playlist")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'ajout des pistes: {e}")
+            return False
+
+    def get_playlist_url(self, playlist_id: str) -> str:
+        """Génère l'URL publique d'une playlist."""
+        return f"https://open.spotify.com/playlist/{playlist_id}"
@@ -0,0 +1,213 @@
+"""
+Cassette Module
+Enregistrement et relecture des réponses YouTube (yt-dlp) et Spotify pour rejouer une exécution hors ligne
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app_logging import get_logger
+
+logger = get_logger('cassette')
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMiss(KeyError):
+    """Appel absent de la cassette (relecture stricte)."""
+
+
+class RecordedError(Exception):
+    """Erreur rejouée telle qu'elle avait été enregistrée."""
+
+
+def _call_key(args: Tuple, kwargs: Dict) -> str:
+    """Clé canonique d'un appel (arguments positionnels et nommés)."""
+    return json.dumps([list(args), kwargs], sort_keys=True, ensure_ascii=False, default=str)
+
+
+class Cassette:
+    """
+    Fichier JSONL compressé (gzip): une ligne par appel, avec sa durée d'origine.
+
+    - mode 'record': les appels passent au vrai client et sont enregistrés
+    - mode 'replay': les réponses sont servies depuis le fichier, instantanément
+      (speed=0) ou avec le temps d'origine divisé par `speed`
+
+    Usage:
+        cassette = Cassette("run.cassette.gz", 'record')
+        cassette.record_spotify(manager)
+        ...
+        cassette.save()
+    """
+
+    def __init__(self, path: str, mode: str = 'replay', speed: float = 0.0, strict: bool = False):
+        """
+        Ouvre une cassette.
+
+        Args:
+            path: Chemin du fichier (.gz)
+            mode: 'record' ou 'replay'
+            speed: Relecture: 0 = sans attente, 1 = temps d'origine, 2 = deux fois plus vite
+            strict: Relecture: lever CassetteMiss pour un appel absent (sinon renvoyer None, avec un avertissement)
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Mode de cassette inconnu: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.strict = strict
+
+        self.recorded: List[Dict] = []
+        self.replayed = 0
+        self.misses = 0
+        self._interactions: Dict[Tuple[str, str, str], Deque[Dict]] = defaultdict(deque)
+        self._last: Dict[Tuple[str, str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+        if mode == 'replay':
+            self._load()
+
+    def _load(self) -> None:
+        """Charge et indexe les appels enregistrés."""
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != CASSETTE_VERSION:
+                raise ValueError(f"❌ Version de cassette non supportée: {header.get('version')}")
+            for line in f:
+                interaction = json.loads(line)
+                key = (interaction['kind'], interaction['call'], interaction['key'])
+                self._interactions[key].append(interaction)
+
+    def __len__(self) -> int:
+        return len(self.recorded) if self.mode == 'record' else sum(map(len, self._interactions.values()))
+
+    def save(self) -> None:
+        """Écrit la cassette enregistrée."""
+        if self.mode != 'record':
+            return
+        with self._lock:
+            interactions = list(self.recorded)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'version': CASSETTE_VERSION, 'created_at': time.time()}) + "\n")
+            for interaction in interactions:
+                f.write(json.dumps(interaction, ensure_ascii=False, default=str) + "\n")
+
+    def wrap(self, kind: str, target: Any = None, passthrough: Tuple[str, ...] = ()) -> 'CassetteProxy':
+        """
+        Enveloppe un client (ex: spotipy.Spotify): chaque appel de méthode est enregistré ou rejoué.
+
+        Args:
+            kind: Catégorie des appels ('spotify', 'youtube', ...)
+            target: Vrai client (ignoré en relecture)
+            passthrough: Méthodes appelées directement sur le vrai client, sans enregistrement
+
+        Returns:
+            Client de remplacement
+        """
+        return CassetteProxy(self, kind, target, passthrough)
+
+    def record_spotify(self, spotify_manager: Any) -> None:
+        """
+        Enregistre tous les appels API d'un SpotifyManager.
+
+        Les recherches passent par le pool de credentials quand il existe: il est enregistré
+        sous la même catégorie que le client utilisateur, et la relecture (sans pool) les
+        retrouve donc sur le client unique.
+
+        Args:
+            spotify_manager: Gestionnaire dont le client et le pool de recherche sont enveloppés
+        """
+        spotify_manager.sp = self.wrap('spotify', spotify_manager.sp)
+        if spotify_manager.search_pool:
+            spotify_manager.search_pool = self.wrap('spotify', spotify_manager.search_pool, passthrough=('stats',))
+
+    def wrap_function(self, kind: str, name: str, function: Optional[Callable] = None) -> Callable:
+        """
+        Enveloppe une fonction (ex: extraction yt-dlp).
+
+        Args:
+            kind: Catégorie de l'appel
+            name: Nom de l'appel dans la cassette
+            function: Vraie fonction (ignorée en relecture)
+
+        Returns:
+            Fonction de remplacement
+        """
+        def wrapper(*args, **kwargs):
+            return self.call(kind, name, function, args, kwargs)
+        return wrapper
+
+    def call(self, kind: str, name: str, function: Optional[Callable], args: Tuple, kwargs: Dict) -> Any:
+        """Exécute (enregistrement) ou rejoue (relecture) un appel."""
+        key = _call_key(args, kwargs)
+        if self.mode == 'replay':
+            return self._replay(kind, name, key)
+
+        assert function is not None, "Enregistrement sans client réel"
+        interaction = {'kind': kind, 'call': name, 'key': key}
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+            interaction['result'] = result
+            return result
+        except Exception as e:
+            interaction['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            interaction['elapsed'] = round(time.perf_counter() - start, 4)
+            with self._lock:
+                self.recorded.append(interaction)
+
+    def _replay(self, kind: str, name: str, key: str) -> Any:
+        """Sert la réponse enregistrée (dans l'ordre pour des appels identiques répétés)."""
+        index = (kind, name, key)
+        with self._lock:
+            queue = self._interactions.get(index)
+            if queue:
+                interaction = queue.popleft()
+                self._last[index] = interaction
+            else:
+                # Appel répété plus souvent qu'à l'enregistrement: dernière réponse connue
+                interaction = self._last.get(index)
+            if interaction is None:
+                self.misses += 1
+            else:
+                self.replayed += 1
+
+        if interaction is None:
+            if self.strict:
+                raise CassetteMiss(f"{kind}.{name}{key}")
+            logger.warning("⚠️  Appel absent de la cassette, réponse vide: %s.%s%s", kind, name, key,
+                           extra={'event': 'cassette_miss', 'call': f"{kind}.{name}", 'key': key})
+            return None
+
+        if self.speed > 0:
+            time.sleep(interaction.get('elapsed', 0.0) / self.speed)
+        if 'error' in interaction:
+            raise RecordedError(interaction['error'])
+        return interaction.get('result')
+
+
+class CassetteProxy:
+    """Client de remplacement: les appels de méthode passent par la cassette."""
+
+    def __init__(self, cassette: Cassette, kind: str, target: Any = None, passthrough: Tuple[str, ...] = ()):
+        self._cassette = cassette
+        self._kind = kind
+        self._target = target
+        self._passthrough = passthrough
+
+    def __getattr__(self, name: str) -> Any:
+        if self._cassette.mode == 'record':
+            attribute = getattr(self._target, name)
+            if not callable(attribute) or name in self._passthrough:
+                return attribute
+        else:
+            attribute = None
+        return self._cassette.wrap_function(self._kind, name, attribute)
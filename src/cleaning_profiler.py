@@ -0,0 +1,223 @@
+"""
+Cleaning Profiler Module
+Mesure, sur un corpus de titres réels, quelles règles de TitleCleaner.remove_patterns s'appliquent
+et ce qu'elles coûtent, puis recommande un ordre et les règles mortes ou redondantes
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from title_cleaner import TitleCleaner
+
+
+@dataclass(slots=True)
+class RuleStats:
+    """Statistiques d'une règle de nettoyage sur le corpus."""
+
+    index: int
+    pattern: str
+    trigger: Optional[str] = None
+    hits: int = 0  # titres modifiés par la règle, à sa place dans l'ordre
+    matches: int = 0  # occurrences supprimées
+    raw_hits: int = 0  # titres bruts où la règle trouverait une occurrence (seule, sans les autres règles)
+    evaluated: int = 0  # appels regex (titres où le caractère déclencheur est présent)
+    seconds: float = 0.0
+
+    @property
+    def dead(self) -> bool:
+        """Ne correspond à aucun titre du corpus, même brut."""
+        return self.raw_hits == 0
+
+    @property
+    def shadowed(self) -> bool:
+        """Correspond à des titres bruts, mais les règles précédentes ont toujours tout supprimé avant elle."""
+        return self.hits == 0 and self.raw_hits > 0
+
+
+@dataclass(slots=True)
+class CleaningProfile:
+    """Résultat du profilage des règles sur un corpus."""
+
+    titles: int = 0
+    changed_titles: int = 0
+    total_seconds: float = 0.0
+    rules: List[RuleStats] = field(default_factory=list)
+    proposed_order: List[int] = field(default_factory=list)  # index des règles, ordre recommandé
+    order_differences: int = 0  # titres dont le résultat change avec l'ordre recommandé
+    current_order_seconds: float = 0.0  # clean_title sur tout le corpus, ordre actuel
+    proposed_order_seconds: float = 0.0  # idem avec l'ordre recommandé
+
+    @property
+    def dead_rules(self) -> List[RuleStats]:
+        return [rule for rule in self.rules if rule.dead]
+
+    @property
+    def shadowed_rules(self) -> List[RuleStats]:
+        return [rule for rule in self.rules if rule.shadowed]
+
+    def recommendations(self) -> List[str]:
+        """Recommandations lisibles (règles à retirer, ordre, règles coûteuses)."""
+        lines = []
+        for rule in self.dead_rules:
+            lines.append(f"🪦 Règle morte #{rule.index} {rule.pattern!r}: aucun titre du corpus")
+        for rule in self.shadowed_rules:
+            lines.append(f"🫥 Règle redondante #{rule.index} {rule.pattern!r}: {rule.raw_hits} titres bruts, "
+                         f"toujours nettoyés avant elle par les règles précédentes")
+
+        current = [rule.index for rule in self.rules]
+        if self.proposed_order != current:
+            first = ', '.join(f"#{index}" for index in self.proposed_order[:5])
+            timing = (f"{self.current_order_seconds / self.titles * 1e6:.1f} → "
+                      f"{self.proposed_order_seconds / self.titles * 1e6:.1f} µs par titre")
+            if self.order_differences:
+                lines.append(f"↕️  Ordre par fréquence ({first}, ...): {timing}, mais change le résultat de "
+                             f"{self.order_differences} titres, à vérifier avant de l'adopter")
+            elif self.proposed_order_seconds < self.current_order_seconds:
+                lines.append(f"↕️  Ordre par fréquence ({first}, ...): {timing}, "
+                             f"même résultat sur les {self.titles} titres")
+            else:
+                lines.append(f"↕️  Ordre actuel conservé: l'ordre par fréquence n'est pas plus rapide ({timing})")
+
+        costly = sorted(self.rules, key=lambda rule: rule.seconds, reverse=True)[:3]
+        for rule in costly:
+            if self.total_seconds and rule.seconds:
+                trigger = "" if rule.trigger else " (sans caractère déclencheur: évaluée sur chaque titre)"
+                lines.append(f"⏱️  #{rule.index} {rule.pattern!r}: {rule.seconds / self.total_seconds:.0%} "
+                             f"du temps de nettoyage{trigger}")
+        return lines
+
+    def lines(self, top: Optional[int] = None) -> List[str]:
+        """Rapport lisible: une ligne par règle, puis les recommandations."""
+        per_title = self.total_seconds / self.titles * 1e6 if self.titles else 0.0
+        lines = [
+            f"🧹 {self.titles} titres, {self.changed_titles} modifiés, {per_title:.1f} µs par titre",
+            f"{'#':>3} {'titres':>7} {'occ.':>6} {'bruts':>6} {'regex':>7} {'µs':>9}  pattern",
+        ]
+        rules = sorted(self.rules, key=lambda rule: rule.hits, reverse=True)
+        for rule in rules[:top] if top else rules:
+            lines.append(f"{rule.index:>3} {rule.hits:>7} {rule.matches:>6} {rule.raw_hits:>6} "
+                         f"{rule.evaluated:>7} {rule.seconds * 1e6:>9.0f}  {rule.pattern}")
+        recommendations = self.recommendations()
+        if recommendations:
+            lines.append("")
+            lines.extend(recommendations)
+        else:
+            lines.append("✅ Aucune règle morte ou redondante, ordre actuel conservé")
+        return lines
+
+    def to_dict(self) -> dict:
+        """Résultat JSON-compatible."""
+        return {
+            'titles': self.titles,
+            'changed_titles': self.changed_titles,
+            'total_seconds': self.total_seconds,
+            'rules': [{**asdict(rule), 'dead': rule.dead, 'shadowed': rule.shadowed} for rule in self.rules],
+            'proposed_order': self.proposed_order,
+            'order_differences': self.order_differences,
+            'current_order_seconds': self.current_order_seconds,
+            'proposed_order_seconds': self.proposed_order_seconds,
+            'recommendations': self.recommendations(),
+        }
+
+
+def _time_cleaning(cleaner: TitleCleaner, corpus: List[str], repeat: int = 3) -> Tuple[float, List[str]]:
+    """Durée de clean_title sur tout le corpus (meilleur de `repeat` passes), et les titres nettoyés."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cleaned = [cleaner.clean_title(title) for title in corpus]
+        best = min(best, time.perf_counter() - started)
+    return best, cleaned
+
+
+def profile_rules(titles: Iterable[str], cleaner: Optional[TitleCleaner] = None) -> CleaningProfile:
+    """
+    Applique les règles de nettoyage comme TitleCleaner.clean_title, en comptant et chronométrant chacune.
+
+    Args:
+        titles: Corpus de titres YouTube
+        cleaner: Nettoyeur à profiler (par défaut: TitleCleaner())
+
+    Returns:
+        Profil des règles, avec l'ordre recommandé
+    """
+    cleaner = cleaner or TitleCleaner()
+    rules = cleaner.rules
+    profile = CleaningProfile(rules=[
+        RuleStats(index=index, pattern=rule.pattern, trigger=rule.trigger) for index, rule in enumerate(rules)
+    ])
+    corpus = [title for title in titles if title]
+    perf_counter = time.perf_counter
+
+    for title in corpus:
+        cleaned = title
+        for rule, stats in zip(rules, profile.rules):
+            if rule.regex.search(title):
+                stats.raw_hits += 1
+            started = perf_counter()
+            if rule.applies_to(cleaned):
+                cleaned, count = rule.regex.subn('', cleaned)
+                stats.evaluated += 1
+            else:
+                count = 0
+            stats.seconds += perf_counter() - started
+            if count:
+                stats.hits += 1
+                stats.matches += count
+        profile.changed_titles += cleaned != title
+
+    profile.titles = len(corpus)
+    profile.total_seconds = sum(stats.seconds for stats in profile.rules)
+
+    # Ordre recommandé: règles fréquentes d'abord, règles mortes à la fin (tri stable)
+    ordered = sorted(profile.rules, key=lambda stats: (stats.dead, -stats.hits))
+    profile.proposed_order = [stats.index for stats in ordered]
+    if profile.proposed_order != list(range(len(rules))):
+        reordered = copy.copy(cleaner)
+        reordered.rules = [rules[index] for index in profile.proposed_order]
+        profile.current_order_seconds, current = _time_cleaning(cleaner, corpus)
+        profile.proposed_order_seconds, proposed = _time_cleaning(reordered, corpus)
+        profile.order_differences = sum(before != after for before, after in zip(current, proposed))
+
+    return profile
+
+
+def read_titles(path: str) -> List[str]:
+    """
+    Lit un corpus: un titre par ligne, ou JSON (liste de titres, ou d'objets avec un champ 'title').
+
+    Args:
+        path: Fichier du corpus ('-' pour l'entrée standard)
+    """
+    with (sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')) as f:
+        content = f.read()
+    if path.endswith('.json'):
+        data = json.loads(content)
+        return [item['title'] if isinstance(item, dict) else item for item in data]
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def main(argv=None):
+    """Profile les règles de nettoyage: python cleaning_profiler.py titres.txt [--top 15] [--json]"""
+    parser = argparse.ArgumentParser(description="🧹 Profilage des règles de nettoyage de TitleCleaner")
+    parser.add_argument('corpus', help='Titres YouTube: un par ligne, ou .json ("-" pour stdin)')
+    parser.add_argument('--top', type=int, default=0, help='Nombre de règles affichées (0 = toutes)')
+    parser.add_argument('--json', action='store_true', help='Résultat en JSON')
+    args = parser.parse_args(argv)
+
+    profile = profile_rules(read_titles(args.corpus))
+    if args.json:
+        print(json.dumps(profile.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        for line in profile.lines(args.top or None):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Cost Estimator Module
+Estimation d'un transfert avant de le lancer (--estimate): appels API, durée, risque de 429
+"""
+
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app_logging import get_logger
+from local_catalog import match_many
+from match_cache import MatchCache
+from models import Video
+from query_planner import plan_queries
+from title_cleaner import TitleCleaner
+
+logger = get_logger('cost_estimator')
+
+
+# Valeurs par défaut tant qu'aucun transfert n'a été mesuré
+DEFAULT_SECONDS_PER_QUERY = 0.3  # latence d'une recherche, hors pause rate_limit_delay
+DEFAULT_HIT_RATE = 0.8
+
+# Débit toléré par application Spotify avant les 429 (non publié, ordre de grandeur observé)
+REQUESTS_PER_MINUTE_PER_APP = 180
+
+
+class RunStats:
+    """
+    Statistiques cumulées des transferts réels, pour calibrer les estimations.
+    """
+
+    FIELDS = ('runs', 'searched_videos', 'queries_planned', 'queries_sent', 'search_seconds',
+              'found_searched', 'rate_limited')
+
+    def __init__(self, path: Optional[str] = ".run_stats.json"):
+        """
+        Charge l'historique s'il existe.
+
+        Args:
+            path: Chemin du fichier de statistiques (None = en mémoire seulement)
+        """
+        self.path = path
+        self.totals: Dict[str, float] = {key: 0 for key in self.FIELDS}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.totals.update({key: data[key] for key in self.FIELDS if key in data})
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  Statistiques illisibles ({path}), ignorées: {e}")
+
+    def record(self, report) -> None:
+        """
+        Ajoute un transfert terminé (seules les vidéos réellement cherchées sur l'API comptent).
+
+        Args:
+            report: PlaylistTransferReport du transfert
+        """
+        if not report.searched_videos:
+            return
+        with self._lock:
+            totals = self.totals
+            totals['runs'] += 1
+            totals['searched_videos'] += report.searched_videos
+            totals['queries_planned'] += report.queries_sent + report.skipped_queries
+            totals['queries_sent'] += report.queries_sent
+            totals['search_seconds'] += report.search_seconds
+            totals['found_searched'] += report.found_searched
+            totals['rate_limited'] += sum(usage['rate_limited'] for usage in report.credential_usage.values())
+            if not self.path:
+                return
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(totals, f)
+            os.replace(tmp_path, self.path)
+
+    @property
+    def sent_ratio(self) -> float:
+        """Part des requêtes planifiées réellement envoyées (arrêts anticipés)."""
+        planned = self.totals['queries_planned']
+        return self.totals['queries_sent'] / planned if planned else 1.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Part des vidéos cherchées qui ont trouvé une piste."""
+        searched = self.totals['searched_videos']
+        return self.totals['found_searched'] / searched if searched else DEFAULT_HIT_RATE
+
+    def seconds_per_query(self, rate_limit_delay: float = 0.0) -> float:
+        """Durée moyenne d'une recherche, pause comprise."""
+        sent = self.totals['queries_sent']
+        if sent:
+            return self.totals['search_seconds'] / sent
+        return DEFAULT_SECONDS_PER_QUERY + rate_limit_delay
+
+    @property
+    def rate_limited_ratio(self) -> float:
+        """429 observés par requête envoyée."""
+        sent = self.totals['queries_sent']
+        return self.totals['rate_limited'] / sent if sent else 0.0
+
+
+@dataclass(slots=True)
+class CostEstimate:
+    """Prévision d'un transfert."""
+
+    videos: int = 0
+    cached: int = 0
+    known_misses: int = 0
+    catalog: int = 0
+    to_search: int = 0
+    planned_queries: int = 0
+    search_calls: int = 0
+    other_calls: int = 0
+    expected_found: int = 0
+    sequential_seconds: float = 0.0
+    concurrent_seconds: float = 0.0
+    concurrency: int = 1
+    requests_per_minute: float = 0.0
+    rate_limit_budget: float = 0.0
+    rate_limit_risk: str = 'low'
+    calibrated: bool = False  # True si fondé sur des transferts mesurés
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def total_calls(self) -> int:
+        """Nombre total d'appels à l'API Spotify."""
+        return self.search_calls + self.other_calls
+
+    def lines(self) -> List[str]:
+        """Résumé lisible de l'estimation."""
+        lines = [
+            f"🎵 Vidéos: {self.videos} — cache: {self.cached}, échecs connus: {self.known_misses}, "
+            f"catalogue local: {self.catalog}, à chercher: {self.to_search}",
+            f"🧮 Requêtes planifiées: {self.planned_queries} → ~{self.search_calls} recherches envoyées",
+            f"📡 Appels Spotify estimés: ~{self.total_calls} ({self.other_calls} hors recherche)",
+            f"✅ Pistes attendues: ~{self.expected_found}/{self.videos}",
+            f"⏱️  Durée estimée: ~{_format_duration(self.sequential_seconds)} en séquentiel, "
+            f"~{_format_duration(self.concurrent_seconds)} avec {self.concurrency} requêtes simultanées",
+            f"🚦 Risque de 429: {self.rate_limit_risk} "
+            f"(~{self.requests_per_minute:.0f} req/min pour ~{self.rate_limit_budget:.0f} tolérées)",
+        ]
+        if not self.calibrated:
+            lines.append("ℹ️  Pas encore d'historique: valeurs par défaut (plus précis après un premier transfert)")
+        lines.extend(f"ℹ️  {note}" for note in self.notes)
+        return lines
+
+
+def _format_duration(seconds: float) -> str:
+    """Durée lisible (s, min, h)."""
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def estimate_transfer(videos: List[Video], config: Dict, match_cache: Optional[MatchCache] = None,
+                      catalog_path: Optional[str] = None, stats: Optional[RunStats] = None,
+                      title_cleaner: Optional[TitleCleaner] = None, publish: bool = True,
+                      credentials: int = 1) -> CostEstimate:
+    """
+    Estime un transfert sans aucune recherche Spotify.
+
+    Args:
+        videos: Vidéos extraites
+        config: Configuration complète (voir config.settings.load_config)
+        match_cache: Cache local des correspondances
+        catalog_path: Catalogue local (la recherche locale est exécutée, elle ne coûte aucun appel)
+        stats: Historique des transferts pour calibrer les ratios
+        title_cleaner: Nettoyeur de titres (créé si absent)
+        publish: Inclure la création et l'écriture de la playlist
+        credentials: Nombre d'applications Spotify qui se partagent les recherches
+
+    Returns:
+        Estimation
+    """
+    spotify_config = config['spotify']
+    title_cleaner = title_cleaner or TitleCleaner(config={**config['cleaning'], **spotify_config})
+    stats = stats or RunStats(None)
+    estimate = CostEstimate(videos=len(videos), calibrated=bool(stats.totals['queries_sent']))
+
+    # Vidéos déjà résolues localement
+    pending: List[Video] = []
+    cached_ids = set()
+    for video in videos:
+        cached = match_cache.get(video.title, video.id) if match_cache else None
+        if cached:
+            estimate.cached += 1
+            cached_ids.add(cached.id)
+        elif match_cache and match_cache.get_miss(video.title, video.id):
+            estimate.known_misses += 1
+        else:
+            pending.append(video)
+
+    if catalog_path and pending:
+        offline = match_many(
+            catalog_path,
+            [(title_cleaner.create_search_queries(video.title), video.title, video.duration) for video in pending],
+            spotify_config
+        )
+        estimate.catalog = sum(1 for match in offline if match)
+        pending = [video for video, match in zip(pending, offline) if not match]
+
+    # Requêtes planifiées par vidéo restante (même plan que la vraie recherche)
+    estimate.to_search = len(pending)
+    hit_rate = stats.hit_rate
+    planned = 0.0
+    for video in pending:
+        fallback = len(plan_queries(title_cleaner.create_search_queries(video.title)).queries)
+        if video.artist and video.track:
+            # Source structurée: une requête, variantes seulement en cas d'échec
+            planned += 1 + (1 - hit_rate) * fallback
+        else:
+            planned += fallback
+    estimate.planned_queries = round(planned)
+    estimate.search_calls = round(planned * stats.sent_ratio)
+
+    # Autres appels: rafraîchissement du cache par lots de 50, puis playlist
+    estimate.expected_found = estimate.cached + estimate.catalog + round(len(pending) * hit_rate)
+    estimate.other_calls = math.ceil(len(cached_ids) / 50)
+    if publish and estimate.expected_found:
+        # Utilisateur, recherche d'une playlist du même nom, création, écritures par lots de 100
+        estimate.other_calls += 3 + math.ceil(estimate.expected_found / 100)
+
+    # Durée: séquentielle (CLI) et à la concurrence configurée, bornée par le débit toléré
+    seconds_per_query = stats.seconds_per_query(spotify_config.get('rate_limit_delay', 0.0))
+    estimate.concurrency = max(1, spotify_config.get('max_concurrency', 1))
+    estimate.rate_limit_budget = REQUESTS_PER_MINUTE_PER_APP * max(1, credentials)
+    estimate.sequential_seconds = estimate.total_calls * seconds_per_query
+    unthrottled_seconds = estimate.sequential_seconds / estimate.concurrency
+    throttled_seconds = max(unthrottled_seconds, estimate.total_calls / estimate.rate_limit_budget * 60)
+    estimate.concurrent_seconds = min(throttled_seconds, estimate.sequential_seconds)  # jamais plus lent qu'en séquentiel
+
+    # Risque de 429: débit demandé à la concurrence configurée (sur au moins une minute)
+    estimate.requests_per_minute = estimate.total_calls * 60 / max(unthrottled_seconds, 60)
+    load = estimate.requests_per_minute / estimate.rate_limit_budget
+    if load >= 0.9 or stats.rate_limited_ratio > 0.05:
+        estimate.rate_limit_risk = 'high'
+    elif load >= 0.5 or stats.rate_limited_ratio > 0:
+        estimate.rate_limit_risk = 'medium'
+    if estimate.rate_limit_risk != 'low' and credentials == 1:
+        estimate.notes.append("SPOTIFY_SEARCH_CREDENTIALS répartit les recherches sur plusieurs applications")
+
+    return estimate
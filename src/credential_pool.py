@@ -0,0 +1,191 @@
+"""
+Credential Pool Module
+Répartit les recherches Spotify entre plusieurs applications (client credentials),
+chacune avec son propre token et sa propre limite de débit
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import spotipy
+from spotipy.cache_handler import MemoryCacheHandler
+from spotipy.oauth2 import SpotifyClientCredentials
+
+
+# Variable d'environnement: "client_id:client_secret,client_id:client_secret,..."
+CREDENTIALS_ENV = 'SPOTIFY_SEARCH_CREDENTIALS'
+
+
+@dataclass(slots=True)
+class SearchCredential:
+    """Application Spotify du pool et son utilisation."""
+
+    label: str
+    client: Any
+    in_flight: int = 0
+    requests: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    backoff_until: float = 0.0  # time.monotonic()
+
+
+def parse_credentials(value: str) -> List[Tuple[str, str]]:
+    """
+    Lit une liste de credentials "id:secret" séparés par des virgules.
+
+    Args:
+        value: Valeur de SPOTIFY_SEARCH_CREDENTIALS
+
+    Returns:
+        Liste de tuples (client_id, client_secret)
+
+    Raises:
+        ValueError: si une entrée n'est pas au format id:secret
+    """
+    credentials = []
+    for entry in value.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        client_id, separator, client_secret = entry.partition(':')
+        if not separator or not client_id or not client_secret:
+            raise ValueError(f"❌ Credential invalide dans {CREDENTIALS_ENV} (attendu id:secret): {entry[:8]}...")
+        credentials.append((client_id, client_secret))
+    return credentials
+
+
+def _default_client(client_id: str, client_secret: str) -> spotipy.Spotify:
+    """Client spotipy en client credentials, sans retry interne sur 429 (géré par le pool)."""
+    auth_manager = SpotifyClientCredentials(
+        client_id=client_id,
+        client_secret=client_secret,
+        cache_handler=MemoryCacheHandler()
+    )
+    return spotipy.Spotify(auth_manager=auth_manager, status_forcelist=(500, 502, 503, 504), status_retries=0)
+
+
+class CredentialPool:
+    """
+    Pool de clients Spotify pour les appels de lecture (search, tracks).
+
+    Chaque appel part sur le credential le moins chargé qui n'est pas en pause;
+    un 429 met ce credential en pause (Retry-After) et l'appel est relancé sur un autre.
+    Les écritures de playlists restent sur le client de l'utilisateur (SpotifyManager.sp).
+    """
+
+    def __init__(self, credentials: List[Tuple[str, str]], max_retries: int = 3, retry_delay: float = 2.0,
+                 client_factory: Optional[Callable[[str, str], Any]] = None):
+        """
+        Initialise le pool.
+
+        Args:
+            credentials: Liste de tuples (client_id, client_secret)
+            max_retries: Nombre de relances d'un appel après un 429
+            retry_delay: Pause d'un credential limité sans en-tête Retry-After (secondes)
+            client_factory: Fabrique de client (client_id, client_secret) → client API
+        """
+        if not credentials:
+            raise ValueError("❌ Le pool de credentials est vide")
+
+        factory = client_factory or _default_client
+        self.credentials = [
+            SearchCredential(label=f"#{index + 1} {client_id[:6]}…", client=factory(client_id, client_secret))
+            for index, (client_id, client_secret) in enumerate(credentials)
+        ]
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, max_retries: int = 3, retry_delay: float = 2.0) -> Optional['CredentialPool']:
+        """
+        Crée le pool depuis SPOTIFY_SEARCH_CREDENTIALS.
+
+        Returns:
+            Pool, ou None si la variable est absente ou vide
+        """
+        credentials = parse_credentials(os.getenv(CREDENTIALS_ENV, ''))
+        if not credentials:
+            return None
+        return cls(credentials, max_retries=max_retries, retry_delay=retry_delay)
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def _acquire(self) -> SearchCredential:
+        """Réserve le credential disponible le moins chargé (attend si tous sont en pause)."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                available = [credential for credential in self.credentials if credential.backoff_until <= now]
+                if available:
+                    credential = min(available, key=lambda c: (c.in_flight, c.requests))
+                    credential.in_flight += 1
+                    credential.requests += 1
+                    return credential
+                wait = min(credential.backoff_until for credential in self.credentials) - now
+            time.sleep(max(wait, 0.0))
+
+    def _release(self, credential: SearchCredential) -> None:
+        with self._lock:
+            credential.in_flight -= 1
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Appelle une méthode du client sur un credential du pool.
+
+        Args:
+            method: Nom de la méthode spotipy (search, tracks, ...)
+
+        Returns:
+            Réponse de l'API
+
+        Raises:
+            spotipy.SpotifyException: erreur autre qu'un 429, ou 429 après max_retries relances
+        """
+        for attempt in range(self.max_retries + 1):
+            credential = self._acquire()
+            try:
+                return getattr(credential.client, method)(*args, **kwargs)
+            except spotipy.SpotifyException as e:
+                if e.http_status != 429:
+                    with self._lock:
+                        credential.errors += 1
+                    raise
+                retry_after = (e.headers or {}).get('Retry-After')
+                pause = float(retry_after) if retry_after else self.retry_delay
+                with self._lock:
+                    credential.rate_limited += 1
+                    credential.backoff_until = max(credential.backoff_until, time.monotonic() + pause)
+                if attempt == self.max_retries:
+                    raise
+            finally:
+                self._release(credential)
+
+    def search(self, *args, **kwargs) -> Any:
+        """Recherche (même signature que spotipy.Spotify.search)."""
+        return self.call('search', *args, **kwargs)
+
+    def tracks(self, *args, **kwargs) -> Any:
+        """Pistes par lot (même signature que spotipy.Spotify.tracks)."""
+        return self.call('tracks', *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Utilisation de chaque credential.
+
+        Returns:
+            Dict {label: {'requests', 'rate_limited', 'errors'}}
+        """
+        with self._lock:
+            return {
+                credential.label: {
+                    'requests': credential.requests,
+                    'rate_limited': credential.rate_limited,
+                    'errors': credential.errors,
+                }
+                for credential in self.credentials
+            }
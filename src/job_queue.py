@@ -0,0 +1,326 @@
+"""
+Job Queue Module
+File de transferts durable (SQLite en mode WAL) partagée par plusieurs workers et processus d'une même machine
+
+Le mode WAL repose sur une mémoire partagée entre processus: la file doit rester sur un
+disque local (pas de NFS/SMB), les workers tournent tous sur la machine qui l'héberge.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from app_logging import get_logger
+from transfer_pipeline import PlaylistTransferReport, TransferPipeline
+
+logger = get_logger('job_queue')
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    youtube TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    exit_code INTEGER,
+    result TEXT,
+    report TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+"""
+
+
+@dataclass(slots=True)
+class QueuedJob:
+    """Transfert réservé par un worker."""
+
+    id: int
+    youtube_url: str
+    options: Dict
+    attempts: int
+    max_attempts: int
+
+
+class JobQueue:
+    """
+    File de tâches SQLite avec baux (leases): une tâche réservée redevient visible si son
+    worker ne la termine pas avant l'expiration du bail (crash, processus arrêté).
+
+    Chaque worker ouvre sa propre connexion; le mode WAL laisse les lectures
+    concurrentes aux écritures, et les réservations passent par BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, path: str = "jobs.db", retry_delay: float = 30.0):
+        """
+        Ouvre (ou crée) la file.
+
+        Args:
+            path: Fichier SQLite (sur un disque local: pas de système de fichiers réseau)
+            retry_delay: Délai avant de réessayer une tâche en échec (doublé à chaque tentative)
+        """
+        self.path = path
+        self.retry_delay = retry_delay
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Transactions gérées explicitement (isolation_level=None)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Ferme la connexion."""
+        self._db.close()
+
+    def enqueue(self, youtube_url: str, options: Optional[Dict] = None, max_attempts: int = 3) -> int:
+        """
+        Ajoute un transfert à la file.
+
+        Args:
+            youtube_url: URL de la playlist YouTube
+            options: Options de TransferPipeline.run (name, description, private, ...)
+            max_attempts: Nombre maximum de tentatives
+
+        Returns:
+            ID de la tâche
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO jobs (youtube, options, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (youtube_url, json.dumps(options or {}), max_attempts, now, now, now)
+            )
+        return cursor.lastrowid
+
+    def lease(self, worker_id: str, visibility_timeout: float = 600.0) -> Optional[QueuedJob]:
+        """
+        Réserve la prochaine tâche disponible (nouvelle, à réessayer, ou dont le bail a expiré).
+
+        Args:
+            worker_id: Identifiant du worker
+            visibility_timeout: Durée du bail en secondes
+
+        Returns:
+            Tâche réservée, ou None si la file est vide
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                # Baux expirés sans tentative restante: échec définitif
+                self._db.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'lease expired', lease_owner = NULL, updated_at = ? "
+                    "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                    (now, now)
+                )
+                row = self._db.execute(
+                    "SELECT * FROM jobs "
+                    "WHERE (status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?) "
+                    "ORDER BY available_at, id LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+
+                self._db.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now + visibility_timeout, now, row['id'])
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        return QueuedJob(
+            id=row['id'],
+            youtube_url=row['youtube'],
+            options=json.loads(row['options']),
+            attempts=row['attempts'] + 1,
+            max_attempts=row['max_attempts']
+        )
+
+    def heartbeat(self, job_id: int, worker_id: str, visibility_timeout: float = 600.0) -> bool:
+        """
+        Prolonge le bail d'une tâche en cours.
+
+        Returns:
+            False si le bail a été perdu (expiré et repris par un autre worker)
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + visibility_timeout, now, job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, exit_code: int,
+                 result: Optional[Dict] = None, report: Optional[str] = None) -> bool:
+        """
+        Enregistre le résultat d'une tâche terminée: 'done' pour les codes 0 et 2,
+        'failed' sinon (sans nouvelle tentative: le transfert est allé à son terme).
+
+        Args:
+            job_id: ID de la tâche
+            worker_id: Identifiant du worker titulaire du bail
+            exit_code: Code de retour du transfert (0 succès, 1 échec, 2 moins de 50%)
+            result: Résumé du transfert
+            report: Rapport détaillé (texte)
+
+        Returns:
+            False si le bail a été perdu entre-temps
+        """
+        status = 'done' if exit_code in (0, 2) else 'failed'
+        error = None if status == 'done' else f"transfert en échec (code {exit_code})"
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, exit_code = ?, result = ?, report = ?, error = ?, "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (status, exit_code, json.dumps(result or {}), report, error, time.time(), job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """
+        Enregistre un échec: la tâche est replanifiée (backoff exponentiel) ou abandonnée.
+
+        Args:
+            job_id: ID de la tâche
+            worker_id: Identifiant du worker titulaire du bail
+            error: Message d'erreur
+
+        Returns:
+            False si le bail a été perdu entre-temps
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                "available_at = ? + ? * (1 << (attempts - 1)), "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now, self.retry_delay, error, now, job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        """Renvoie une tâche (résultat décodé) ou None."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['options'] = json.loads(job['options'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        """Nombre de tâches par statut."""
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+def default_worker_id() -> str:
+    """Identifiant unique d'un worker: machine, processus et thread."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def run_worker(job_queue: JobQueue, pipeline: TransferPipeline, worker_id: Optional[str] = None,
+               visibility_timeout: float = 600.0, poll_interval: float = 2.0,
+               max_jobs: Optional[int] = None, exit_when_empty: bool = False,
+               stop_event: Optional[threading.Event] = None,
+               pipeline_for_user: Optional[Callable[[str], TransferPipeline]] = None) -> int:
+    """
+    Vide la file avec le pipeline existant (un transfert à la fois, bail prolongé pendant l'exécution).
+
+    Args:
+        job_queue: File de tâches
+        pipeline: Pipeline de transfert
+        worker_id: Identifiant du worker (par défaut: machine:pid:thread)
+        visibility_timeout: Durée du bail en secondes
+        poll_interval: Attente quand la file est vide
+        max_jobs: Nombre maximum de tâches à traiter (None = illimité)
+        exit_when_empty: S'arrêter dès que la file est vide
+        stop_event: Événement d'arrêt
+        pipeline_for_user: Pipeline du compte Spotify d'une tâche qui porte l'option 'user'
+                           (sans cette fabrique, ces tâches échouent)
+
+    Returns:
+        Nombre de tâches traitées
+    """
+    worker_id = worker_id or default_worker_id()
+    stop_event = stop_event or threading.Event()
+    processed = 0
+
+    while not stop_event.is_set() and (max_jobs is None or processed < max_jobs):
+        job = job_queue.lease(worker_id, visibility_timeout)
+        if job is None:
+            if exit_when_empty:
+                break
+            stop_event.wait(poll_interval)
+            continue
+
+        logger.info(f"⚙️  [{worker_id}] Tâche {job.id} (tentative {job.attempts}/{job.max_attempts}): {job.youtube_url}")
+
+        # Prolonger le bail tant que le transfert tourne
+        done = threading.Event()
+        lease_lost = threading.Event()
+
+        def keep_alive():
+            while not done.wait(visibility_timeout / 3):
+                if not job_queue.heartbeat(job.id, worker_id, visibility_timeout):
+                    lease_lost.set()
+                    logger.warning(f"⚠️  [{worker_id}] Bail de la tâche {job.id} perdu (repris par un autre worker)")
+                    return
+
+        heartbeat = threading.Thread(target=keep_alive, daemon=True)
+        heartbeat.start()
+
+        try:
+            options = dict(job.options)
+            user = options.pop('user', None)
+            if user is not None and pipeline_for_user is None:
+                raise ValueError(f"tâche de l'utilisateur {user} sans magasin de tokens (--token-store)")
+            job_pipeline = pipeline_for_user(user) if user is not None else pipeline
+            report = PlaylistTransferReport()
+            exit_code, report = job_pipeline.run(job.youtube_url, report=report, **options)
+            # Bail perdu: la tâche appartient à un autre worker, ce résultat ne doit pas l'écraser
+            if lease_lost.is_set() or not job_queue.complete(job.id, worker_id, exit_code,
+                                                             report.to_dict(), report.to_text()):
+                logger.warning(f"⚠️  [{worker_id}] Tâche {job.id}: bail perdu, résultat abandonné")
+        except Exception as e:
+            logger.error(f"❌ [{worker_id}] Tâche {job.id} en échec: {e}")
+            if not lease_lost.is_set() and not job_queue.fail(job.id, worker_id, str(e)):
+                logger.warning(f"⚠️  [{worker_id}] Tâche {job.id}: bail perdu, échec non enregistré")
+        finally:
+            done.set()
+            heartbeat.join()
+
+        processed += 1
+
+    return processed
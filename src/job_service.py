@@ -0,0 +1,337 @@
+"""
+Job Service Module
+Service HTTP local: soumission de transferts, suivi et rapports, traités par un pool de workers
+"""
+
+import json
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+
+from transfer_pipeline import PlaylistTransferReport, TransferPipeline
+
+
+# Options de transfert acceptées dans le corps de POST /jobs (même sens que la CLI) et leur type
+JOB_OPTIONS = {
+    'name': str,
+    'description': str,
+    'private': bool,
+    'force': bool,
+    'replace': bool,
+    'max_tracks': int,
+}
+
+# Nombre de tâches terminées conservées en mémoire
+MAX_FINISHED_JOBS = 1000
+
+
+def validate_options(options: Optional[Dict]) -> Dict:
+    """
+    Vérifie les options d'un transfert avant de les passer à TransferPipeline.run.
+
+    Args:
+        options: Options reçues (corps de POST /jobs)
+
+    Returns:
+        Copie des options, limitée à JOB_OPTIONS
+
+    Raises:
+        ValueError: si une option est inconnue ou d'un type inattendu
+    """
+    options = dict(options or {})
+    unknown = set(options) - set(JOB_OPTIONS)
+    if unknown:
+        raise ValueError(f"Options inconnues: {', '.join(sorted(unknown))}")
+
+    for key, value in options.items():
+        expected = JOB_OPTIONS[key]
+        # bool est un int pour Python: max_tracks=true serait accepté sans ce cas
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise ValueError(f"Option {key}: {expected.__name__} attendu, {type(value).__name__} reçu")
+    if options.get('max_tracks', 0) < 0:
+        raise ValueError("Option max_tracks: valeur positive attendue")
+    return options
+
+
+@dataclass(slots=True)
+class Job:
+    """Transfert soumis au service."""
+
+    id: str
+    youtube_url: str
+    options: Dict = field(default_factory=dict)
+    status: str = 'queued'  # 'queued', 'running', 'done' ou 'failed'
+    submitted_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    exit_code: Optional[int] = None
+    error: Optional[str] = None
+    report: Optional[PlaylistTransferReport] = None
+
+    def to_dict(self) -> Dict:
+        """État de la tâche (JSON-compatible)."""
+        return {
+            'id': self.id,
+            'youtube': self.youtube_url,
+            'options': self.options,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'exit_code': self.exit_code,
+            'error': self.error,
+            'summary': self.report.to_dict() if self.report else None,
+        }
+
+
+class JobService:
+    """
+    File de transferts traitée par des threads workers partageant un même TransferPipeline
+    (session Spotify, dictionnaires et cache déjà chargés).
+    """
+
+    def __init__(self, pipeline: TransferPipeline, workers: int = 2, latency_window: int = 200):
+        """
+        Initialise le service.
+
+        Args:
+            pipeline: Pipeline de transfert partagé par les workers
+            workers: Nombre de transferts traités simultanément
+            latency_window: Nombre de tâches récentes prises en compte dans les métriques de latence
+        """
+        self.pipeline = pipeline
+        self.workers = max(1, workers)
+
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._queue: 'queue.Queue[Optional[str]]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+        self.started_at = time.time()
+        self.completed = 0
+        self.failed = 0
+        self._wait_times: Deque[float] = deque(maxlen=latency_window)
+        self._run_times: Deque[float] = deque(maxlen=latency_window)
+
+    def start(self) -> None:
+        """Démarre les workers."""
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{index + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête les workers après les tâches en cours."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def alive_workers(self) -> int:
+        """Nombre de workers en vie (0: plus aucune tâche ne sera traitée)."""
+        return sum(thread.is_alive() for thread in self._threads)
+
+    def submit(self, youtube_url: str, options: Optional[Dict] = None) -> Job:
+        """
+        Ajoute un transfert à la file.
+
+        Args:
+            youtube_url: URL de la playlist YouTube
+            options: Options de transfert (voir JOB_OPTIONS)
+
+        Returns:
+            Tâche créée
+
+        Raises:
+            ValueError: si une option est inconnue ou d'un type inattendu
+        """
+        options = validate_options(options)
+
+        job = Job(id=uuid.uuid4().hex[:12], youtube_url=youtube_url, options=options, submitted_at=time.time())
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+        self._queue.put(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Renvoie une tâche par son ID."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Oublie les tâches terminées les plus anciennes au-delà de MAX_FINISHED_JOBS."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ('done', 'failed')]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _worker(self) -> None:
+        """Boucle d'un worker: traite les tâches jusqu'à l'arrêt du service."""
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self.get(job_id)
+            if job is not None:
+                self.run_job(job)
+
+    def run_job(self, job: Job) -> None:
+        """
+        Exécute un transfert avec le pipeline partagé.
+
+        Args:
+            job: Tâche à exécuter
+        """
+        job.status = 'running'
+        job.started_at = time.time()
+        job.report = PlaylistTransferReport()
+        job.report.profile = self.pipeline.config.get('profile', '')
+
+        try:
+            options = validate_options(job.options)
+            job.exit_code, _ = self.pipeline.run(job.youtube_url, report=job.report, **options)
+            job.status = 'done' if job.exit_code in (0, 2) else 'failed'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished_at = time.time()
+
+        with self._lock:
+            self._wait_times.append(job.started_at - job.submitted_at)
+            self._run_times.append(job.finished_at - job.started_at)
+            if job.status == 'done':
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def metrics(self) -> Dict:
+        """
+        Métriques du service: profondeur de file, tâches par statut, latences.
+
+        Returns:
+            Dict JSON-compatible
+        """
+        with self._lock:
+            statuses: Dict[str, int] = {}
+            for job in self.jobs.values():
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+            wait_times = sorted(self._wait_times)
+            run_times = sorted(self._run_times)
+            completed, failed = self.completed, self.failed
+
+        uptime = time.time() - self.started_at
+        return {
+            'queue_depth': self._queue.qsize(),
+            'workers': self.workers,
+            'jobs': statuses,
+            'completed': completed,
+            'failed': failed,
+            'jobs_per_minute': (completed + failed) / uptime * 60 if uptime else 0.0,
+            'queue_wait_seconds': _latency_stats(wait_times),
+            'run_seconds': _latency_stats(run_times),
+            'uptime_seconds': uptime,
+        }
+
+
+def _latency_stats(sorted_values: List[float]) -> Dict[str, float]:
+    """Moyenne, médiane et 95e centile d'une liste triée."""
+    if not sorted_values:
+        return {'avg': 0.0, 'p50': 0.0, 'p95': 0.0}
+    count = len(sorted_values)
+    return {
+        'avg': sum(sorted_values) / count,
+        'p50': sorted_values[count // 2],
+        'p95': sorted_values[min(count - 1, int(count * 0.95))],
+    }
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes HTTP du service:
+
+        POST /jobs              {"youtube": URL, "name": ..., ...} → 202 {"id", "status"}
+        GET  /jobs/<id>         état de la tâche
+        GET  /jobs/<id>/report  rapport détaillé (texte)
+        GET  /health            état du service
+        GET  /metrics           profondeur de file et latences
+    """
+
+    service: JobService  # Défini par make_server
+
+    def do_GET(self) -> None:
+        if self.path == '/health':
+            alive = self.service.alive_workers()
+            self._send_json(200 if alive else 503, {'status': 'ok' if alive else 'down', 'workers_alive': alive})
+            return
+        if self.path == '/metrics':
+            self._send_json(200, self.service.metrics())
+            return
+
+        match = re.fullmatch(r'/jobs/([0-9a-f]+)(/report)?', self.path)
+        job = self.service.get(match.group(1)) if match else None
+        if job is None:
+            self._send_json(404, {'error': 'not found'})
+        elif not match.group(2):
+            self._send_json(200, job.to_dict())
+        elif job.status not in ('done', 'failed') or job.report is None:
+            self._send_json(409, {'error': 'report not ready', 'status': job.status})
+        else:
+            self._send(200, 'text/plain; charset=utf-8', job.report.to_text().encode('utf-8'))
+
+    def do_POST(self) -> None:
+        if self.path != '/jobs':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("objet JSON attendu")
+            youtube_url = body.pop('youtube')
+            if not isinstance(youtube_url, str):
+                raise ValueError("youtube: URL attendue")
+            job = self.service.submit(youtube_url, body)
+        except (ValueError, KeyError, AttributeError) as e:
+            self._send_json(400, {'error': f"requête invalide: {e}"})
+            return
+
+        self._send_json(202, {'id': job.id, 'status': job.status})
+
+    def _send_json(self, status: int, data: Dict) -> None:
+        self._send(status, 'application/json', json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def _send(self, status: int, content_type: str, payload: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        # Pas de journal d'accès sur stderr
+        pass
+
+
+def make_server(service: JobService, host: str = '127.0.0.1', port: int = 8765) -> Tuple[ThreadingHTTPServer, int]:
+    """
+    Crée le serveur HTTP du service (non démarré).
+
+    Args:
+        service: Service de tâches
+        host: Adresse d'écoute (locale par défaut)
+        port: Port d'écoute (0 = port libre)
+
+    Returns:
+        Tuple (serveur, port effectif)
+    """
+    handler = type('BoundJobRequestHandler', (JobRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    return server, server.server_address[1]
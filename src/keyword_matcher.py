@@ -0,0 +1,212 @@
+"""
+Keyword Matcher Module
+Automate Aho-Corasick pour rechercher des milliers de mots-clés en une seule passe
+"""
+
+import json
+import threading
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    Automate multi-motifs (Aho-Corasick) avec détection des limites de mots.
+
+    Chaque mot-clé est associé à un ou plusieurs labels (ex: un genre). Le texte
+    est parcouru une seule fois, quel que soit le nombre de mots-clés.
+
+    La compilation est protégée par un verrou: plusieurs threads peuvent lancer
+    les premières recherches en même temps.
+    """
+
+    def __init__(self, keywords: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        Initialise l'automate.
+
+        Args:
+            keywords: Dict optionnel {label: [mots-clés]} à ajouter immédiatement
+        """
+        # Transitions de chaque état: {caractère: état suivant}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Mots-clés se terminant sur chaque état: [(longueur du mot-clé, label)]
+        self._keywords: List[List[Tuple[int, str]]] = [[]]
+        # Sorties de chaque état (mots-clés propres + hérités des liens d'échec), calculées par compile()
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        self._compiled = False
+        self._lock = threading.Lock()
+        self.keyword_count = 0
+
+        if keywords:
+            for label, words in keywords.items():
+                for word in words:
+                    self.add_keyword(word, label)
+
+    def add_keyword(self, keyword: str, label: str) -> None:
+        """
+        Ajoute un mot-clé associé à un label.
+
+        Args:
+            keyword: Mot-clé (insensible à la casse)
+            label: Label renvoyé quand le mot-clé est trouvé
+        """
+        keyword = keyword.strip().lower()
+        if not keyword:
+            return
+
+        with self._lock:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._keywords.append([])
+                state = next_state
+
+            entry = (len(keyword), label)
+            if entry not in self._keywords[state]:
+                self._keywords[state].append(entry)
+                self.keyword_count += 1
+            self._compiled = False
+
+    def load_file(self, path: str) -> int:
+        """
+        Charge des mots-clés depuis un fichier.
+
+        Formats supportés:
+            - JSON: {label: [mots-clés]}
+            - Texte: une ligne "label<TAB>mot-clé" par mot-clé (# pour les commentaires)
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            Nombre de mots-clés ajoutés
+        """
+        before = self.keyword_count
+
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                data = json.load(f)
+                for label, words in data.items():
+                    for word in words:
+                        self.add_keyword(word, label)
+            else:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    label, _, word = line.partition('\t')
+                    if word:
+                        self.add_keyword(word, label)
+
+        return self.keyword_count - before
+
+    def compile(self) -> None:
+        """
+        Calcule les liens d'échec et les sorties (parcours en largeur). Appelé automatiquement.
+
+        Les sorties sont reconstruites depuis les mots-clés de chaque état: compiler
+        à nouveau après add_keyword ne duplique pas les correspondances héritées.
+        """
+        with self._lock:
+            if self._compiled:
+                return
+
+            goto = self._goto
+            fail = [0] * len(goto)
+            output = [list(keywords) for keywords in self._keywords]
+            queue: deque = deque(goto[0].values())
+
+            while queue:
+                state = queue.popleft()
+                for char, next_state in goto[state].items():
+                    queue.append(next_state)
+
+                    fallback = fail[state]
+                    while fallback and char not in goto[fallback]:
+                        fallback = fail[fallback]
+                    target = goto[fallback].get(char, 0)
+                    fail[next_state] = target if target != next_state else 0
+
+                    # Hériter des sorties du lien d'échec (déjà complètes: parcours en largeur)
+                    output[next_state] = output[next_state] + output[fail[next_state]]
+
+            self._fail, self._output = fail, output
+            self._compiled = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Parcourt le texte et renvoie chaque mot-clé trouvé sur des limites de mots.
+
+        Args:
+            text: Texte à analyser
+
+        Yields:
+            Tuples (début, fin, label)
+        """
+        if not self._compiled:
+            self.compile()
+
+        text = text.lower()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        length = len(text)
+        state = 0
+
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if not output[state]:
+                continue
+
+            # Limite de mot à droite
+            if i + 1 < length and text[i + 1].isalnum():
+                continue
+
+            for keyword_length, label in output[state]:
+                start = i - keyword_length + 1
+                # Limite de mot à gauche
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                yield start, i + 1, label
+
+    def count_matches(self, text: str) -> Dict[str, int]:
+        """
+        Compte les occurrences par label.
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Dict {label: nombre d'occurrences}
+        """
+        counts: Dict[str, int] = {}
+        for _, _, label in self.iter_matches(text):
+            counts[label] = counts.get(label, 0) + 1
+        return counts
+
+    def distinct_keywords(self, text: str) -> Dict[str, int]:
+        """
+        Compte les mots-clés distincts trouvés par label.
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Dict {label: nombre de mots-clés différents trouvés}
+        """
+        seen = set()
+        for start, end, label in self.iter_matches(text):
+            seen.add((label, text[start:end].lower()))
+
+        counts: Dict[str, int] = {}
+        for label, _ in seen:
+            counts[label] = counts.get(label, 0) + 1
+        return counts
@@ -0,0 +1,361 @@
+"""
+Local Catalog Module
+Correspondance hors ligne contre un dump local du catalogue Spotify (fichier binaire mappé en mémoire)
+"""
+
+import csv
+import heapq
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+from collections import defaultdict
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from match_scoring import MatchScoringMixin
+from models import TrackCandidate
+from query_planner import QueryPlan
+
+
+MAGIC = b'YT2SCAT2'
+# magic, nombre de pistes, nombre de mots, début des offsets, des enregistrements,
+# des offsets de mots, des entrées (début, nombre) de postings, des postings, des mots
+HEADER = struct.Struct('<8sIIQQQQQQ')
+
+# Préfixes de filtres Spotify ignorés lors de la recherche locale
+FIELD_PREFIX = re.compile(r'\b(?:track|artist|album):', re.IGNORECASE)
+
+# En dessous de ce nombre de titres, le parallélisme coûte plus qu'il ne rapporte
+PARALLEL_THRESHOLD = 200
+
+_worker_matcher: Optional['LocalCatalogMatcher'] = None
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découpe un texte en mots normalisés (minuscules, sans accents, sans filtres Spotify).
+
+    Args:
+        text: Texte ou requête
+
+    Returns:
+        Liste de mots
+    """
+    text = FIELD_PREFIX.sub(' ', text)
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'[^\W_]+', text)
+
+
+def _read_source(path: str) -> Iterator[Dict]:
+    """Lit les pistes d'un CSV ou d'un fichier Parquet (pandas requis pour Parquet)."""
+    if path.endswith('.parquet'):
+        import pandas as pd
+        for row in pd.read_parquet(path).to_dict('records'):
+            yield row
+        return
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def build_catalog(source_path: str, output_path: str) -> int:
+    """
+    Convertit un dump CSV/Parquet en catalogue binaire compact avec index inversé.
+
+    Colonnes attendues: id, name, artists (séparés par ';'), album, popularity, duration_ms, uri (optionnelle)
+
+    Args:
+        source_path: Fichier source (.csv ou .parquet)
+        output_path: Fichier catalogue à créer
+
+    Returns:
+        Nombre de pistes écrites
+    """
+    records: List[bytes] = []
+    postings: Dict[str, List[int]] = defaultdict(list)
+
+    for row in _read_source(source_path):
+        artists = row.get('artists') or ''
+        if not isinstance(artists, str):
+            artists = ';'.join(artists)
+
+        fields = [
+            str(row['id']),
+            str(row.get('name') or ''),
+            artists,
+            str(row.get('album') or ''),
+            str(int(row.get('popularity') or 0)),
+            str(int(row.get('duration_ms') or 0)),
+            str(row.get('uri') or f"spotify:track:{row['id']}"),
+        ]
+        record_id = len(records)
+        records.append('\t'.join(field.replace('\t', ' ') for field in fields).encode('utf-8'))
+
+        for token in set(tokenize(f"{fields[1]} {artists.replace(';', ' ')}")):
+            postings[token].append(record_id)
+
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    # Index trié (ordre des octets UTF-8): recherche dichotomique directement dans le mapping
+    tokens = sorted((token.encode('utf-8'), record_ids) for token, record_ids in postings.items())
+    token_offsets = [0]
+    entries: List[int] = []
+    flat_postings: List[int] = []
+    for token, record_ids in tokens:
+        token_offsets.append(token_offsets[-1] + len(token))
+        entries.extend((len(flat_postings), len(record_ids)))
+        flat_postings.extend(record_ids)
+
+    offsets_start = HEADER.size
+    records_start = offsets_start + 8 * len(offsets)
+    # Aligner les tableaux de l'index sur 8 octets pour memoryview.cast('Q')
+    padding = (-(records_start + offsets[-1])) % 8
+    token_offsets_start = records_start + offsets[-1] + padding
+    entries_start = token_offsets_start + 8 * len(token_offsets)
+    postings_start = entries_start + 4 * len(entries)
+    tokens_start = postings_start + 4 * len(flat_postings)
+
+    with open(output_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(records), len(tokens), offsets_start, records_start,
+                            token_offsets_start, entries_start, postings_start, tokens_start))
+        f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+        for record in records:
+            f.write(record)
+        f.write(b'\0' * padding)
+        f.write(struct.pack(f'<{len(token_offsets)}Q', *token_offsets))
+        f.write(struct.pack(f'<{len(entries)}I', *entries))
+        f.write(struct.pack(f'<{len(flat_postings)}I', *flat_postings))
+        for token, _ in tokens:
+            f.write(token)
+
+    return len(records)
+
+
+class LocalCatalog:
+    """
+    Catalogue binaire mappé en mémoire: seules les pages lues sont chargées,
+    et plusieurs processus partagent le même cache disque.
+
+    L'index (mots triés, offsets, postings) est lu dans le mapping par recherche
+    dichotomique: l'ouverture ne charge rien, quelle que soit la taille du catalogue.
+    """
+
+    def __init__(self, path: str):
+        """
+        Ouvre un catalogue créé par build_catalog.
+
+        Args:
+            path: Chemin du catalogue
+
+        Raises:
+            ValueError: Fichier invalide ou créé par une ancienne version (à reconstruire)
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, self.track_count, self.token_count, offsets_start, self._records_start,
+         token_offsets_start, entries_start, postings_start, self._tokens_start) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            self._file.close()
+            raise ValueError(f"❌ Fichier catalogue invalide ou ancien format (à reconstruire): {path}")
+
+        self._view = memoryview(self._mmap)
+        self._offsets = self._view[offsets_start:self._records_start].cast('Q')
+        self._token_offsets = self._view[token_offsets_start:entries_start].cast('Q')
+        self._entries = self._view[entries_start:postings_start].cast('I')
+        self._postings = self._view[postings_start:self._tokens_start].cast('I')
+
+    def __len__(self) -> int:
+        return self.track_count
+
+    def close(self) -> None:
+        """Libère le mapping mémoire."""
+        for view in (self._offsets, self._token_offsets, self._entries, self._postings):
+            view.release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def record(self, record_id: int) -> TrackCandidate:
+        """
+        Décode une piste du catalogue.
+
+        Args:
+            record_id: Numéro de la piste
+
+        Returns:
+            Piste au même format que SpotifyManager.search_track
+        """
+        start = self._records_start + self._offsets[record_id]
+        end = self._records_start + self._offsets[record_id + 1]
+        track_id, name, artists, album, popularity, duration_ms, uri = \
+            self._mmap[start:end].decode('utf-8').split('\t')
+
+        return TrackCandidate(
+            id=track_id,
+            name=name,
+            artists=tuple(artist for artist in artists.split(';') if artist),
+            album=album,
+            uri=uri,
+            popularity=int(popularity),
+            duration_ms=int(duration_ms)
+        )
+
+    def _token(self, position: int) -> bytes:
+        """Mot à la position `position` de l'index trié."""
+        start = self._tokens_start + self._token_offsets[position]
+        return self._mmap[start:self._tokens_start + self._token_offsets[position + 1]]
+
+    def postings(self, token: str) -> List[int]:
+        """
+        Pistes contenant un mot (recherche dichotomique dans l'index mappé).
+
+        Args:
+            token: Mot normalisé (voir tokenize)
+
+        Returns:
+            Numéros des pistes (vide si le mot est inconnu)
+        """
+        key = token.encode('utf-8')
+        low, high = 0, self.token_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._token(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self.token_count or self._token(low) != key:
+            return []
+        start, count = self._entries[2 * low], self._entries[2 * low + 1]
+        return self._postings[start:start + count].tolist()
+
+    def search(self, query: str, limit: int = 10) -> List[TrackCandidate]:
+        """
+        Recherche les pistes partageant le plus de mots avec la requête.
+
+        Args:
+            query: Requête (mêmes formats que la recherche Spotify)
+            limit: Nombre maximum de résultats
+
+        Returns:
+            Liste des pistes trouvées
+        """
+        hits: Dict[int, int] = defaultdict(int)
+
+        for token in set(tokenize(query)):
+            for record_id in self.postings(token):
+                hits[record_id] += 1
+
+        best = heapq.nlargest(limit, hits.items(), key=lambda item: (item[1], -item[0]))
+        return [self.record(record_id) for record_id, _ in best]
+
+
+class LocalCatalogMatcher(MatchScoringMixin):
+    """
+    Remplaçant hors ligne de SpotifyManager pour la recherche (même interface).
+    """
+
+    def __init__(self, catalog_path: str, config: Optional[Dict] = None):
+        """
+        Initialise le matcher.
+
+        Args:
+            catalog_path: Chemin du catalogue binaire
+            config: Section 'spotify' de la configuration (voir config/settings.py)
+        """
+        config = config or {}
+        self.search_limit = config.get('search_limit', 5)
+        self.relevance_threshold = config.get('relevance_threshold', 0.3)
+        self.configure_duration(config)
+        self.catalog = LocalCatalog(catalog_path)
+
+    def search_track(self, query: str, limit: int = 10) -> List[TrackCandidate]:
+        """Recherche des pistes dans le catalogue local."""
+        return self.catalog.search(query, limit)
+
+    def find_best_match(self, search_queries: List[str], original_title: str,
+                        duration: Optional[float] = None,
+                        plans: Optional[List[QueryPlan]] = None) -> Optional[TrackCandidate]:
+        """
+        Trouve la meilleure correspondance locale pour une liste de requêtes.
+
+        Args:
+            search_queries: Liste des requêtes de recherche
+            original_title: Titre original pour comparaison
+            duration: Durée de la vidéo en secondes
+            plans: Liste à compléter avec le plan de la recherche
+
+        Returns:
+            Meilleure piste trouvée ou None
+        """
+        candidates: Dict[str, TrackCandidate] = {}
+        plan = self._plan_queries(search_queries, plans)
+
+        for query in plan.queries:
+            tracks = self.search_track(query, limit=self.search_limit)
+            if self._score_results(plan, tracks, original_title, query, candidates, duration):
+                break
+
+        return self._select_best_match(candidates.values())
+
+
+def _init_worker(catalog_path: str, config: Optional[Dict]) -> None:
+    """Ouvre le catalogue une fois par processus (le mapping est partagé par le système)."""
+    global _worker_matcher
+    _worker_matcher = LocalCatalogMatcher(catalog_path, config)
+
+
+def _match_in_worker(item: Tuple) -> Optional[TrackCandidate]:
+    assert _worker_matcher is not None
+    return _worker_matcher.find_best_match(*item)
+
+
+def match_many(catalog_path: str, items: List[Tuple],
+               config: Optional[Dict] = None, workers: Optional[int] = None) -> List[Optional[TrackCandidate]]:
+    """
+    Cherche de nombreux titres dans le catalogue, sur plusieurs cœurs pour les gros volumes.
+
+    Args:
+        catalog_path: Chemin du catalogue binaire
+        items: Liste de tuples (requêtes, titre original[, durée de la vidéo])
+        config: Section 'spotify' de la configuration
+        workers: Nombre de processus (par défaut: nombre de cœurs)
+
+    Returns:
+        Meilleure piste (ou None) pour chaque titre, dans le même ordre
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(items) < PARALLEL_THRESHOLD:
+        matcher = LocalCatalogMatcher(catalog_path, config)
+        try:
+            return [matcher.find_best_match(*item) for item in items]
+        finally:
+            matcher.catalog.close()
+
+    with Pool(workers, initializer=_init_worker, initargs=(catalog_path, config)) as pool:
+        return pool.map(_match_in_worker, items, chunksize=max(1, len(items) // (workers * 4)))
+
+
+def main():
+    """Construit un catalogue: python local_catalog.py source.csv catalogue.bin"""
+    if len(sys.argv) != 3:
+        print("Usage: python local_catalog.py <source.csv|source.parquet> <catalogue.bin>")
+        return 1
+
+    count = build_catalog(sys.argv[1], sys.argv[2])
+    print(f"✅ {count} pistes écrites dans {sys.argv[2]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
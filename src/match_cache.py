@@ -0,0 +1,264 @@
+"""
+Match Cache Module
+Cache local persistant des correspondances YouTube → Spotify
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from app_logging import get_logger
+from models import TrackCandidate
+
+logger = get_logger('match_cache')
+
+
+class MatchCache:
+    """
+    Cache JSON des pistes Spotify déjà trouvées, indexé par titre normalisé et par ID de vidéo.
+
+    Les titres introuvables sont aussi mémorisés (cache négatif): ils ne sont
+    recherchés à nouveau qu'après un délai qui double à chaque nouvel échec.
+
+    Plusieurs processus peuvent partager le fichier: save() relit le cache sous un
+    verrou et n'y applique que les entrées modifiées par ce processus.
+    """
+
+    def __init__(self, path: str = ".match_cache.json", config: Optional[Dict] = None):
+        """
+        Initialise le cache et charge le fichier s'il existe.
+
+        Args:
+            path: Chemin du fichier de cache
+            config: Section 'cache' de la configuration (voir config/settings.py)
+        """
+        config = config or {}
+        self.negative_ttl = config.get('negative_ttl', 86400)
+        self.negative_backoff = config.get('negative_backoff', 2.0)
+        self.negative_max_ttl = config.get('negative_max_ttl', 30 * 86400)
+
+        self.path = path
+        self.tracks: Dict[str, Dict] = {}
+        self.videos: Dict[str, str] = {}
+        self.misses: Dict[str, Dict] = {}
+
+        # Clés modifiées depuis le dernier save() (seules écrites par-dessus le fichier)
+        self._changed_tracks: Set[str] = set()
+        self._changed_videos: Set[str] = set()
+        self._changed_misses: Set[str] = set()
+
+        self.tracks, self.videos, self.misses = self._read()
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+    @staticmethod
+    def make_key(title: str) -> str:
+        """
+        Normalise un titre YouTube en clé de cache.
+
+        Args:
+            title: Titre brut de la vidéo
+
+        Returns:
+            Clé normalisée
+        """
+        return re.sub(r'\s+', ' ', title).strip().lower()
+
+    def get(self, title: str, video_id: Optional[str] = None) -> Optional[TrackCandidate]:
+        """
+        Cherche une correspondance en cache (par ID de vidéo puis par titre).
+
+        Args:
+            title: Titre de la vidéo
+            video_id: ID YouTube de la vidéo
+
+        Returns:
+            Piste Spotify en cache ou None
+        """
+        entry = self.tracks.get(self._resolve_key(title, video_id))
+        return TrackCandidate.from_dict(entry) if entry else None
+
+    def put(self, title: str, track: TrackCandidate, video_id: Optional[str] = None) -> None:
+        """
+        Enregistre une correspondance.
+
+        Args:
+            title: Titre de la vidéo
+            track: Piste Spotify trouvée
+            video_id: ID YouTube de la vidéo
+        """
+        key = self.make_key(title)
+        self.tracks[key] = {**track.to_dict(), 'cached_at': time.time()}
+        self.misses.pop(key, None)
+        self._changed_tracks.add(key)
+        self._changed_misses.add(key)
+        if video_id:
+            self.videos[video_id] = key
+            self._changed_videos.add(video_id)
+
+    def get_miss(self, title: str, video_id: Optional[str] = None,
+                 now: Optional[float] = None) -> Optional[Dict]:
+        """
+        Indique si un titre est un échec connu qu'il n'est pas encore temps de revérifier.
+
+        Args:
+            title: Titre de la vidéo
+            video_id: ID YouTube de la vidéo
+            now: Horodatage courant (par défaut: time.time())
+
+        Returns:
+            Entrée du cache négatif ({'misses', 'checked_at', 'retry_at'}) ou None si une recherche est nécessaire
+        """
+        entry = self.misses.get(self._resolve_key(title, video_id))
+        if entry and entry['retry_at'] > (time.time() if now is None else now):
+            return entry
+        return None
+
+    def put_miss(self, title: str, video_id: Optional[str] = None, now: Optional[float] = None) -> Dict:
+        """
+        Enregistre un titre introuvable et planifie sa prochaine vérification.
+
+        Le délai vaut negative_ttl × negative_backoff^(échecs - 1), plafonné à negative_max_ttl.
+
+        Args:
+            title: Titre de la vidéo
+            video_id: ID YouTube de la vidéo
+            now: Horodatage courant (par défaut: time.time())
+
+        Returns:
+            Entrée du cache négatif mise à jour
+        """
+        now = time.time() if now is None else now
+        key = self.make_key(title)
+        misses = self.misses.get(key, {}).get('misses', 0) + 1
+        delay = min(self.negative_ttl * self.negative_backoff ** (misses - 1), self.negative_max_ttl)
+
+        entry = {'misses': misses, 'checked_at': now, 'retry_at': now + delay}
+        self.misses[key] = entry
+        self._changed_misses.add(key)
+        if video_id:
+            self.videos[video_id] = key
+            self._changed_videos.add(video_id)
+        return entry
+
+    def track_ids(self) -> List[str]:
+        """Renvoie les IDs Spotify distincts présents dans le cache."""
+        return list({track['id'] for track in self.tracks.values() if track.get('id')})
+
+    def merge_refreshed(self, refreshed: Dict[str, Optional[TrackCandidate]]) -> Tuple[int, int]:
+        """
+        Fusionne des métadonnées fraîches dans le cache.
+
+        Args:
+            refreshed: Dict {track_id: piste à jour, ou None si indisponible}
+
+        Returns:
+            Tuple (entrées mises à jour, entrées supprimées car indisponibles)
+        """
+        updated = 0
+        removed_keys = []
+
+        for key, track in self.tracks.items():
+            track_id = track.get('id')
+            if track_id not in refreshed:
+                continue
+
+            fresh = refreshed[track_id]
+            if fresh is None:
+                removed_keys.append(key)
+            else:
+                # Conserver le score de pertinence calculé lors de la recherche
+                self.tracks[key] = {
+                    **fresh.to_dict(),
+                    'relevance_score': track.get('relevance_score', 0.0),
+                    'cached_at': time.time()
+                }
+                self._changed_tracks.add(key)
+                updated += 1
+
+        for key in removed_keys:
+            del self.tracks[key]
+            self._changed_tracks.add(key)
+        if removed_keys:
+            removed = set(removed_keys)
+            stale_videos = [vid for vid, key in self.videos.items() if key in removed]
+            for vid in stale_videos:
+                del self.videos[vid]
+            self._changed_videos.update(stale_videos)
+
+        return updated, len(removed_keys)
+
+    def _resolve_key(self, title: str, video_id: Optional[str]) -> str:
+        """Clé d'une vidéo: via son ID si connu, sinon via son titre normalisé."""
+        key = self.videos.get(video_id) if video_id else None
+        return key if key is not None else self.make_key(title)
+
+    def _read(self) -> Tuple[Dict[str, Dict], Dict[str, str], Dict[str, Dict]]:
+        """Lit le fichier de cache (sections vides s'il est absent ou illisible)."""
+        if not os.path.exists(self.path):
+            return {}, {}, {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get('tracks', {}), data.get('videos', {}), data.get('misses', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Cache illisible ({self.path}), ignoré: {e}")
+            return {}, {}, {}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Verrou exclusif entre processus sur le fichier de cache (fichier .lock à côté)."""
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        """
+        Écrit le cache sur disque: relit le fichier sous verrou, y applique les entrées
+        modifiées depuis le dernier save(), puis le remplace de façon atomique.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._locked():
+            tracks, videos, misses = self._read()
+            for current, on_disk, changed in ((self.tracks, tracks, self._changed_tracks),
+                                              (self.videos, videos, self._changed_videos),
+                                              (self.misses, misses, self._changed_misses)):
+                for key in changed:
+                    if key in current:
+                        on_disk[key] = current[key]
+                    else:
+                        on_disk.pop(key, None)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f"{os.path.basename(self.path)}.",
+                                            suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'tracks': tracks, 'videos': videos, 'misses': misses}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        # Les entrées écrites par les autres processus sont désormais visibles ici aussi
+        self.tracks, self.videos, self.misses = tracks, videos, misses
+        self._changed_tracks.clear()
+        self._changed_videos.clear()
+        self._changed_misses.clear()
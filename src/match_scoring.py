@@ -0,0 +1,234 @@
+"""
+Match Scoring Module
+Calcul de pertinence des pistes Spotify, partagé par les gestionnaires synchrone et asynchrone
+"""
+
+import heapq
+import re
+from typing import Dict, Iterable, List, Optional
+
+from models import TrackCandidate
+from query_planner import QueryPlan, plan_queries
+
+
+class MatchScoringMixin:
+    """
+    Score de pertinence et sélection de la meilleure piste.
+
+    Les classes qui l'utilisent doivent définir `relevance_threshold`
+    (et peuvent ajuster les réglages de durée ci-dessous).
+    """
+    
+    relevance_threshold: float = 0.3
+    
+    # Accord de durée YouTube / Spotify
+    duration_tolerance: float = 0.3  # Écart relatif maximal quand la piste dure plus que la vidéo (versions longues)
+    duration_overrun: float = 1.0  # Excédent toléré d'une vidéo plus longue que la piste, relatif à la piste (clip, scènes)
+    duration_slack: float = 20.0  # Écart absolu toujours toléré (intro/outro du clip), en secondes
+    duration_weight: float = 0.15  # Part de l'accord de durée dans le score
+    duration_prune: bool = False  # Écarter les candidats hors tolérance avant le score (sinon simple malus)
+    early_accept: bool = True  # Arrêter les requêtes dès qu'un candidat concorde (titre + durée)
+    
+    def _plan_queries(self, search_queries: List[str], plans: Optional[List[QueryPlan]] = None) -> QueryPlan:
+        """
+        Fusionne les requêtes équivalentes avant l'envoi (voir query_planner).
+        
+        Le plan est propre à chaque recherche (jamais stocké sur l'instance, partagée entre threads).
+        
+        Args:
+            search_queries: Requêtes candidates
+            plans: Liste à compléter avec le plan (pour le rapport de l'appelant)
+            
+        Returns:
+            Plan de la recherche (plan.queries: requêtes à envoyer)
+        """
+        plan = plan_queries(search_queries)
+        if plans is not None:
+            plans.append(plan)
+        return plan
+    
+    def configure_duration(self, config: Dict) -> None:
+        """
+        Applique les réglages de durée de la section 'spotify' de la configuration.
+        
+        Args:
+            config: Section 'spotify' (voir config/settings.py)
+        """
+        self.duration_tolerance = config.get('duration_tolerance', self.duration_tolerance)
+        self.duration_overrun = config.get('duration_overrun', self.duration_overrun)
+        self.duration_slack = config.get('duration_slack', self.duration_slack)
+        self.duration_weight = config.get('duration_weight', self.duration_weight)
+        self.duration_prune = config.get('duration_prune', self.duration_prune)
+        self.early_accept = config.get('early_accept', self.early_accept)
+    
+    def _duration_agreement(self, track: TrackCandidate, duration: Optional[float]) -> Optional[float]:
+        """
+        Accord entre la durée de la vidéo et celle de la piste.
+        
+        La tolérance est asymétrique: un clip dépasse souvent la piste (intro, scènes,
+        générique), alors qu'une piste bien plus longue que la vidéo est une autre version.
+        
+        Args:
+            track: Piste Spotify
+            duration: Durée de la vidéo YouTube en secondes
+            
+        Returns:
+            1.0 pour une durée identique, 0.0 à la limite de tolérance, négatif au-delà,
+            None si l'une des durées est inconnue
+        """
+        if not duration or not track.duration_ms:
+            return None
+        track_seconds = track.duration_ms / 1000
+        if duration > track_seconds:
+            allowed = max(self.duration_slack, self.duration_overrun * track_seconds)
+        else:
+            allowed = max(self.duration_slack, self.duration_tolerance * duration)
+        return 1.0 - abs(track_seconds - duration) / allowed
+    
+    def _score_results(self, plan: Optional[QueryPlan], tracks: List[TrackCandidate], original_title: str,
+                       query: str, candidates: Dict[str, TrackCandidate],
+                       duration: Optional[float] = None) -> bool:
+        """
+        Note les résultats d'une requête (durées incompatibles écartées avant le score si duration_prune).
+        
+        Args:
+            plan: Plan de la recherche (compteur de candidats écartés)
+            tracks: Résultats de la requête
+            original_title: Titre original YouTube
+            query: Requête utilisée
+            candidates: Dict {track_id: candidat} à compléter
+            duration: Durée de la vidéo en secondes
+            
+        Returns:
+            True si un candidat concorde assez (titre et durée) pour arrêter la recherche
+        """
+        confident = False
+        for track in tracks:
+            agreement = self._duration_agreement(track, duration)
+            if self.duration_prune and agreement is not None and agreement < 0:
+                # Mauvaise version (mix étendu, extrait...): inutile de la noter
+                if plan is not None:
+                    plan.pruned_candidates += 1
+                continue
+            
+            track.relevance_score = self._calculate_relevance_score(track, original_title, query, duration)
+            self._merge_candidate(candidates, track)
+            if (self.early_accept and agreement is not None and agreement >= 0.5
+                    and track.relevance_score > self.relevance_threshold
+                    and self._title_contains_track(track, original_title)):
+                confident = True
+        return confident
+    
+    def _title_contains_track(self, track: TrackCandidate, original_title: str) -> bool:
+        """Le titre YouTube contient-il tous les mots du nom de la piste et de son artiste principal ?"""
+        title_words = set(re.findall(r'\w+', original_title.lower()))
+        name_words = set(re.findall(r'\w+', track.name.lower()))
+        artist_words = set(re.findall(r'\w+', track.artists[0].lower())) if track.artists else set()
+        return bool(name_words) and name_words <= title_words and artist_words <= title_words
+    
+    def _track_to_info(self, track: Dict) -> TrackCandidate:
+        """Extrait les champs utiles d'un objet piste de l'API Spotify."""
+        return TrackCandidate.from_api(track)
+    
+    def _merge_candidate(self, candidates: Dict[str, TrackCandidate], track: TrackCandidate) -> None:
+        """
+        Ajoute un candidat noté en dédupliquant par ID de piste (le meilleur score est conservé).
+        
+        Args:
+            candidates: Dict {track_id: candidat} à compléter
+            track: Candidat avec son 'relevance_score'
+        """
+        existing = candidates.get(track.id)
+        if existing is None or track.relevance_score > existing.relevance_score:
+            candidates[track.id] = track
+    
+    def _select_best_match(self, candidates: Iterable[TrackCandidate]) -> Optional[TrackCandidate]:
+        """
+        Sélectionne la piste la plus pertinente parmi les candidats notés.
+        
+        Args:
+            candidates: Candidats avec leur 'relevance_score'
+            
+        Returns:
+            Meilleure piste si son score dépasse le seuil, None sinon
+        """
+        best = self._select_top_matches(candidates, 1)
+        return best[0] if best else None
+    
+    def _select_top_matches(self, candidates: Iterable[TrackCandidate], k: int) -> List[TrackCandidate]:
+        """
+        Sélectionne les k pistes les plus pertinentes (tas de taille k, sans tri complet).
+        
+        Args:
+            candidates: Candidats avec leur 'relevance_score'
+            k: Nombre de pistes à garder
+            
+        Returns:
+            Pistes dont le score dépasse le seuil, de la meilleure à la moins bonne
+        """
+        # Seuil de confiance
+        eligible = (track for track in candidates if track.relevance_score > self.relevance_threshold)
+        return heapq.nlargest(k, eligible, key=lambda track: track.relevance_score)
+    
+    def _calculate_relevance_score(self, track: TrackCandidate, original_title: str, query: str,
+                                   duration: Optional[float] = None) -> float:
+        """
+        Calcule un score de pertinence pour une piste.
+        
+        Args:
+            track: Informations de la piste Spotify
+            original_title: Titre original YouTube
+            query: Requête de recherche utilisée
+            duration: Durée de la vidéo en secondes (ajoute l'accord de durée au score)
+            
+        Returns:
+            Score de pertinence entre 0 et 1
+        """
+        score = 0.0
+        
+        # Score basé sur la popularité (20% du score)
+        score += (track.popularity / 100) * 0.2
+        
+        # Score basé sur la correspondance du titre (40% du score)
+        title_similarity = self._calculate_similarity(
+            track.name.lower(), 
+            original_title.lower()
+        )
+        score += title_similarity * 0.4
+        
+        # Score basé sur la correspondance des artistes (40% du score)
+        artists_text = ' '.join(track.artists).lower()
+        artist_similarity = self._calculate_similarity(
+            artists_text, 
+            original_title.lower()
+        )
+        score += artist_similarity * 0.4
+        
+        # Accord de durée (duration_weight du score, si les deux durées sont connues)
+        agreement = self._duration_agreement(track, duration)
+        if agreement is not None:
+            score = score * (1 - self.duration_weight) + max(agreement, 0.0) * self.duration_weight
+        
+        return min(score, 1.0)
+    
+    def _calculate_similarity(self, text1: str, text2: str) -> float:
+        """
+        Calcule la similarité entre deux textes (simple).
+        
+        Args:
+            text1: Premier texte
+            text2: Deuxième texte
+            
+        Returns:
+            Score de similarité entre 0 et 1
+        """
+        words1 = set(text1.split())
+        words2 = set(text2.split())
+        
+        if not words1 or not words2:
+            return 0.0
+        
+        intersection = words1.intersection(words2)
+        union = words1.union(words2)
+        
+        return len(intersection) / len(union) if union else 0.0
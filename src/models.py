@@ -0,0 +1,144 @@
+"""
+Models Module
+Enregistrements compacts (dataclasses à __slots__) partagés par tout le pipeline
+"""
+
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(slots=True)
+class Video:
+    """Vidéo extraite d'une playlist YouTube."""
+
+    title: str
+    id: Optional[str] = None
+    duration: Optional[float] = None
+    uploader: Optional[str] = None
+    # Artiste et titre connus par la source (chaîne "Artiste - Topic", uploader VEVO)
+    artist: Optional[str] = None
+    track: Optional[str] = None
+
+    @property
+    def url(self) -> Optional[str]:
+        """URL de la vidéo (calculée pour ne pas stocker une chaîne par vidéo)."""
+        return f"https://www.youtube.com/watch?v={self.id}" if self.id else None
+
+
+@dataclass(slots=True)
+class TrackCandidate:
+    """Piste Spotify candidate (résultat de recherche, de cache ou de catalogue local)."""
+
+    id: str
+    name: str
+    artists: Tuple[str, ...]
+    album: str
+    uri: str
+    popularity: int
+    duration_ms: int
+    preview_url: Optional[str] = None
+    relevance_score: float = 0.0
+
+    @classmethod
+    def from_api(cls, track: Dict) -> 'TrackCandidate':
+        """
+        Construit un candidat depuis un objet piste de l'API Spotify.
+
+        Args:
+            track: Objet piste renvoyé par l'API
+
+        Returns:
+            Candidat correspondant
+        """
+        return cls(
+            id=track['id'],
+            name=track['name'],
+            artists=tuple(artist['name'] for artist in track['artists']),
+            album=track['album']['name'],
+            uri=track['uri'],
+            popularity=track['popularity'],
+            duration_ms=track['duration_ms'],
+            preview_url=track.get('preview_url')
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TrackCandidate':
+        """
+        Construit un candidat depuis un dict sérialisé (les clés inconnues sont ignorées).
+
+        Args:
+            data: Dict produit par to_dict
+
+        Returns:
+            Candidat correspondant
+        """
+        known = {field.name for field in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known}
+        values['artists'] = tuple(values.get('artists', ()))
+        return cls(**values)
+
+    def to_dict(self) -> Dict:
+        """Sérialise le candidat (JSON-compatible)."""
+        data = asdict(self)
+        data['artists'] = list(self.artists)
+        return data
+
+    @property
+    def artists_text(self) -> str:
+        """Artistes séparés par des virgules."""
+        return ', '.join(self.artists)
+
+
+@dataclass(slots=True)
+class MatchResult:
+    """Ligne du rapport: une vidéo YouTube et la piste retenue (ou None)."""
+
+    youtube_title: str
+    track: Optional[TrackCandidate] = None
+    source: str = 'search'  # 'search', 'cache' ou 'catalog'
+
+
+@dataclass(slots=True)
+class WriteChunk:
+    """Lot d'URIs écrit dans une playlist à une position donnée (None: ajouté en fin)."""
+
+    position: Optional[int]
+    uris: List[str]
+    snapshot_id: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def landed(self) -> bool:
+        """True si Spotify a confirmé l'écriture (snapshot_id reçu)."""
+        return self.snapshot_id is not None
+
+
+@dataclass(slots=True)
+class PlaylistWriteResult:
+    """Suivi lot par lot de l'écriture des pistes d'une playlist."""
+
+    playlist_id: str
+    chunks: List[WriteChunk] = field(default_factory=list)
+    replace: bool = False
+
+    @property
+    def success(self) -> bool:
+        """True si tous les lots ont été écrits."""
+        return all(chunk.landed for chunk in self.chunks)
+
+    @property
+    def landed_uris(self) -> List[str]:
+        """URIs effectivement présentes dans la playlist."""
+        return [uri for chunk in self.chunks if chunk.landed for uri in chunk.uris]
+
+    @property
+    def pending_uris(self) -> List[str]:
+        """URIs non écrites (lot en échec ou non tenté)."""
+        return [uri for chunk in self.chunks if not chunk.landed for uri in chunk.uris]
+
+    @property
+    def snapshot_id(self) -> Optional[str]:
+        """Dernier snapshot_id renvoyé par Spotify."""
+        landed = [chunk.snapshot_id for chunk in self.chunks if chunk.landed]
+        return landed[-1] if landed else None
@@ -5,16 +5,31 @@ Analyse les titres pour créer des noms contextuels et des descriptions engagean
 """
 
 import re
+import json
 from typing import List, Dict, Tuple, Optional
 from collections import Counter
 import random
 
+from keyword_matcher import KeywordMatcher
+
+
+# Artiste en tête de titre: "Artiste - Titre" ou "Artiste feat. Autre"
+ARTIST_PATTERN = re.compile(r'^([^-]+?)(?:\s*[-–]|\s+feat\.|\s+ft\.)')
+BRACKETS_PATTERN = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+
 class PlaylistNamingEngine:
     """
     Moteur intelligent de nommage de playlists basé sur l'analyse des contenus.
     """
     
-    def __init__(self):
+    def __init__(self, keywords_file: Optional[str] = None):
+        """
+        Initialise le moteur de nommage.
+
+        Args:
+            keywords_file: Fichier JSON optionnel {"genres": {...}, "contexts": {...}}
+                           pour étendre la taxonomie de mots-clés
+        """
         # Base de données des genres musicaux
         self.genre_keywords = {
             'afrobeat': ['afrobeat', 'afrobeats', 'naija', 'lagos', 'nigeria', 'ghana', 'benin'],
@@ -80,6 +95,41 @@ class PlaylistNamingEngine:
             "🎯 Collection premium de {genre} - {track_count} tracks sélectionnées pour leur qualité et leur vibe unique.",
             "🌟 Votre dose quotidienne de {genre} ! {main_artist}, {second_artist} et plus dans une playlist de {track_count} titres."
         ]
+        
+        if keywords_file:
+            self.load_keywords_file(keywords_file)
+        
+        # Automate compilé une seule fois pour tous les mots-clés
+        self.keyword_matcher = self._build_keyword_matcher()
+    
+    def load_keywords_file(self, path: str) -> None:
+        """
+        Étend les mots-clés de genres et de contextes depuis un fichier JSON.
+        
+        Args:
+            path: Chemin du fichier {"genres": {genre: [...]}, "contexts": {contexte: [...]}}
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        for section, target in (('genres', self.genre_keywords), ('contexts', self.context_keywords)):
+            for label, keywords in data.get(section, {}).items():
+                existing = target.setdefault(label, [])
+                existing.extend(k for k in keywords if k not in existing)
+        
+        self.keyword_matcher = self._build_keyword_matcher()
+    
+    def _build_keyword_matcher(self) -> KeywordMatcher:
+        """Construit l'automate regroupant genres et contextes."""
+        matcher = KeywordMatcher()
+        for genre, keywords in self.genre_keywords.items():
+            for keyword in keywords:
+                matcher.add_keyword(keyword, f"genre:{genre}")
+        for context, keywords in self.context_keywords.items():
+            for keyword in keywords:
+                matcher.add_keyword(keyword, f"context:{context}")
+        matcher.compile()
+        return matcher
     
     def analyze_tracks(self, track_titles: List[str]) -> Dict:
         """
@@ -91,47 +141,14 @@ class PlaylistNamingEngine:
         Returns:
             Dict avec les analyses (artistes, genres, contexte, etc.)
         """
-        analysis = {
-            'artists': [],
-            'genres': [],
-            'contexts': [],
-            'keywords': [],
-            'track_count': len(track_titles),
-            'languages': []
-        }
-        
-        all_text = ' '.join(track_titles).lower()
-        
-        # Extraire les artistes (premiers mots avant - ou feat)
+        analyzer = self.incremental_analyzer()
         for title in track_titles:
-            # Pattern: "Artiste - Titre" ou "Artiste feat. Autre"
-            artist_match = re.match(r'^([^-]+?)(?:\s*[-–]|\s+feat\.|\s+ft\.)', title.strip())
-            if artist_match:
-                artist = artist_match.group(1).strip()
-                # Nettoyer l'artiste
-                artist = re.sub(r'\([^)]*\)|\[[^\]]*\]', '', artist).strip()
-                if artist and len(artist) > 1:
-                    analysis['artists'].append(artist)
-        
-        # Détecter les genres
-        for genre, keywords in self.genre_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in all_text)
-            if score > 0:
-                analysis['genres'].append((genre, score))
-        
-        # Détecter le contexte
-        for context, keywords in self.context_keywords.items():
-            if any(keyword in all_text for keyword in keywords):
-                analysis['contexts'].append(context)
-        
-        # Compter les artistes les plus fréquents
-        artist_counts = Counter(analysis['artists'])
-        analysis['top_artists'] = artist_counts.most_common(5)
-        
-        # Trier les genres par score
-        analysis['genres'].sort(key=lambda x: x[1], reverse=True)
-        
-        return analysis
+            analyzer.add_title(title)
+        return analyzer.analysis()
+    
+    def incremental_analyzer(self) -> 'IncrementalPlaylistAnalyzer':
+        """Crée un analyseur alimenté titre par titre (pendant la recherche)."""
+        return IncrementalPlaylistAnalyzer(self)
     
     def generate_name(self, analysis: Dict) -> str:
         """
@@ -303,16 +320,144 @@ class PlaylistNamingEngine:
         if not track_titles:
             return "Mix Playlist", "Une playlist personnalisée 🎵"
         
-        # Analyser les titres
-        analysis = self.analyze_tracks(track_titles)
+        return self.identity_from_analysis(self.analyze_tracks(track_titles))
+    
+    def identity_from_analysis(self, analysis: Dict) -> Tuple[str, str]:
+        """
+        Génère nom et description à partir d'une analyse existante.
         
-        # Générer nom et description
+        Args:
+            analysis: Résultats de l'analyse (analyze_tracks ou analyseur incrémental)
+            
+        Returns:
+            Tuple (nom, description)
+        """
         name = self.generate_name(analysis)
         description = self.generate_description(analysis, name)
-        
         return name, description
 
 
+class IncrementalPlaylistAnalyzer:
+    """
+    Analyse incrémentale: chaque titre met à jour les compteurs en O(len(titre)),
+    et l'analyse (donc le nom) est disponible à tout moment sans repasser sur les titres.
+    """
+    
+    TOP_ARTISTS = 5
+    
+    def __init__(self, engine: PlaylistNamingEngine):
+        """
+        Initialise un analyseur vide.
+        
+        Args:
+            engine: Moteur de nommage (mots-clés et templates)
+        """
+        self.engine = engine
+        self.track_count = 0
+        self.artists: List[str] = []
+        self.artist_counts: Counter = Counter()
+        self._first_seen: Dict[str, int] = {}
+        self._top_artists: List[str] = []  # Trié par (occurrences décroissantes, première apparition)
+        self._seen_keywords = set()
+        self.keyword_scores: Dict[str, int] = {}
+    
+    def add_title(self, title: str) -> None:
+        """
+        Ajoute un titre à l'analyse.
+        
+        Args:
+            title: Titre "Artiste - Titre"
+        """
+        self.track_count += 1
+        
+        # Pattern: "Artiste - Titre" ou "Artiste feat. Autre"
+        artist_match = ARTIST_PATTERN.match(title.strip())
+        if artist_match:
+            # Nettoyer l'artiste
+            artist = BRACKETS_PATTERN.sub('', artist_match.group(1).strip()).strip()
+            if artist and len(artist) > 1:
+                self.artists.append(artist)
+                self._count_artist(artist)
+        
+        # Score d'un genre/contexte = mots-clés distincts trouvés sur l'ensemble des titres
+        for start, end, label in self.engine.keyword_matcher.iter_matches(title):
+            keyword = (label, title[start:end].lower())
+            if keyword not in self._seen_keywords:
+                self._seen_keywords.add(keyword)
+                self.keyword_scores[label] = self.keyword_scores.get(label, 0) + 1
+    
+    def add_track(self, track) -> None:
+        """
+        Ajoute une piste trouvée (TrackCandidate) à l'analyse.
+        
+        Args:
+            track: Piste Spotify
+        """
+        self.add_title(f"{track.name} - {track.artists_text}")
+    
+    def _count_artist(self, artist: str) -> None:
+        """Met à jour le compteur d'un artiste et le classement des premiers (O(TOP_ARTISTS))."""
+        self.artist_counts[artist] += 1
+        self._first_seen.setdefault(artist, len(self._first_seen))
+        
+        def rank(name: str) -> Tuple[int, int]:
+            return self.artist_counts[name], -self._first_seen[name]
+        
+        top = self._top_artists
+        if artist not in top:
+            if len(top) < self.TOP_ARTISTS:
+                top.append(artist)
+            elif rank(artist) > rank(top[-1]):
+                top[-1] = artist
+            else:
+                return
+        
+        # Remonter l'artiste à sa place
+        index = top.index(artist)
+        while index > 0 and rank(top[index]) > rank(top[index - 1]):
+            top[index], top[index - 1] = top[index - 1], top[index]
+            index -= 1
+    
+    def analysis(self) -> Dict:
+        """
+        Analyse courante, au format de PlaylistNamingEngine.analyze_tracks.
+        
+        Returns:
+            Dict avec les analyses (artistes, genres, contexte, etc.)
+        """
+        genres = [
+            (genre, self.keyword_scores[f"genre:{genre}"])
+            for genre in self.engine.genre_keywords
+            if self.keyword_scores.get(f"genre:{genre}")
+        ]
+        # Trier les genres par score
+        genres.sort(key=lambda x: x[1], reverse=True)
+        
+        return {
+            'artists': self.artists,
+            'genres': genres,
+            'contexts': [
+                context for context in self.engine.context_keywords
+                if self.keyword_scores.get(f"context:{context}")
+            ],
+            'keywords': [],
+            'track_count': self.track_count,
+            'languages': [],
+            'top_artists': [(artist, self.artist_counts[artist]) for artist in self._top_artists],
+        }
+    
+    def identity(self) -> Tuple[str, str]:
+        """
+        Nom et description d'après les titres reçus jusqu'ici.
+        
+        Returns:
+            Tuple (nom, description)
+        """
+        if not self.track_count:
+            return "Mix Playlist", "Une playlist personnalisée 🎵"
+        return self.engine.identity_from_analysis(self.analysis())
+
+
 def main():
     """Test du moteur de nommage."""
     print("🧠 Test du moteur de nommage automatique")
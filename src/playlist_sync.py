@@ -0,0 +1,310 @@
+"""
+Playlist Sync Module
+Mode surveillance: garde des playlists YouTube synchronisées avec Spotify, dans un seul processus
+"""
+
+import copy
+import heapq
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from app_logging import get_logger
+from transfer_pipeline import PlaylistTransferReport, TransferPipeline
+
+logger = get_logger('playlist_sync')
+
+
+@dataclass(slots=True)
+class SyncPair:
+    """Playlist YouTube surveillée et sa playlist Spotify cible."""
+
+    youtube_url: str
+    name: Optional[str] = None
+    playlist_id: Optional[str] = None  # Playlist Spotify existante (créée au premier passage sinon)
+    interval: float = 3600.0  # Secondes entre deux vérifications
+    private: bool = False
+
+
+def load_pairs(path: str) -> List[SyncPair]:
+    """
+    Charge les playlists à surveiller depuis un fichier JSON.
+
+    Format: {"playlists": [{"youtube": URL, "name": ..., "spotify_playlist": ID, "interval": 3600, "private": false}]}
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Liste des paires à synchroniser
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    return [
+        SyncPair(
+            youtube_url=entry['youtube'],
+            name=entry.get('name'),
+            playlist_id=entry.get('spotify_playlist'),
+            interval=float(entry.get('interval', 3600)),
+            private=bool(entry.get('private', False))
+        )
+        for entry in data.get('playlists', [])
+    ]
+
+
+class SyncState:
+    """
+    État persistant de la synchronisation: vidéos déjà traitées et pistes écrites par playlist.
+
+    Plusieurs playlists se synchronisent en parallèle: les entrées ne sont modifiées que
+    sous le verrou (update), que save() tient aussi pendant l'écriture.
+    """
+
+    def __init__(self, path: str = ".sync_state.json"):
+        """
+        Charge l'état s'il existe.
+
+        Args:
+            path: Chemin du fichier d'état
+        """
+        self.path = path
+        self.playlists: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.playlists = json.load(f).get('playlists', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  État de synchronisation illisible ({path}), ignoré: {e}")
+
+    def entry(self, youtube_url: str) -> Dict:
+        """Renvoie une copie (créée si besoin) de l'entrée d'une playlist surveillée."""
+        with self._lock:
+            return copy.deepcopy(self._entry(youtube_url))
+
+    def update(self, youtube_url: str, change: Callable[[Dict], None]) -> None:
+        """
+        Modifie l'entrée d'une playlist sous le verrou.
+
+        Args:
+            youtube_url: Playlist concernée
+            change: Fonction appliquée à l'entrée (modifiée sur place)
+        """
+        with self._lock:
+            change(self._entry(youtube_url))
+
+    def _entry(self, youtube_url: str) -> Dict:
+        """Entrée d'une playlist (appelant: verrou tenu)."""
+        return self.playlists.setdefault(youtube_url, {
+            'playlist_id': None,
+            'seen': [],
+            'uris': [],
+            'last_sync': None,
+        })
+
+    def save(self) -> None:
+        """Écrit l'état sur disque (écriture atomique)."""
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'playlists': self.playlists}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class PlaylistWatcher:
+    """
+    Surveille plusieurs playlists YouTube et ajoute seulement les nouvelles correspondances.
+
+    Chaque playlist a son propre intervalle (avec gigue pour étaler les appels). Un même
+    TransferPipeline (session Spotify, cache, dictionnaires) sert à toutes les playlists,
+    et au plus `max_concurrent` synchronisations tournent en même temps.
+    """
+
+    def __init__(self, pipeline: TransferPipeline, pairs: List[SyncPair], state: Optional[SyncState] = None,
+                 max_concurrent: int = 2, jitter: float = 0.1, retry_delay: float = 60.0):
+        """
+        Initialise le surveillant.
+
+        Args:
+            pipeline: Pipeline de transfert partagé
+            pairs: Playlists à synchroniser
+            state: État persistant (par défaut: .sync_state.json)
+            max_concurrent: Nombre maximum de synchronisations simultanées
+            jitter: Variation aléatoire relative des intervalles (0.1 = ±10%)
+            retry_delay: Délai avant de réessayer après un échec (doublé à chaque échec, plafonné à l'intervalle)
+        """
+        self.pipeline = pipeline
+        self.pairs = pairs
+        self.state = state or SyncState()
+        self.max_concurrent = max(1, max_concurrent)
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+
+        self.failures: Dict[str, int] = {pair.youtube_url: 0 for pair in pairs}
+        self._stop = threading.Event()
+
+    def sync_once(self, pair: SyncPair) -> int:
+        """
+        Synchronise une playlist: seules les vidéos jamais vues sont recherchées et ajoutées.
+
+        Args:
+            pair: Playlist à synchroniser
+
+        Returns:
+            Nombre de pistes ajoutées
+
+        Raises:
+            RuntimeError: si l'extraction, l'authentification ou l'écriture échoue
+        """
+        url = pair.youtube_url
+        entry = self.state.entry(url)
+
+        # Extraction "à plat" (métadonnées seulement): détecter les nouvelles entrées coûte un appel
+        videos = self.pipeline.extract_videos(pair.youtube_url)
+        if videos is None:
+            raise RuntimeError(f"URL YouTube invalide: {pair.youtube_url}")
+
+        seen = set(entry['seen'])
+        new_videos = [video for video in videos if (video.id or video.title) not in seen]
+        synced_at = time.time()
+        self.state.update(url, lambda live: live.update(last_sync=synced_at))
+        if not new_videos:
+            return 0
+
+        logger.info(f"🆕 {len(new_videos)} nouvelles vidéos dans {pair.name or pair.youtube_url}")
+        if not self.pipeline.authenticate():
+            raise RuntimeError("Échec de l'authentification Spotify")
+
+        report = PlaylistTransferReport()
+        matches = self.pipeline.match_videos(new_videos, report)
+
+        # Pistes à ajouter (sans doublon avec celles déjà écrites)
+        written = set(entry['uris'])
+        uris: List[str] = []
+        for track in matches:
+            if track and track.uri not in written and track.uri not in uris:
+                uris.append(track.uri)
+
+        spotify_manager = self.pipeline.spotify_manager
+        playlist_id = entry['playlist_id'] or pair.playlist_id
+        if uris and not playlist_id:
+            found = [track for track in matches if track]
+            name, description = self.pipeline.playlist_identity(found, pair.name)
+            playlist_id = spotify_manager.create_playlist(name, description or "", public=not pair.private)
+            if not playlist_id:
+                raise RuntimeError("Création de la playlist impossible")
+        self.state.update(url, lambda live: live.update(playlist_id=playlist_id))
+
+        landed: set = set()
+        if uris:
+            offset = spotify_manager.playlist_track_count(playlist_id)
+            if offset is None:
+                raise RuntimeError("Lecture de la playlist impossible")
+            result = spotify_manager.write_playlist_tracks(playlist_id, uris, offset=offset)
+            landed = set(result.landed_uris)
+
+        # Vidéo traitée: piste écrite (ou déjà présente). Les échecs de recherche restent
+        # à revoir, le cache négatif espace leurs nouvelles recherches.
+        added_uris = [uri for uri in uris if uri in landed]
+        seen_videos = [
+            video.id or video.title for video, track in zip(new_videos, matches)
+            if track and (track.uri in landed or track.uri in written)
+        ]
+
+        def record(live: Dict) -> None:
+            live['uris'].extend(added_uris)
+            live['seen'].extend(seen_videos)
+
+        self.state.update(url, record)
+        self.state.save()
+
+        if len(landed) < len(uris):
+            raise RuntimeError(f"{len(uris) - len(landed)} pistes non écrites")
+        return len(landed)
+
+    def _sync_safely(self, pair: SyncPair) -> bool:
+        """Synchronise une playlist sans jamais propager d'erreur (le surveillant continue)."""
+        try:
+            added = self.sync_once(pair)
+            if added:
+                logger.info(f"✅ {added} pistes ajoutées ({pair.name or pair.youtube_url})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Synchronisation échouée ({pair.name or pair.youtube_url}): {e}")
+            return False
+
+    def next_delay(self, pair: SyncPair, success: bool) -> float:
+        """
+        Calcule le délai avant la prochaine vérification d'une playlist.
+
+        Args:
+            pair: Playlist concernée
+            success: Résultat de la dernière synchronisation
+
+        Returns:
+            Délai en secondes (avec gigue)
+        """
+        if success:
+            self.failures[pair.youtube_url] = 0
+            delay = pair.interval
+        else:
+            self.failures[pair.youtube_url] += 1
+            # Backoff exponentiel, sans dépasser l'intervalle normal
+            delay = min(self.retry_delay * 2 ** (self.failures[pair.youtube_url] - 1), pair.interval)
+
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def stop(self) -> None:
+        """Demande l'arrêt du surveillant (les synchronisations en cours se terminent)."""
+        self._stop.set()
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """
+        Boucle de surveillance.
+
+        Args:
+            duration: Durée maximale en secondes (None = jusqu'à stop() ou Ctrl+C)
+        """
+        start = time.monotonic()
+        # Premier passage étalé pour ne pas lancer toutes les playlists en même temps
+        schedule = [
+            (start + random.uniform(0, self.jitter * pair.interval), index)
+            for index, pair in enumerate(self.pairs)
+        ]
+        heapq.heapify(schedule)
+        running: Dict = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as pool:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if duration is not None and now - start >= duration:
+                    break
+
+                # Lancer les playlists arrivées à échéance, dans la limite de concurrence
+                while schedule and schedule[0][0] <= now and len(running) < self.max_concurrent:
+                    _, index = heapq.heappop(schedule)
+                    running[pool.submit(self._sync_safely, self.pairs[index])] = index
+
+                # Concurrence saturée: attendre la fin d'une synchronisation
+                timeout = schedule[0][0] - now if schedule and len(running) < self.max_concurrent else 1.0
+                if duration is not None:
+                    timeout = min(timeout, start + duration - now)
+                timeout = max(0.0, min(timeout, 1.0))
+
+                if running:
+                    done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = running.pop(future)
+                        delay = self.next_delay(self.pairs[index], future.result())
+                        heapq.heappush(schedule, (time.monotonic() + delay, index))
+                else:
+                    self._stop.wait(timeout)
+
+            self._stop.set()
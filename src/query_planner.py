@@ -0,0 +1,98 @@
+"""
+Query Planner Module
+Fusionne les requêtes de recherche équivalentes avant de les envoyer à Spotify
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Tuple, Union
+
+
+# Filtres de champ Spotify ("track:Joha artist:Asake")
+FIELD_FILTER = re.compile(r'\b(track|artist|album|year|genre):', re.IGNORECASE)
+
+Signature = Union[FrozenSet[str], Tuple]
+
+
+@dataclass(slots=True)
+class QueryPlan:
+    """Requêtes à envoyer pour une vidéo, et celles éliminées comme équivalentes."""
+
+    queries: List[str] = field(default_factory=list)
+    eliminated: Dict[str, str] = field(default_factory=dict)  # requête éliminée → requête conservée
+    skipped: List[str] = field(default_factory=list)  # non envoyées: correspondance acceptée avant
+    pruned_candidates: int = 0  # candidats rejetés sur la durée
+
+    @property
+    def saved_requests(self) -> int:
+        """Nombre de requêtes API évitées."""
+        return len(self.eliminated)
+
+    @property
+    def sent(self) -> int:
+        """Nombre de requêtes réellement envoyées."""
+        return len(self.queries) - len(self.skipped)
+
+
+def _words(text: str) -> List[str]:
+    """Mots normalisés comme le fait la recherche Spotify (casse, accents et ponctuation ignorés)."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'[^\W_]+', text)
+
+
+def query_signature(query: str) -> Signature:
+    """
+    Calcule la signature d'une requête: deux requêtes de même signature renvoient les mêmes résultats.
+
+    - Recherche libre: ensemble des mots ("Rema Calm Down" ≡ "calm down rema" ≡ "Calm Down - Rema")
+    - Requête filtrée (track:/artist:): mots de chaque champ, l'ordre des champs n'importe pas
+    - Requête exacte ("..."): suite de mots, l'ordre compte
+
+    Args:
+        query: Requête de recherche
+
+    Returns:
+        Signature hashable
+    """
+    stripped = query.strip()
+
+    if len(stripped) > 1 and stripped.startswith('"') and stripped.endswith('"'):
+        return ('exact', tuple(_words(stripped)))
+
+    parts = FIELD_FILTER.split(stripped)
+    if len(parts) > 1:
+        # parts = [texte libre, champ1, valeur1, champ2, valeur2, ...]
+        filters = [('', frozenset(_words(parts[0])))]
+        for name, value in zip(parts[1::2], parts[2::2]):
+            filters.append((name.lower(), frozenset(_words(value))))
+        return ('filtered', frozenset(filters))
+
+    return frozenset(_words(stripped))
+
+
+def plan_queries(queries: List[str]) -> QueryPlan:
+    """
+    Élimine les requêtes équivalentes (la première de chaque groupe est conservée, l'ordre est préservé).
+
+    Args:
+        queries: Requêtes produites par TitleCleaner.create_search_queries
+
+    Returns:
+        Plan de requêtes
+    """
+    plan = QueryPlan()
+    kept: Dict[Signature, str] = {}
+
+    for query in queries:
+        signature = query_signature(query)
+        if not signature:
+            plan.eliminated[query] = ''
+        elif signature in kept:
+            plan.eliminated[query] = kept[signature]
+        else:
+            kept[signature] = query
+            plan.queries.append(query)
+
+    return plan
@@ -0,0 +1,226 @@
+"""
+Run Profiler Module
+Profilage par étape du pipeline (cProfile + tracemalloc), activé par --profile-run
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+
+
+# Composant d'une fonction selon son fichier source (ordre = priorité)
+COMPONENTS = [
+    ('sleep', re.compile(r'time\.sleep')),
+    ('youtube', re.compile(r'yt_dlp|youtube_extractor')),
+    ('cleaning', re.compile(r'title_cleaner|artist_dictionary|spell_corrector|keyword_matcher|[/\\]re[/\\]|sre_')),
+    ('scoring', re.compile(r'match_scoring|query_planner')),
+    ('network', re.compile(r'socket|ssl|http[/\\]client|urllib3|requests[/\\]|selectors')),
+    ('spotify', re.compile(r'spotipy|spotify_manager')),
+    ('cache', re.compile(r'match_cache|local_catalog|json[/\\]')),
+]
+
+# Profondeur maximale des piles reconstituées pour le flamegraph
+MAX_STACK_DEPTH = 64
+MIN_PATH_TIME = 1e-6  # secondes
+
+FunctionKey = Tuple[str, int, str]
+
+
+@dataclass(slots=True)
+class StageProfile:
+    """Résultat du profilage d'une étape."""
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    hotspots: List[Tuple[str, float, int]] = field(default_factory=list)  # (fonction, temps propre, appels)
+    components: Dict[str, float] = field(default_factory=dict)  # composant → temps propre
+    memory_peak: Optional[int] = None  # octets
+    memory_top: List[Tuple[str, int]] = field(default_factory=list)  # (ligne source, octets alloués)
+    files: List[str] = field(default_factory=list)
+
+
+def stage_context(profiler: Optional['RunProfiler'], name: str) -> ContextManager:
+    """
+    Contexte de profilage d'une étape, ou nullcontext si le profilage est désactivé.
+
+    Args:
+        profiler: Profileur actif ou None
+        name: Nom de l'étape
+    """
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def _format_function(key: FunctionKey) -> str:
+    """Nom lisible d'une fonction pstats."""
+    filename, line, name = key
+    if filename == '~':
+        return name  # fonction C intégrée
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def _component(key: FunctionKey) -> str:
+    """Composant d'une fonction (youtube, cleaning, scoring, network, ...)."""
+    filename, _, name = key
+    target = filename if filename != '~' else name
+    for component, pattern in COMPONENTS:
+        if pattern.search(target):
+            return component
+    return 'other'
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Reconstitue des piles d'appels pondérées à partir du graphe d'appels de cProfile.
+
+    cProfile ne garde que les arcs appelant → appelé: le temps propre d'une fonction est
+    réparti entre ses piles au prorata du temps cumulé passé par chaque arc (estimation).
+
+    Args:
+        stats: Statistiques cProfile
+
+    Returns:
+        Dict {"f1;f2;f3": secondes}, au format attendu par flamegraph.pl / speedscope
+    """
+    raw = stats.stats  # {fonction: (cc, nc, tt, ct, {appelant: (cc, nc, tt, ct)})}
+    children: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    for callee, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((callee, edge[3]))
+
+    stacks: Dict[str, float] = {}
+
+    def walk(function: FunctionKey, path: List[str], time_on_path: float, on_stack: set) -> None:
+        _, _, tottime, cumtime, _ = raw[function]
+        # Les chemins négligeables sont coupés: le nombre de piles reste borné
+        if cumtime <= 0 or time_on_path < MIN_PATH_TIME:
+            return
+        share = min(1.0, time_on_path / cumtime)
+        frames = path + [_format_function(function)]
+        line = ';'.join(frames)
+        stacks[line] = stacks.get(line, 0.0) + tottime * share
+
+        if len(frames) >= MAX_STACK_DEPTH:
+            return
+        on_stack.add(function)
+        for child, edge_time in children.get(function, ()):
+            if child not in on_stack:  # récursion: déjà comptée plus haut
+                walk(child, frames, edge_time * share, on_stack)
+        on_stack.discard(function)
+
+    roots = [function for function, entry in raw.items() if not entry[4]]
+    for root in roots:
+        walk(root, [], raw[root][3], set())
+
+    return stacks
+
+
+class RunProfiler:
+    """
+    Profile chaque étape séparément et écrit, par étape:
+    - <NN>_<étape>.pstats (lisible avec `python -m pstats` ou snakeviz)
+    - <NN>_<étape>.collapsed (piles repliées pour flamegraph.pl / speedscope)
+    """
+
+    def __init__(self, output_dir: str, memory: bool = False, top: int = 10):
+        """
+        Initialise le profileur.
+
+        Args:
+            output_dir: Dossier de sortie
+            memory: Suivre aussi les allocations (tracemalloc, plus lent)
+            top: Nombre de points chauds gardés par étape
+        """
+        self.output_dir = output_dir
+        self.memory = memory
+        self.top = top
+        self.stages: List[StageProfile] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageProfile]:
+        """
+        Profile le bloc de code d'une étape.
+
+        Args:
+            name: Nom de l'étape (extract, match, publish, ...)
+        """
+        result = StageProfile(name)
+        profile = cProfile.Profile()
+
+        if self.memory:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        profile.enable()
+        try:
+            yield result
+        finally:
+            profile.disable()
+            result.wall_time = time.perf_counter() - wall_start
+            result.cpu_time = time.process_time() - cpu_start
+
+            if self.memory:
+                after = tracemalloc.take_snapshot()
+                result.memory_peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                result.memory_top = [
+                    (str(diff.traceback[0]), diff.size_diff)
+                    for diff in after.compare_to(before, 'lineno')[:self.top]
+                ]
+
+            self._write(profile, result)
+            self.stages.append(result)
+
+    def _write(self, profile: cProfile.Profile, result: StageProfile) -> None:
+        """Écrit les fichiers de l'étape et calcule ses points chauds."""
+        prefix = os.path.join(self.output_dir, f"{len(self.stages) + 1:02d}_{result.name}")
+        stats = pstats.Stats(profile)
+
+        pstats_path = f"{prefix}.pstats"
+        stats.dump_stats(pstats_path)
+
+        collapsed_path = f"{prefix}.collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, seconds in sorted(collapsed_stacks(stats).items()):
+                microseconds = int(seconds * 1e6)
+                if microseconds:
+                    f.write(f"{stack} {microseconds}\n")
+        result.files = [pstats_path, collapsed_path]
+
+        entries = [(key, entry[2], entry[1]) for key, entry in stats.stats.items()]
+        entries.sort(key=lambda item: item[1], reverse=True)
+        result.hotspots = [(_format_function(key), tottime, calls) for key, tottime, calls in entries[:self.top]]
+
+        for key, tottime, _ in entries:
+            component = _component(key)
+            result.components[component] = result.components.get(component, 0.0) + tottime
+
+    def summary_lines(self, hotspots: int = 5) -> List[str]:
+        """
+        Résumé texte de toutes les étapes (pour le rapport).
+
+        Args:
+            hotspots: Nombre de points chauds affichés par étape
+
+        Returns:
+            Lignes du résumé
+        """
+        lines = []
+        for stage in self.stages:
+            lines.append(f"[{stage.name}] wall {stage.wall_time:.2f}s, cpu {stage.cpu_time:.2f}s"
+                         + (f", peak {stage.memory_peak / 1024 / 1024:.1f} MiB" if stage.memory_peak else ""))
+            components = sorted(stage.components.items(), key=lambda item: item[1], reverse=True)
+            lines.append("    by component: " + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in components if seconds >= 0.005))
+            for function, tottime, calls in stage.hotspots[:hotspots]:
+                lines.append(f"    {tottime:8.3f}s {calls:8d} calls  {function}")
+            for source, size in stage.memory_top[:3]:
+                lines.append(f"    {size / 1024:8.1f} KiB allocated  {source}")
+        return lines
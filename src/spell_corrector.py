@@ -0,0 +1,271 @@
+"""
+Spell Corrector Module
+Correction orthographique rapide (type SymSpell) des mots d'artistes et de titres
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Fichier de titres connus livré avec le projet
+DEFAULT_TRACKS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'tracks.txt')
+
+
+class SpellCorrector:
+    """
+    Correcteur orthographique basé sur un index de suppressions précalculé.
+
+    Chaque mot du dictionnaire est indexé par toutes ses variantes obtenues en
+    supprimant jusqu'à `max_edit_distance` caractères. Une recherche ne génère que
+    les suppressions du mot à corriger: aucune comparaison avec tout le dictionnaire.
+
+    Le dictionnaire ne contient que des artistes et des titres: un mot valide absent
+    ("Hello", "Yellow") a souvent un voisin proche. correct_text ne garde donc une
+    correction que si elle reconstitue une expression connue (artiste ou titre).
+    """
+
+    def __init__(self, max_edit_distance: int = 2, prefix_length: int = 7, min_word_length: int = 3):
+        """
+        Initialise le correcteur.
+
+        Args:
+            max_edit_distance: Distance d'édition maximale d'une correction
+            prefix_length: Longueur du préfixe indexé (limite la taille de l'index)
+            min_word_length: Les mots plus courts ne sont jamais corrigés
+        """
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.min_word_length = min_word_length
+
+        self.words: Dict[str, int] = {}
+        self._deletes: Dict[str, List[str]] = {}
+        self.phrases: Set[Tuple[str, ...]] = set()  # artistes et titres ajoutés par add_text
+        self._phrase_runs: Set[Tuple[str, ...]] = set()  # suites d'au moins 2 mots de ces expressions
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.words
+
+    def add_word(self, word: str, count: int = 1) -> None:
+        """
+        Ajoute un mot (ou augmente sa fréquence).
+
+        Args:
+            word: Mot à ajouter
+            count: Fréquence du mot (départage les corrections)
+        """
+        word = word.lower()
+        if not word:
+            return
+
+        if word in self.words:
+            self.words[word] += count
+            return
+
+        self.words[word] = count
+        for variant in self._generate_deletes(word[:self.prefix_length]):
+            self._deletes.setdefault(variant, []).append(word)
+
+    def add_text(self, text: str) -> None:
+        """
+        Ajoute tous les mots d'un texte (nom d'artiste, titre, ...).
+
+        Args:
+            text: Texte à découper en mots
+        """
+        tokens = tokenize(text)
+        for token in tokens:
+            self.add_word(token)
+
+        if tokens:
+            self.phrases.add(tuple(tokens))
+            for start in range(len(tokens) - 1):
+                for end in range(start + 2, len(tokens) + 1):
+                    self._phrase_runs.add(tuple(tokens[start:end]))
+
+    def load_file(self, path: str) -> int:
+        """
+        Charge des titres ou des mots depuis un fichier texte (une entrée par ligne, # pour les commentaires).
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            Nombre de nouveaux mots ajoutés
+        """
+        before = len(self.words)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    self.add_text(line)
+
+        return len(self.words) - before
+
+    def lookup(self, word: str) -> Optional[str]:
+        """
+        Cherche la meilleure correction d'un mot inconnu.
+
+        Args:
+            word: Mot à corriger
+
+        Returns:
+            Mot corrigé, ou None si le mot est connu, trop court ou sans correction proche
+        """
+        word = word.lower()
+        if word in self.words or len(word) < self.min_word_length or word.isdigit():
+            return None
+
+        suggestion = self._lookup(word)
+
+        # Orthographes stylisées avec lettres répétées ("BWOII", "BOYYY")
+        if suggestion is None:
+            squeezed = re.sub(r'(.)\1+', r'\1', word)
+            if squeezed != word:
+                suggestion = squeezed if squeezed in self.words else self._lookup(squeezed, self.max_edit_distance)
+
+        return suggestion
+
+    def correct_text(self, text: str) -> Optional[str]:
+        """
+        Corrige les mots inconnus d'un texte, seulement quand la correction est sûre.
+
+        Une correction est gardée si le mot corrigé forme, avec ses voisins, une suite
+        d'au moins deux mots d'un artiste ou d'un titre connu ("Bruna Boy" -> "burna boy"),
+        ou s'il est à distance 1 d'un artiste ou titre d'un seul mot ("Wizkd" -> "wizkid").
+
+        Args:
+            text: Texte à corriger
+
+        Returns:
+            Texte corrigé, ou None si aucun mot n'a été corrigé
+        """
+        tokens = tokenize(text)
+        suggestions = [self.lookup(token) for token in tokens]
+        candidate = [suggestion or token for token, suggestion in zip(tokens, suggestions)]
+
+        corrected = list(tokens)
+        changed = False
+        for i, suggestion in enumerate(suggestions):
+            if suggestion and self._is_confident(tokens[i], candidate, i):
+                corrected[i] = suggestion
+                changed = True
+
+        return ' '.join(corrected) if changed else None
+
+    def _is_confident(self, word: str, candidate: List[str], index: int) -> bool:
+        """La correction candidate[index] de `word` reconstitue-t-elle une expression connue ?"""
+        suggestion = candidate[index]
+        if (suggestion,) in self.phrases and edit_distance(word, suggestion, 1) <= 1:
+            return True
+
+        for start in range(index + 1):
+            for end in range(max(start + 2, index + 1), len(candidate) + 1):
+                if tuple(candidate[start:end]) in self._phrase_runs:
+                    return True
+        return False
+
+    def _lookup(self, word: str, max_distance: Optional[int] = None) -> Optional[str]:
+        """Recherche la suggestion la plus proche (distance puis fréquence)."""
+        if max_distance is None:
+            # Les mots courts tolèrent moins d'erreurs
+            max_distance = self.max_edit_distance if len(word) > 4 else 1
+        best: Optional[str] = None
+        best_key = (max_distance + 1, 0)
+        checked: Set[str] = set()
+
+        for variant in self._generate_deletes(word[:self.prefix_length], max_distance):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+
+                if abs(len(candidate) - len(word)) > max_distance:
+                    continue
+
+                distance = edit_distance(word, candidate, max_distance)
+                key = (distance, -self.words[candidate])
+                if distance <= max_distance and key < best_key:
+                    best, best_key = candidate, key
+
+        return best
+
+    def _generate_deletes(self, word: str, max_distance: Optional[int] = None) -> Set[str]:
+        """Génère toutes les variantes du mot avec jusqu'à `max_distance` suppressions."""
+        if max_distance is None:
+            max_distance = self.max_edit_distance
+
+        variants = {word}
+        frontier = {word}
+        for _ in range(max_distance):
+            next_frontier = set()
+            for item in frontier:
+                for i in range(len(item)):
+                    variant = item[:i] + item[i + 1:]
+                    if variant not in variants:
+                        next_frontier.add(variant)
+            variants |= next_frontier
+            frontier = next_frontier
+
+        return variants
+
+
+def tokenize(text: str) -> List[str]:
+    """Découpe un texte en mots minuscules (lettres accentuées incluses)."""
+    return re.findall(r'[^\W_]+', text.lower())
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Distance de Damerau-Levenshtein (transpositions adjacentes) avec arrêt anticipé.
+
+    Args:
+        a: Premier mot
+        b: Deuxième mot
+        max_distance: Au-delà, la valeur renvoyée vaut max_distance + 1
+
+    Returns:
+        Distance d'édition entre les deux mots
+    """
+    if a == b:
+        return 0
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+
+        if min(current) > max_distance:
+            return max_distance + 1
+
+        previous_previous, previous = previous, current
+
+    return previous[-1]
+
+
+def build_default_corrector(artist_names: Iterable[str]) -> SpellCorrector:
+    """
+    Construit un correcteur à partir des artistes connus et de data/tracks.txt.
+
+    Args:
+        artist_names: Noms d'artistes à indexer
+
+    Returns:
+        Correcteur prêt à l'emploi
+    """
+    corrector = SpellCorrector()
+    for name in artist_names:
+        corrector.add_text(name)
+    if os.path.exists(DEFAULT_TRACKS_FILE):
+        corrector.load_file(DEFAULT_TRACKS_FILE)
+    return corrector
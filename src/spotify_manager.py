@@ -4,44 +4,190 @@ Gère l'authentification, la recherche et la création de playlists sur Spotify
 """
 
 import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+from spotipy.cache_handler import MemoryCacheHandler
+from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOAuth
 import os
-from typing import Dict, List, Optional
+import sys
+import threading
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 import time
 
+from app_logging import get_logger
+from credential_pool import CredentialPool
+from match_scoring import MatchScoringMixin
+from models import PlaylistWriteResult, TrackCandidate, WriteChunk
+from query_planner import QueryPlan
 
-class SpotifyManager:
-    def __init__(self):
-        """Initialise le gestionnaire Spotify avec les credentials."""
+logger = get_logger('spotify_manager')
+
+
+class SpotifyManager(MatchScoringMixin):
+    def __init__(self, config: Optional[Dict] = None, search_only: bool = False,
+                 interactive: Optional[bool] = None, client: Optional[Any] = None,
+                 search_pool: Optional[CredentialPool] = None, auth_manager: Optional[Any] = None):
+        """
+        Initialise le gestionnaire Spotify avec les credentials.
+        
+        Args:
+            config: Section 'spotify' de la configuration (voir config/settings.py)
+            search_only: Recherche seule via client credentials (aucune interaction, pas de playlist)
+            interactive: Autoriser l'ouverture du navigateur pour l'autorisation
+                         (par défaut: seulement si le terminal est interactif)
+            client: Client API déjà configuré (ex: relecture d'une cassette), qui gère
+                    sa propre authentification: aucun credential n'est alors nécessaire
+            search_pool: Pool d'applications pour les recherches (par défaut: SPOTIFY_SEARCH_CREDENTIALS);
+                         les écritures de playlists restent sur le credential de l'utilisateur
+            auth_manager: Gestionnaire OAuth d'un utilisateur fourni par un TokenManager, qui
+                          rafraîchit lui-même le token (pas de .spotify_cache ni de minuterie ici)
+        """
         load_dotenv()
         
+        config = config or {}
+        self.search_limit = config.get('search_limit', 5)
+        self.relevance_threshold = config.get('relevance_threshold', 0.3)
+        self.rate_limit_delay = config.get('rate_limit_delay', 0.0)
+        self.token_cache_path = config.get('token_cache_path', '.spotify_cache')
+        self.token_refresh_margin = config.get('token_refresh_margin', 300)
+        self.max_retries = config.get('max_retries', 3)
+        self.retry_delay = config.get('retry_delay', 2)
+        self.configure_duration(config)
+        
+        self.search_only = search_only
+        self.interactive = sys.stdin.isatty() if interactive is None else interactive
+        
         self.client_id = os.getenv('SPOTIFY_CLIENT_ID')
         self.client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
         self.redirect_uri = os.getenv('SPOTIFY_REDIRECT_URI', 'http://localhost:8888/callback')
         
+        # Scopes nécessaires pour créer et modifier des playlists
+        self.scope = "playlist-modify-public playlist-modify-private user-library-read"
+        
+        self.user_id = None
+        self._display_name = ""
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self._refresh_timer: Optional[threading.Timer] = None
+        self.external_refresh = auth_manager is not None
+        
+        if client is not None:
+            self.auth_manager = None
+            self.sp = client
+            self.search_pool = search_pool
+            return
+        
+        self.search_pool = search_pool or CredentialPool.from_env(self.max_retries, self.retry_delay)
+        if self.search_pool:
+            logger.info(f"🔑 Recherches réparties sur {len(self.search_pool)} applications Spotify")
+        
+        if auth_manager is not None:
+            self.auth_manager = auth_manager
+            self.sp = spotipy.Spotify(auth_manager=auth_manager)
+            return
+        
         if not self.client_id or not self.client_secret:
             raise ValueError(
                 "❌ Variables d'environnement manquantes!\n"
                 "Assurez-vous d'avoir SPOTIFY_CLIENT_ID et SPOTIFY_CLIENT_SECRET dans votre fichier .env"
             )
         
-        # Scopes nécessaires pour créer et modifier des playlists
-        self.scope = "playlist-modify-public playlist-modify-private user-library-read"
-        
         # Initialiser l'authentification
-        self.auth_manager = SpotifyOAuth(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            scope=self.scope,
-            cache_path=".spotify_cache",
-            open_browser=True,
-            show_dialog=True
-        )
+        if search_only:
+            # Client credentials: pas d'utilisateur, pas de navigateur, pas de /me
+            self.auth_manager = SpotifyClientCredentials(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                cache_handler=MemoryCacheHandler()
+            )
+        else:
+            self.auth_manager = SpotifyOAuth(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                redirect_uri=self.redirect_uri,
+                scope=self.scope,
+                cache_path=self.token_cache_path,
+                open_browser=self.interactive,
+                show_dialog=True
+            )
         
         self.sp = spotipy.Spotify(auth_manager=self.auth_manager)
-        self.user_id = None
+    
+    @property
+    def search_client(self) -> Any:
+        """Client des appels de lecture du catalogue: pool de credentials s'il existe, sinon self.sp."""
+        return self.search_pool or self.sp
+    
+    def credential_stats(self) -> Dict[str, Dict[str, int]]:
+        """Utilisation de chaque credential du pool de recherche (vide sans pool)."""
+        return self.search_pool.stats() if self.search_pool else {}
+    
+    def has_cached_token(self) -> bool:
+        """Indique si un token utilisateur est disponible sans interaction."""
+        if self.search_only or self.auth_manager is None:
+            return True
+        token_info = self.auth_manager.cache_handler.get_cached_token()
+        return bool(token_info and token_info.get('refresh_token'))
+    
+    def start_warm_up(self) -> None:
+        """
+        Valide le token en cache et récupère l'utilisateur en arrière-plan.
+        
+        À appeler au démarrage: l'extraction YouTube se déroule pendant ce temps,
+        et authenticate() ne fait qu'attendre la fin du préchauffage.
+        """
+        if self.search_only or self._warm_up_thread or not self.has_cached_token():
+            return
+        
+        self._warm_up_thread = threading.Thread(target=self._warm_up, name="spotify-warm-up", daemon=True)
+        self._warm_up_thread.start()
+    
+    def _warm_up(self) -> None:
+        """Rafraîchit le token si nécessaire puis charge l'utilisateur (thread de préchauffage)."""
+        try:
+            self._refresh_token()
+            user_info = self.sp.current_user()
+            if user_info:
+                self.user_id = user_info['id']
+                self._display_name = user_info['display_name']
+        except Exception:
+            # authenticate() refera la tentative et affichera l'erreur
+            pass
+    
+    def _refresh_token(self) -> None:
+        """Rafraîchit le token s'il expire bientôt, puis programme le prochain rafraîchissement."""
+        if self.auth_manager is None or self.external_refresh:
+            return
+        token_info = self.auth_manager.cache_handler.get_cached_token()
+        if not token_info or not token_info.get('refresh_token'):
+            return
+        
+        remaining = token_info.get('expires_at', 0) - time.time()
+        if remaining < self.token_refresh_margin:
+            token_info = self.auth_manager.refresh_access_token(token_info['refresh_token'])
+            remaining = token_info.get('expires_at', 0) - time.time()
+        
+        self._schedule_token_refresh(max(remaining - self.token_refresh_margin, 1))
+    
+    def _schedule_token_refresh(self, delay: float) -> None:
+        """Programme un rafraîchissement proactif du token (thread démon)."""
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+        self._refresh_timer = threading.Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+    
+    def _background_refresh(self) -> None:
+        """Rafraîchissement périodique: les requêtes ne voient jamais un token expiré."""
+        try:
+            self._refresh_token()
+        except Exception as e:
+            logger.warning(f"⚠️  Rafraîchissement du token Spotify échoué: {e}")
+            self._schedule_token_refresh(60)
+    
+    def close(self) -> None:
+        """Arrête le rafraîchissement du token en arrière-plan."""
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
         
     def authenticate(self) -> bool:
         """
@@ -50,21 +196,39 @@ class SpotifyManager:
         Returns:
             True si l'authentification réussit, False sinon
         """
+        if self.search_only:
+            logger.info("✅ Mode recherche seule (client credentials)")
+            return True
+        
+        if self._warm_up_thread:
+            self._warm_up_thread.join()
+            self._warm_up_thread = None
+            if self.user_id:
+                logger.info(f"✅ Authentifié en tant que: {self._display_name} ({self.user_id})")
+                return True
+        
+        if not self.interactive and not self.has_cached_token():
+            logger.error("❌ Aucun token Spotify en cache et session non interactive.\n"
+                         "   Lancez une première fois yt2spotify.py dans un terminal pour autoriser l'application.")
+            return False
+        
         try:
             # Obtenir les infos de l'utilisateur
             user_info = self.sp.current_user()
             if user_info:
                 self.user_id = user_info['id']
-                print(f"✅ Authentifié en tant que: {user_info['display_name']} ({self.user_id})")
+                self._display_name = user_info['display_name']
+                logger.info(f"✅ Authentifié en tant que: {user_info['display_name']} ({self.user_id})")
+                self._refresh_token()
                 return True
             else:
-                print("❌ Impossible d'obtenir les informations utilisateur")
+                logger.error("❌ Impossible d'obtenir les informations utilisateur")
                 return False
         except Exception as e:
-            print(f"❌ Erreur d'authentification Spotify: {e}")
+            logger.error(f"❌ Erreur d'authentification Spotify: {e}")
             return False
     
-    def search_track(self, query: str, limit: int = 10) -> List[Dict]:
+    def search_track(self, query: str, limit: int = 10) -> List[TrackCandidate]:
         """
         Recherche des pistes sur Spotify.
         
@@ -76,117 +240,106 @@ class SpotifyManager:
             Liste des pistes trouvées
         """
         try:
-            results = self.sp.search(q=query, type='track', limit=limit)
+            results = self.search_client.search(q=query, type='track', limit=limit)
             tracks = []
             
             if results and 'tracks' in results and results['tracks']:
                 for track in results['tracks']['items']:
-                    track_info = {
-                        'id': track['id'],
-                        'name': track['name'],
-                        'artists': [artist['name'] for artist in track['artists']],
-                        'album': track['album']['name'],
-                        'uri': track['uri'],
-                        'popularity': track['popularity'],
-                        'duration_ms': track['duration_ms'],
-                        'preview_url': track['preview_url']
-                    }
-                    tracks.append(track_info)
+                    tracks.append(self._track_to_info(track))
             
             return tracks
         except Exception as e:
-            print(f"❌ Erreur lors de la recherche: {e}")
+            logger.error(f"❌ Erreur lors de la recherche: {e}")
             return []
     
-    def find_best_match(self, search_queries: List[str], original_title: str) -> Optional[Dict]:
+    def refresh_tracks(self, track_ids: List[str], market: Optional[str] = None) -> Dict[str, Optional[TrackCandidate]]:
         """
-        Trouve la meilleure correspondance pour une liste de requêtes.
+        Rafraîchit les métadonnées de pistes connues par lots de 50 (endpoint multi-pistes).
         
         Args:
-            search_queries: Liste des requêtes de recherche
-            original_title: Titre original pour comparaison
+            track_ids: IDs Spotify à rafraîchir
+            market: Marché (ex: 'FR') pour vérifier que les pistes sont jouables
             
         Returns:
-            Meilleure piste trouvée ou None
+            Dict {track_id: piste à jour, ou None si supprimée/non jouable}.
+            Les IDs d'un lot en erreur sont absents du résultat.
         """
-        all_results = []
+        refreshed: Dict[str, Optional[TrackCandidate]] = {}
         
-        for query in search_queries:
-            tracks = self.search_track(query, limit=5)
-            for track in tracks:
-                # Calculer un score de pertinence
-                score = self._calculate_relevance_score(track, original_title, query)
-                track['relevance_score'] = score
-                all_results.append(track)
+        # Spotify limite à 50 pistes par requête
+        batch_size = 50
         
-        if not all_results:
-            return None
-        
-        # Trier par score de pertinence (descendant)
-        all_results.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        # Retourner le meilleur résultat si le score est suffisant
-        best_match = all_results[0]
-        if best_match['relevance_score'] > 0.3:  # Seuil de confiance
-            return best_match
+        for i in range(0, len(track_ids), batch_size):
+            batch = track_ids[i:i + batch_size]
+            
+            try:
+                results = self.search_client.tracks(batch, market=market)
+            except Exception as e:
+                logger.error(f"❌ Erreur lors du rafraîchissement des pistes: {e}")
+                continue
+            
+            for track_id, track in zip(batch, (results or {}).get('tracks') or []):
+                if track is None or (market and not track.get('is_playable', True)):
+                    refreshed[track_id] = None
+                else:
+                    refreshed[track_id] = self._track_to_info(track)
+            
+            if i + batch_size < len(track_ids) and self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay)
         
-        return None
+        return refreshed
     
-    def _calculate_relevance_score(self, track: Dict, original_title: str, query: str) -> float:
+    def find_best_match(self, search_queries: List[str], original_title: str,
+                        duration: Optional[float] = None,
+                        plans: Optional[List[QueryPlan]] = None) -> Optional[TrackCandidate]:
         """
-        Calcule un score de pertinence pour une piste.
+        Trouve la meilleure correspondance pour une liste de requêtes.
         
         Args:
-            track: Informations de la piste Spotify
-            original_title: Titre original YouTube
-            query: Requête de recherche utilisée
+            search_queries: Liste des requêtes de recherche
+            original_title: Titre original pour comparaison
+            duration: Durée de la vidéo en secondes (pénalise les versions de durée incompatible)
+            plans: Liste à compléter avec le plan de la recherche (requêtes envoyées / éliminées)
             
         Returns:
-            Score de pertinence entre 0 et 1
+            Meilleure piste trouvée ou None
         """
-        score = 0.0
-        
-        # Score basé sur la popularité (20% du score)
-        score += (track['popularity'] / 100) * 0.2
-        
-        # Score basé sur la correspondance du titre (40% du score)
-        title_similarity = self._calculate_similarity(
-            track['name'].lower(), 
-            original_title.lower()
-        )
-        score += title_similarity * 0.4
-        
-        # Score basé sur la correspondance des artistes (40% du score)
-        artists_text = ' '.join(track['artists']).lower()
-        artist_similarity = self._calculate_similarity(
-            artists_text, 
-            original_title.lower()
-        )
-        score += artist_similarity * 0.4
-        
-        return min(score, 1.0)
+        best = self.find_top_matches(search_queries, original_title, 1, duration, plans)
+        return best[0] if best else None
     
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
+    def find_top_matches(self, search_queries: List[str], original_title: str, k: int = 3,
+                         duration: Optional[float] = None,
+                         plans: Optional[List[QueryPlan]] = None) -> List[TrackCandidate]:
         """
-        Calcule la similarité entre deux textes (simple).
+        Trouve les k meilleures correspondances (requêtes équivalentes envoyées une seule fois).
         
         Args:
-            text1: Premier texte
-            text2: Deuxième texte
+            search_queries: Liste des requêtes de recherche
+            original_title: Titre original pour comparaison
+            k: Nombre de pistes à renvoyer
+            duration: Durée de la vidéo en secondes (pénalise les versions de durée incompatible)
+            plans: Liste à compléter avec le plan de la recherche (requêtes envoyées / éliminées)
             
         Returns:
-            Score de similarité entre 0 et 1
+            Pistes au-dessus du seuil, de la meilleure à la moins bonne
         """
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        # Candidats dédupliqués par ID de piste
+        candidates: Dict[str, TrackCandidate] = {}
+        plan = self._plan_queries(search_queries, plans)
+        queries = plan.queries
+        
+        for i, query in enumerate(queries):
+            # Pause entre les requêtes pour ménager les rate limits
+            if i and self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay)
+            
+            tracks = self.search_track(query, limit=self.search_limit)
+            if self._score_results(plan, tracks, original_title, query, candidates, duration) and k == 1:
+                # Titre et durée concordent: les requêtes suivantes ne changeraient rien
+                plan.skipped = queries[i + 1:]
+                break
         
-        return len(intersection) / len(union) if union else 0.0
+        return self._select_top_matches(candidates.values(), k)
     
     def create_playlist(self, name: str, description: str = "", public: bool = True) -> Optional[str]:
         """
@@ -200,6 +353,10 @@ class SpotifyManager:
         Returns:
             ID de la playlist créée ou None
         """
+        if self.search_only:
+            logger.error("❌ Mode recherche seule: authentification utilisateur requise pour les playlists")
+            return None
+        
         try:
             if not self.user_id:
                 if not self.authenticate():
@@ -213,13 +370,13 @@ class SpotifyManager:
             )
             
             if playlist:
-                print(f"✅ Playlist créée: {name}")
+                logger.info(f"✅ Playlist créée: {name}")
                 return playlist['id']
             else:
-                print(f"❌ Erreur lors de la création de la playlist")
+                logger.error("❌ Erreur lors de la création de la playlist")
                 return None
         except Exception as e:
-            print(f"❌ Erreur lors de la création de la playlist: {e}")
+            logger.error(f"❌ Erreur lors de la création de la playlist: {e}")
             return None
     
     def add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str]) -> bool:
@@ -233,23 +390,111 @@ class SpotifyManager:
         Returns:
             True si succès, False sinon
         """
-        try:
-            # Spotify limite à 100 pistes par requête
-            batch_size = 100
+        return self.write_playlist_tracks(playlist_id, track_uris).success
+    
+    def write_playlist_tracks(self, playlist_id: str, track_uris: List[str],
+                              replace: bool = False, offset: Optional[int] = None) -> PlaylistWriteResult:
+        """
+        Écrit les pistes d'une playlist par lots de 100, en suivant la position
+        et le snapshot_id de chaque lot.
+        
+        Sans `offset` ni `replace`, les lots sont ajoutés en fin de playlist (sans position):
+        les pistes déjà présentes restent en tête.
+        
+        Args:
+            playlist_id: ID de la playlist
+            track_uris: Liste des URIs des pistes
+            replace: Remplacer le contenu existant par le premier lot (relance idempotente)
+            offset: Position explicite du premier lot (nombre de pistes déjà présentes)
+            
+        Returns:
+            Résultat détaillé: lots écrits, snapshot_id, URIs en attente
+        """
+        # Spotify limite à 100 pistes par requête
+        batch_size = 100
+        
+        if replace and offset is None:
+            # Après le remplacement, la playlist ne contient que le premier lot
+            offset = 0
+        
+        result = PlaylistWriteResult(playlist_id, replace=replace)
+        for i in range(0, len(track_uris), batch_size):
+            position = offset + i if offset is not None else None
+            result.chunks.append(WriteChunk(position=position, uris=track_uris[i:i + batch_size]))
+        if replace and not result.chunks:
+            # Remplacer par une liste vide: vider la playlist
+            result.chunks.append(WriteChunk(position=0, uris=[]))
+        
+        return self.resume_playlist_write(result)
+    
+    def resume_playlist_write(self, result: PlaylistWriteResult) -> PlaylistWriteResult:
+        """
+        Écrit (ou réessaie) les lots non confirmés d'une écriture, à leur position d'origine.
+        
+        Les lots sont écrits dans l'ordre: si un lot échoue après toutes ses tentatives,
+        l'écriture s'arrête pour ne pas décaler les lots suivants. Un nouvel appel
+        reprend exactement à ce lot.
+        
+        Args:
+            result: Résultat d'un précédent write_playlist_tracks
             
-            for i in range(0, len(track_uris), batch_size):
-                batch = track_uris[i:i + batch_size]
-                self.sp.playlist_add_items(playlist_id, batch)
-                
-                # Petite pause pour éviter les rate limits
-                if len(track_uris) > batch_size:
-                    time.sleep(0.1)
+        Returns:
+            Le même résultat, mis à jour
+        """
+        for index, chunk in enumerate(result.chunks):
+            if chunk.landed:
+                continue
             
-            print(f"✅ {len(track_uris)} pistes ajoutées à la playlist")
-            return True
+            for attempt in range(self.max_retries + 1):
+                chunk.attempts += 1
+                try:
+                    if result.replace and index == 0:
+                        response = self.sp.playlist_replace_items(result.playlist_id, chunk.uris)
+                    else:
+                        response = self.sp.playlist_add_items(result.playlist_id, chunk.uris, position=chunk.position)
+                    chunk.snapshot_id = (response or {}).get('snapshot_id', '')
+                    chunk.error = None
+                    break
+                except Exception as e:
+                    chunk.error = str(e)
+                    if attempt < self.max_retries:
+                        # Backoff exponentiel avant de réessayer ce lot seulement
+                        time.sleep(self.retry_delay * (2 ** attempt))
+            
+            if not chunk.landed:
+                where = f"position {chunk.position}" if chunk.position is not None else "en fin de playlist"
+                logger.error(f"❌ Lot {index + 1}/{len(result.chunks)} ({where}) en échec: {chunk.error}")
+                break
+            
+            # Petite pause pour éviter les rate limits
+            if index + 1 < len(result.chunks) and self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay)
+        
+        landed = len(result.landed_uris)
+        total = landed + len(result.pending_uris)
+        if result.success:
+            logger.info(f"✅ {landed} pistes ajoutées à la playlist")
+        else:
+            logger.warning(f"⚠️  {landed}/{total} pistes ajoutées, {total - landed} en attente")
+        
+        return result
+    
+    def playlist_track_count(self, playlist_id: str) -> Optional[int]:
+        """
+        Renvoie le nombre de pistes d'une playlist (pour ajouter de nouveaux lots en fin).
+        
+        Args:
+            playlist_id: ID de la playlist
+            
+        Returns:
+            Nombre de pistes, ou None en cas d'erreur
+        """
+        try:
+            items = self.sp.playlist_items(playlist_id, fields='total', limit=1)
+            return items['total'] if items else None
         except Exception as e:
-            print(f"❌ Erreur lors de l'ajout des pistes: {e}")
-            return False
+            logger.error(f"❌ Erreur lors de la lecture de la playlist: {e}")
+            return None
     
     def get_playlist_url(self, playlist_id: str) -> str:
         """
@@ -273,6 +518,10 @@ class SpotifyManager:
         Returns:
             ID de la playlist si elle existe, None sinon
         """
+        if self.search_only:
+            logger.error("❌ Mode recherche seule: authentification utilisateur requise pour les playlists")
+            return None
+        
         try:
             if not self.user_id:
                 if not self.authenticate():
@@ -287,7 +536,7 @@ class SpotifyManager:
             
             return None
         except Exception as e:
-            print(f"❌ Erreur lors de la vérification des playlists: {e}")
+            logger.error(f"❌ Erreur lors de la vérification des playlists: {e}")
             return None
 
 
@@ -311,8 +560,7 @@ def main():
             tracks = spotify.search_track(query, limit=3)
             
             for i, track in enumerate(tracks, 1):
-                artists = ', '.join(track['artists'])
-                print(f"  {i}. {track['name']} - {artists}")
+                print(f"  {i}. {track.name} - {track.artists_text}")
         
         print("\n✅ Test terminé avec succès!")
         
@@ -4,12 +4,62 @@ Nettoie et normalise les titres des vidéos YouTube pour une meilleure correspon
 """
 
 import re
-from typing import Tuple, Optional, List
+from dataclasses import dataclass
+from typing import Dict, Tuple, Optional, List, Pattern
+
+from artist_dictionary import ArtistDictionary
+from spell_corrector import SpellCorrector, build_default_corrector
+
+
+WHITESPACE = re.compile(r'\s+')
+
+# Début de pattern → caractère littéral sans lequel la règle ne peut pas s'appliquer
+RULE_TRIGGERS = (('\\(', '('), ('\\[', '['), ('#', '#'), ('@', '@'))
+
+
+@dataclass(slots=True)
+class CleaningRule:
+    """Pattern de nettoyage compilé une seule fois."""
+
+    pattern: str
+    regex: Pattern
+    trigger: Optional[str] = None  # règle sautée (sans appel regex) si ce caractère est absent du titre
+
+    def applies_to(self, text: str) -> bool:
+        """Indique si la règle peut modifier le texte (test du caractère déclencheur)."""
+        return self.trigger is None or self.trigger in text
+
+
+def compile_rule(pattern: str) -> CleaningRule:
+    """
+    Compile un pattern de nettoyage (insensible à la casse).
+
+    Args:
+        pattern: Expression régulière à supprimer des titres
+
+    Returns:
+        Règle compilée, avec son caractère déclencheur s'il existe
+    """
+    trigger = next((char for prefix, char in RULE_TRIGGERS if pattern.startswith(prefix)), None)
+    return CleaningRule(pattern, re.compile(pattern, re.IGNORECASE), trigger)
 
 
 class TitleCleaner:
-    def __init__(self):
-        """Initialise le nettoyeur de titres avec les patterns de nettoyage."""
+    def __init__(self, artist_dictionary: Optional[ArtistDictionary] = None,
+                 spell_corrector: Optional[SpellCorrector] = None,
+                 config: Optional[Dict] = None):
+        """
+        Initialise le nettoyeur de titres avec les patterns de nettoyage.
+        
+        Args:
+            artist_dictionary: Dictionnaire d'artistes connus (par défaut: data/artists.txt)
+            spell_corrector: Correcteur orthographique (par défaut: artistes + data/tracks.txt)
+            config: Dict fusionnant les sections 'cleaning' et 'spotify' de la configuration
+        """
+        config = config or {}
+        self.max_search_queries = config.get('max_search_queries', 5)
+        self.min_artist_length = config.get('min_artist_length', 2)
+        self.min_title_length = config.get('min_title_length', 2)
         
         # Patterns à supprimer des titres
         self.remove_patterns = [
@@ -68,8 +118,19 @@ class TitleCleaner:
             r'[\U0001F1E0-\U0001F1FF]',  # Drapeaux
         ]
         
+        if not config.get('remove_hashtags', True):
+            self.remove_patterns = [p for p in self.remove_patterns if not p.startswith('#')]
+        if not config.get('remove_mentions', True):
+            self.remove_patterns = [p for p in self.remove_patterns if not p.startswith('@')]
+        
         # Séparateurs communs entre artiste et titre
         self.separators = ['-', '–', '—', '|', '•', ':', '/', '\\']
+        
+        # Dictionnaire local d'artistes pour les titres sans séparateur clair
+        self.artist_dictionary = artist_dictionary if artist_dictionary is not None else ArtistDictionary.load_default()
+        
+        # Correcteur orthographique pour les artistes/titres mal orthographiés
+        self.spell_corrector = spell_corrector if spell_corrector is not None else build_default_corrector(self.artist_dictionary)
     
     def clean_title(self, title: str) -> str:
         """
@@ -86,18 +147,28 @@ class TitleCleaner:
         
         cleaned = title
         
-        # Supprimer les patterns indésirables
-        for pattern in self.remove_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        # Supprimer les patterns indésirables (regex précompilées, sautées sans leur caractère déclencheur)
+        for rule in self.rules:
+            if rule.trigger is None or rule.trigger in cleaned:
+                cleaned = rule.regex.sub('', cleaned)
         
         # Normaliser les espaces
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = WHITESPACE.sub(' ', cleaned)
         
         # Supprimer les caractères de début/fin
         cleaned = cleaned.strip(' -–—|•:/')
         
         return cleaned
     
+    @property
+    def remove_patterns(self) -> List[str]:
+        """Patterns de nettoyage, dans leur ordre d'application (réaffecter la liste pour la modifier)."""
+        return [rule.pattern for rule in self.rules]
+    
+    @remove_patterns.setter
+    def remove_patterns(self, patterns: List[str]) -> None:
+        self.rules = [compile_rule(pattern) for pattern in patterns]
+    
     def extract_artist_title(self, title: str) -> Tuple[Optional[str], Optional[str]]:
         """
         Tente d'extraire l'artiste et le titre depuis un titre de vidéo.
@@ -110,6 +181,11 @@ class TitleCleaner:
         """
         cleaned_title = self.clean_title(title)
         
+        # Artistes connus en début de titre (ex: "Asake & Tiakola BADMAN GANGSTA")
+        known_split = self.artist_dictionary.split_title(cleaned_title)
+        if known_split:
+            return known_split
+        
         # Chercher un séparateur
         for sep in self.separators:
             if sep in cleaned_title:
@@ -119,7 +195,7 @@ class TitleCleaner:
                     song_title = parts[1].strip()
                     
                     # Vérifier que les deux parties ont du sens
-                    if len(artist) > 1 and len(song_title) > 1:
+                    if len(artist) >= self.min_artist_length and len(song_title) >= self.min_title_length:
                         return artist, song_title
         
         # Si aucun séparateur trouvé, retourner le titre nettoyé
@@ -158,6 +234,22 @@ class TitleCleaner:
         
         return normalized
     
+    def create_structured_queries(self, artist: str, track: str) -> List[str]:
+        """
+        Requête unique pour une source structurée (artiste et titre déjà séparés).
+        
+        Args:
+            artist: Artiste fourni par la source
+            track: Titre de la piste
+            
+        Returns:
+            Liste d'une requête filtrée track:/artist:
+        """
+        song_title = self.clean_title(track) or track.strip()
+        # Artiste principal seulement ("Rema & Selena Gomez" → "Rema")
+        main_artist = re.split(r'\s*(?:,|&|\bfeat\b\.?|\bft\b\.?|\bx\b)\s*', artist.strip(), flags=re.IGNORECASE)[0]
+        return [f"track:{song_title} artist:{main_artist or artist.strip()}"]
+    
     def create_search_queries(self, title: str) -> List[str]:
         """
         Crée plusieurs variantes de requêtes de recherche pour maximiser les chances de trouvaille.
@@ -169,6 +261,17 @@ class TitleCleaner:
             Liste de requêtes de recherche
         """
         queries = []
+        cleaned = self.clean_title(title)
+        
+        # Artistes reconnus par le dictionnaire: une requête précise suffit
+        known_split = self.artist_dictionary.split_title(cleaned)
+        if known_split:
+            artist, song_title = known_split
+            main_artist = self.artist_dictionary.find_artists(artist)[0][2]
+            return [
+                f"track:{song_title} artist:{main_artist}",
+                f"{artist} {song_title}",
+            ][:self.max_search_queries]
         
         # Extraire artiste et titre
         artist, song_title = self.extract_artist_title(title)
@@ -199,7 +302,6 @@ class TitleCleaner:
                 queries.append(f"{song_title} {clean_artist}")
         
         # Toujours inclure le titre nettoyé simple
-        cleaned = self.clean_title(title)
         if cleaned not in [q for q in queries]:
             queries.append(cleaned)
         
@@ -208,7 +310,37 @@ class TitleCleaner:
         if normalized not in [self.normalize_for_search(q) for q in queries]:
             queries.append(normalized)
         
-        return queries[:5]  # Limiter à 5 variantes max
+        queries = queries[:self.max_search_queries]  # Limiter le nombre de variantes
+        
+        # Requête corrigée en dernier recours (dernière place garantie), seulement si une
+        # correction sûre reconstitue un artiste ou un titre connu
+        corrected_query = self.correct_query(f"{artist} {song_title}" if artist else cleaned)
+        if corrected_query and corrected_query not in queries and self.max_search_queries > 1:
+            queries = queries[:self.max_search_queries - 1] + [corrected_query]
+        
+        return queries
+    
+    def correct_query(self, text: str) -> Optional[str]:
+        """
+        Corrige les mots inconnus d'une requête (ex: "Bruna Boy Lsat Last" -> "burna boy last last").
+        
+        Args:
+            text: Texte de la requête
+            
+        Returns:
+            Requête corrigée (filtrée track:/artist: si l'artiste corrigé est connu) ou None
+        """
+        corrected = self.spell_corrector.correct_text(text)
+        if not corrected:
+            return None
+        
+        known_split = self.artist_dictionary.split_title(corrected)
+        if known_split:
+            artist, song_title = known_split
+            main_artist = self.artist_dictionary.find_artists(artist)[0][2]
+            return f"track:{song_title} artist:{main_artist}"
+        
+        return corrected
 
 
 def main():
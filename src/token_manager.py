@@ -0,0 +1,378 @@
+"""
+Token Manager Module
+Tokens Spotify de plusieurs utilisateurs (SQLite partagé entre processus), rafraîchis avant expiration
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+from spotipy.cache_handler import CacheHandler
+from spotipy.oauth2 import SpotifyOAuth
+
+from app_logging import get_logger
+
+logger = get_logger('token_manager')
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    user_key TEXT PRIMARY KEY,
+    token_info TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    refresh_owner TEXT,
+    refresh_until REAL
+);
+CREATE INDEX IF NOT EXISTS tokens_expiry ON tokens (expires_at);
+"""
+
+# Scopes nécessaires pour créer et modifier des playlists (comme SpotifyManager)
+DEFAULT_SCOPE = "playlist-modify-public playlist-modify-private user-library-read"
+
+# spotipy considère un token expiré 60 s avant expires_at
+TOKEN_EXPIRY_SLACK = 60
+
+
+class TokenStore:
+    """
+    Tokens OAuth par utilisateur dans un fichier SQLite (mode WAL).
+
+    Plusieurs processus peuvent partager le fichier: un rafraîchissement est réservé
+    par un bail court, pour qu'un même refresh_token ne soit pas utilisé deux fois.
+    """
+
+    def __init__(self, path: str = "tokens.db"):
+        """
+        Ouvre (ou crée) le magasin de tokens.
+
+        Args:
+            path: Fichier SQLite
+        """
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Ferme la connexion."""
+        self._db.close()
+
+    def get(self, user_key: str) -> Optional[Dict]:
+        """Renvoie le token d'un utilisateur, ou None."""
+        with self._lock:
+            row = self._db.execute("SELECT token_info FROM tokens WHERE user_key = ?", (user_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, user_key: str, token_info: Dict) -> None:
+        """
+        Enregistre (ou remplace) le token d'un utilisateur et libère sa réservation de rafraîchissement.
+
+        Args:
+            user_key: Identifiant de l'utilisateur
+            token_info: Token au format spotipy (access_token, refresh_token, expires_at, ...)
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO tokens (user_key, token_info, expires_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(user_key) DO UPDATE SET token_info = excluded.token_info, "
+                "expires_at = excluded.expires_at, updated_at = excluded.updated_at, "
+                "refresh_owner = NULL, refresh_until = NULL",
+                (user_key, json.dumps(token_info), token_info.get('expires_at', 0), now)
+            )
+
+    def delete(self, user_key: str) -> None:
+        """Supprime le token d'un utilisateur (révocation, désinscription)."""
+        with self._lock:
+            self._db.execute("DELETE FROM tokens WHERE user_key = ?", (user_key,))
+
+    def users(self) -> List[str]:
+        """Utilisateurs connus."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT user_key FROM tokens ORDER BY user_key")]
+
+    def due(self, before: float) -> List[str]:
+        """
+        Utilisateurs dont le token expire avant `before` et qui ne sont pas en cours de rafraîchissement.
+
+        Args:
+            before: Horodatage limite
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT user_key FROM tokens WHERE expires_at < ? "
+                "AND (refresh_until IS NULL OR refresh_until < ?) ORDER BY expires_at",
+                (before, now)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim_refresh(self, user_key: str, owner: str, lease: float = 60.0) -> bool:
+        """
+        Réserve le rafraîchissement d'un token (un seul processus à la fois).
+
+        Args:
+            user_key: Identifiant de l'utilisateur
+            owner: Identifiant du processus/thread
+            lease: Durée de la réservation en secondes
+
+        Returns:
+            True si la réservation est obtenue
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE tokens SET refresh_owner = ?, refresh_until = ? "
+                "WHERE user_key = ? AND (refresh_until IS NULL OR refresh_until < ? OR refresh_owner = ?)",
+                (owner, now + lease, user_key, now, owner)
+            )
+        return cursor.rowcount == 1
+
+    def release_refresh(self, user_key: str, owner: str) -> None:
+        """Libère une réservation sans modifier le token (rafraîchissement échoué)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE tokens SET refresh_owner = NULL, refresh_until = NULL WHERE user_key = ? AND refresh_owner = ?",
+                (user_key, owner)
+            )
+
+
+class StoreCacheHandler(CacheHandler):
+    """Cache spotipy adossé au TokenStore: un objet par utilisateur."""
+
+    def __init__(self, store: TokenStore, user_key: str):
+        self.store = store
+        self.user_key = user_key
+
+    def get_cached_token(self) -> Optional[Dict]:
+        return self.store.get(self.user_key)
+
+    def save_token_to_cache(self, token_info: Dict) -> None:
+        self.store.save(self.user_key, token_info)
+
+
+class TokenManager:
+    """
+    Garde les tokens de tous les utilisateurs valides: un thread unique rafraîchit en
+    arrière-plan ceux qui expirent bientôt, les transferts ne voient que des tokens frais.
+
+    Usage:
+        tokens = TokenManager(TokenStore("tokens.db"))
+        tokens.start()
+        manager = tokens.manager_for("alice", config['spotify'])
+    """
+
+    def __init__(self, store: TokenStore, refresh_margin: float = 300.0, interval: float = 30.0,
+                 client_id: Optional[str] = None, client_secret: Optional[str] = None,
+                 redirect_uri: Optional[str] = None, scope: str = DEFAULT_SCOPE,
+                 auth_factory: Optional[Callable[[str], Any]] = None, claim_wait: float = 10.0):
+        """
+        Initialise le gestionnaire.
+
+        Args:
+            store: Magasin de tokens
+            refresh_margin: Rafraîchir les tokens qui expirent dans moins de N secondes
+            interval: Période de vérification du thread de rafraîchissement
+            client_id: Application Spotify (par défaut: SPOTIFY_CLIENT_ID)
+            client_secret: Secret de l'application (par défaut: SPOTIFY_CLIENT_SECRET)
+            redirect_uri: URI de redirection OAuth (par défaut: SPOTIFY_REDIRECT_URI)
+            scope: Scopes demandés
+            auth_factory: Fabrique user_key → gestionnaire OAuth (par défaut: SpotifyOAuth sur le store)
+            claim_wait: manager_for attend au plus N secondes le token rafraîchi par un autre processus
+        """
+        load_dotenv()
+
+        self.store = store
+        self.refresh_margin = refresh_margin
+        self.interval = interval
+        self.client_id = client_id or os.getenv('SPOTIFY_CLIENT_ID')
+        self.client_secret = client_secret or os.getenv('SPOTIFY_CLIENT_SECRET')
+        self.redirect_uri = redirect_uri or os.getenv('SPOTIFY_REDIRECT_URI', 'http://localhost:8888/callback')
+        self.scope = scope
+        self.auth_factory = auth_factory or self._oauth
+        self.claim_wait = claim_wait
+
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.refreshed = 0
+        self.failures: Dict[str, str] = {}  # utilisateur → dernière erreur de rafraîchissement
+        self._auth_managers: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _oauth(self, user_key: str) -> SpotifyOAuth:
+        """Gestionnaire OAuth d'un utilisateur, sans navigateur (service)."""
+        return SpotifyOAuth(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            redirect_uri=self.redirect_uri,
+            scope=self.scope,
+            cache_handler=StoreCacheHandler(self.store, user_key),
+            open_browser=False
+        )
+
+    def auth_manager(self, user_key: str) -> Any:
+        """Gestionnaire OAuth (réutilisé) d'un utilisateur."""
+        with self._lock:
+            if user_key not in self._auth_managers:
+                self._auth_managers[user_key] = self.auth_factory(user_key)
+            return self._auth_managers[user_key]
+
+    def authorize_url(self, user_key: str, state: Optional[str] = None) -> str:
+        """URL d'autorisation à présenter à un nouvel utilisateur."""
+        return self.auth_manager(user_key).get_authorize_url(state)
+
+    def complete_authorization(self, user_key: str, response: str) -> None:
+        """
+        Échange le code d'autorisation contre un token (enregistré dans le store).
+
+        Args:
+            user_key: Identifiant de l'utilisateur
+            response: URL de redirection complète, ou le code seul
+        """
+        auth_manager = self.auth_manager(user_key)
+        code = auth_manager.parse_response_code(response)
+        auth_manager.get_access_token(code, as_dict=False, check_cache=False)
+
+    def import_token_file(self, user_key: str, path: str = ".spotify_cache") -> bool:
+        """
+        Importe un cache de token spotipy existant (ex: .spotify_cache d'une installation mono-utilisateur).
+
+        Returns:
+            True si un token a été importé
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                token_info = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not token_info.get('refresh_token'):
+            return False
+        self.store.save(user_key, token_info)
+        return True
+
+    def refresh(self, user_key: str) -> bool:
+        """
+        Rafraîchit le token d'un utilisateur si aucun autre processus ne s'en charge.
+
+        Returns:
+            True si le token a été rafraîchi ici
+        """
+        token_info = self.store.get(user_key)
+        if not token_info or not token_info.get('refresh_token'):
+            return False
+        if not self.store.claim_refresh(user_key, self.owner):
+            return False
+
+        try:
+            # Token relu après la réservation: un autre processus a pu le rafraîchir entre-temps
+            token_info = self.store.get(user_key) or token_info
+            if token_info.get('expires_at', 0) - time.time() >= self.refresh_margin:
+                self.store.release_refresh(user_key, self.owner)
+                return False
+            # Le gestionnaire OAuth enregistre le nouveau token via StoreCacheHandler
+            self.auth_manager(user_key).refresh_access_token(token_info['refresh_token'])
+        except Exception as e:
+            self.store.release_refresh(user_key, self.owner)
+            self.failures[user_key] = str(e)
+            logger.warning(f"⚠️  Rafraîchissement du token de {user_key} échoué: {e}")
+            return False
+
+        self.failures.pop(user_key, None)
+        self.refreshed += 1
+        return True
+
+    def refresh_due(self) -> int:
+        """
+        Rafraîchit tous les tokens qui expirent dans moins de refresh_margin secondes.
+
+        Returns:
+            Nombre de tokens rafraîchis
+        """
+        return sum(self.refresh(user_key) for user_key in self.store.due(time.time() + self.refresh_margin))
+
+    def start(self) -> None:
+        """Démarre le rafraîchissement en arrière-plan (thread démon)."""
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="token-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Arrête le rafraîchissement en arrière-plan."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_due()
+            except Exception as e:
+                logger.warning(f"⚠️  Vérification des tokens échouée: {e}")
+            self._stop.wait(self.interval)
+
+    def manager_for(self, user_key: str, config: Optional[Dict] = None):
+        """
+        SpotifyManager d'un utilisateur, avec un token déjà valide.
+
+        Args:
+            user_key: Identifiant de l'utilisateur
+            config: Section 'spotify' de la configuration
+
+        Returns:
+            SpotifyManager prêt à l'emploi
+
+        Raises:
+            KeyError: si l'utilisateur n'a jamais autorisé l'application
+            RuntimeError: si le token a expiré et n'a pas pu être rafraîchi
+        """
+        from spotify_manager import SpotifyManager
+
+        token_info = self.store.get(user_key)
+        if not token_info:
+            raise KeyError(f"Aucun token Spotify pour l'utilisateur {user_key}")
+
+        # Token sur le point d'expirer (thread pas encore passé): rafraîchi avant de le confier
+        if token_info.get('expires_at', 0) - time.time() < self.refresh_margin:
+            token_info = self._wait_for_refresh(user_key)
+            if token_info.get('expires_at', 0) - time.time() < TOKEN_EXPIRY_SLACK:
+                error = self.failures.get(user_key, "rafraîchissement en cours ailleurs, délai dépassé")
+                raise RuntimeError(f"Token Spotify de {user_key} expiré: {error}")
+
+        return SpotifyManager(config, interactive=False, auth_manager=self.auth_manager(user_key))
+
+    def _wait_for_refresh(self, user_key: str, poll: float = 0.2) -> Dict:
+        """
+        Rafraîchit le token, ou attend qu'un autre processus (titulaire de la réservation) l'ait fait.
+
+        Returns:
+            Token relu dans le store (frais, ou inchangé si l'attente dépasse claim_wait)
+        """
+        deadline = time.monotonic() + self.claim_wait
+        self.failures.pop(user_key, None)  # seul l'échec d'une tentative de cette attente compte
+        while True:
+            if self.refresh(user_key) or user_key in self.failures:
+                return self.store.get(user_key) or {}
+            token_info = self.store.get(user_key) or {}
+            if token_info.get('expires_at', 0) - time.time() >= self.refresh_margin:
+                return token_info
+            if time.monotonic() >= deadline:
+                return token_info
+            # Réservation tenue ailleurs: relire le token une fois le rafraîchissement terminé
+            time.sleep(poll)
@@ -0,0 +1,653 @@
+"""
+Transfer Pipeline Module
+Étapes d'un transfert YouTube → Spotify, réutilisables par la CLI et les modes longue durée
+"""
+
+import copy
+import io
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from app_logging import ProgressBar, get_logger
+from youtube_extractor import YouTubeExtractor
+from title_cleaner import TitleCleaner
+from spotify_manager import SpotifyManager
+from playlist_naming import IncrementalPlaylistAnalyzer, PlaylistNamingEngine
+from match_cache import MatchCache
+from local_catalog import match_many
+from models import MatchResult, PlaylistWriteResult, TrackCandidate, Video
+from query_planner import QueryPlan
+from run_profiler import RunProfiler, stage_context
+
+logger = get_logger('transfer_pipeline')
+
+
+class PlaylistTransferReport:
+    """Gestionnaire de rapport de transfert."""
+    
+    def __init__(self):
+        self.found_tracks: List[MatchResult] = []
+        self.not_found_tracks: List[str] = []
+        self.known_misses: Dict[str, float] = {}  # titre → prochaine vérification (cache négatif)
+        self.queries_sent = 0
+        self.eliminated_queries: Dict[str, int] = {}  # titre → requêtes équivalentes non envoyées
+        self.skipped_queries = 0  # requêtes non envoyées: correspondance titre + durée déjà acceptée
+        self.pruned_candidates = 0  # candidats écartés sur la durée
+        self.searched_videos = 0  # vidéos cherchées sur l'API (ni cache, ni catalogue)
+        self.found_searched = 0  # dont pistes trouvées
+        self.search_seconds = 0.0  # temps passé dans les recherches API
+        self.structured_lookups = 0  # vidéos de sources structurées (Topic, VEVO): une requête track:/artist:
+        self.total_youtube_videos = 0
+        self.processing_time = 0.0
+        self.playlist_url = ""
+        self.playlist_name = ""
+        self.profile = ""
+        self.profile_settings: Dict = {}
+        self.cached_matches = 0
+        self.catalog_matches = 0
+        self.write_result: PlaylistWriteResult | None = None
+        self.profile_lines: List[str] = []  # résumé de --profile-run
+        self.credential_usage: Dict[str, Dict[str, int]] = {}  # credential → requêtes, 429, erreurs
+    
+    def add_found_track(self, youtube_title: str, spotify_track: TrackCandidate, source: str = 'search'):
+        """Ajoute une piste trouvée au rapport."""
+        self.found_tracks.append(MatchResult(youtube_title, spotify_track, source))
+    
+    def add_not_found_track(self, youtube_title: str, retry_at: float | None = None):
+        """Ajoute une piste non trouvée au rapport (retry_at: échec servi par le cache négatif)."""
+        self.not_found_tracks.append(youtube_title)
+        if retry_at is not None:
+            self.known_misses[youtube_title] = retry_at
+    
+    def add_query_plan(self, youtube_title: str, plan: QueryPlan):
+        """Enregistre les requêtes envoyées et éliminées pour une vidéo."""
+        self.queries_sent += plan.sent
+        self.skipped_queries += len(plan.skipped)
+        self.pruned_candidates += plan.pruned_candidates
+        if plan.saved_requests:
+            self.eliminated_queries[youtube_title] = plan.saved_requests
+    
+    def print_summary(self):
+        """Affiche un résumé du transfert."""
+        print("\n" + "="*60)
+        print("📊 RÉSUMÉ DU TRANSFERT")
+        print("="*60)
+        print(f"🎵 Vidéos YouTube analysées: {self.total_youtube_videos}")
+        print(f"✅ Pistes trouvées sur Spotify: {len(self.found_tracks)}")
+        print(f"❌ Pistes non trouvées: {len(self.not_found_tracks)}")
+        print(f"📈 Taux de réussite: {len(self.found_tracks)/max(self.total_youtube_videos, 1)*100:.1f}%")
+        if self.cached_matches:
+            print(f"♻️  Correspondances servies par le cache: {self.cached_matches}")
+        if self.catalog_matches:
+            print(f"💾 Correspondances trouvées dans le catalogue local: {self.catalog_matches}")
+        if self.known_misses:
+            print(f"🚫 Échecs connus ignorés (cache négatif): {len(self.known_misses)}")
+        if self.eliminated_queries:
+            print(f"🧮 Requêtes envoyées: {self.queries_sent} "
+                  f"({sum(self.eliminated_queries.values())} requêtes équivalentes évitées)")
+        if self.structured_lookups:
+            print(f"🎼 Sources structurées (Topic/VEVO): {self.structured_lookups} vidéos")
+        if self.skipped_queries or self.pruned_candidates:
+            print(f"⏱️  Durée: {self.pruned_candidates} candidats écartés, "
+                  f"{self.skipped_queries} requêtes évitées (correspondance acceptée)")
+        if self.credential_usage:
+            print("🔑 Recherches par credential: " + ', '.join(
+                f"{label} {usage['requests']} ({usage['rate_limited']}×429)"
+                for label, usage in self.credential_usage.items()
+            ))
+        
+        if self.playlist_url:
+            print(f"🎯 Playlist créée: {self.playlist_url}")
+        if self.write_result and not self.write_result.success:
+            print(f"⚠️  Pistes non ajoutées à la playlist: {len(self.write_result.pending_uris)}")
+        
+        print(f"⏱️  Temps de traitement: {self.processing_time:.1f}s")
+        if self.profile:
+            print(f"⚙️  Profil: {self.profile} ({self._format_profile_settings()})")
+        if self.profile_lines:
+            print("🔬 Profilage par étape:")
+            for line in self.profile_lines:
+                print(f"   {line}")
+        print("="*60)
+    
+    def _format_profile_settings(self) -> str:
+        """Résume les réglages du profil de performance."""
+        return ', '.join(f"{key}={value}" for key, value in self.profile_settings.items())
+    
+    def to_dict(self) -> Dict:
+        """Résumé du transfert (JSON-compatible)."""
+        return {
+            'playlist_name': self.playlist_name,
+            'playlist_url': self.playlist_url,
+            'total_youtube_videos': self.total_youtube_videos,
+            'found': len(self.found_tracks),
+            'not_found': len(self.not_found_tracks),
+            'cached_matches': self.cached_matches,
+            'catalog_matches': self.catalog_matches,
+            'known_misses': len(self.known_misses),
+            'queries_sent': self.queries_sent,
+            'skipped_queries': self.skipped_queries,
+            'pruned_candidates': self.pruned_candidates,
+            'structured_lookups': self.structured_lookups,
+            'credential_usage': self.credential_usage,
+            'processing_time': self.processing_time,
+            'profile': self.profile,
+        }
+    
+    def to_text(self) -> str:
+        """Rapport détaillé sous forme de texte."""
+        buffer = io.StringIO()
+        self.write_report(buffer)
+        return buffer.getvalue()
+    
+    def write_report(self, f: TextIO):
+        """Écrit le rapport détaillé dans un flux texte."""
+        f.write(f"🎵 YouTube → Spotify Playlist Transfer Report\n")
+        f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Playlist: {self.playlist_name}\n")
+        f.write("="*60 + "\n\n")
+        
+        f.write(f"📊 SUMMARY:\n")
+        f.write(f"  - YouTube videos analyzed: {self.total_youtube_videos}\n")
+        f.write(f"  - Tracks found on Spotify: {len(self.found_tracks)}\n")
+        f.write(f"  - Tracks not found: {len(self.not_found_tracks)}\n")
+        if self.known_misses:
+            f.write(f"  - Known misses skipped (negative cache): {len(self.known_misses)}\n")
+        if self.structured_lookups:
+            f.write(f"  - Structured sources (Topic/VEVO channels): {self.structured_lookups}\n")
+        if self.skipped_queries or self.pruned_candidates:
+            f.write(f"  - Duration pruning: {self.pruned_candidates} candidates rejected, "
+                    f"{self.skipped_queries} queries skipped after an early match\n")
+        f.write(f"  - Success rate: {len(self.found_tracks)/max(self.total_youtube_videos, 1)*100:.1f}%\n")
+        f.write(f"  - Playlist URL: {self.playlist_url}\n")
+        if self.write_result:
+            f.write(f"  - Tracks written to playlist: {len(self.write_result.landed_uris)}\n")
+            if self.write_result.snapshot_id:
+                f.write(f"  - Playlist snapshot: {self.write_result.snapshot_id}\n")
+        if self.profile:
+            f.write(f"  - Profile: {self.profile} ({self._format_profile_settings()})\n")
+        f.write("\n")
+        
+        if self.found_tracks:
+            f.write("✅ FOUND TRACKS:\n")
+            f.write("-" * 40 + "\n")
+            for i, match in enumerate(self.found_tracks, 1):
+                track = match.track
+                assert track is not None
+                f.write(f"{i:2d}. {match.youtube_title}\n")
+                f.write(f"    → {track.name} - {track.artists_text}\n")
+                f.write(f"    Score: {track.relevance_score:.2f}\n\n")
+        
+        if self.not_found_tracks:
+            f.write("❌ NOT FOUND TRACKS:\n")
+            f.write("-" * 40 + "\n")
+            for i, track in enumerate(self.not_found_tracks, 1):
+                if track in self.known_misses:
+                    retry = datetime.fromtimestamp(self.known_misses[track]).strftime('%Y-%m-%d %H:%M')
+                    f.write(f"{i:2d}. {track}  [negative cache, re-check after {retry}]\n")
+                else:
+                    f.write(f"{i:2d}. {track}\n")
+        
+        if self.eliminated_queries:
+            f.write(f"\n🧮 QUERY PLANNING ({self.queries_sent} requests sent, "
+                    f"{sum(self.eliminated_queries.values())} equivalent requests eliminated):\n")
+            f.write("-" * 40 + "\n")
+            for title, saved in self.eliminated_queries.items():
+                f.write(f"  -{saved} {title}\n")
+        
+        if self.credential_usage:
+            f.write("\n🔑 SEARCH CREDENTIALS:\n")
+            f.write("-" * 40 + "\n")
+            for label, usage in self.credential_usage.items():
+                f.write(f"  {label}: {usage['requests']} requests, {usage['rate_limited']} rate-limited, "
+                        f"{usage['errors']} errors\n")
+        
+        if self.profile_lines:
+            f.write("\n🔬 PROFILE (--profile-run):\n")
+            f.write("-" * 40 + "\n")
+            for line in self.profile_lines:
+                f.write(f"{line}\n")
+        
+        if self.write_result and not self.write_result.success:
+            f.write("\n⚠️  NOT WRITTEN TO PLAYLIST:\n")
+            f.write("-" * 40 + "\n")
+            for chunk in self.write_result.chunks:
+                if chunk.landed:
+                    continue
+                status = f"failed after {chunk.attempts} attempts: {chunk.error}" if chunk.attempts else "not attempted"
+                where = f"Position {chunk.position}" if chunk.position is not None else "Append"
+                f.write(f"  {where} ({len(chunk.uris)} tracks) - {status}\n")
+                for uri in chunk.uris:
+                    f.write(f"    {uri}\n")
+    
+    def save_to_file(self, filename: str | None = None):
+        """Sauvegarde le rapport détaillé dans un fichier."""
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"reports/rapport_transfert_{timestamp}.txt"
+        
+        # Créer le dossier reports s'il n'existe pas
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            self.write_report(f)
+        
+        logger.info(f"📄 Rapport sauvegardé: {filename}")
+
+
+class TransferPipeline:
+    """
+    Composants d'un transfert (extracteur, nettoyeur, Spotify, cache) créés une seule fois.
+
+    Une même instance peut traiter plusieurs playlists à la suite ou depuis plusieurs
+    threads: la session Spotify, le dictionnaire d'artistes et le cache restent chauds.
+    """
+
+    def __init__(self, config: Dict, search_only: bool = False, cache_path: Optional[str] = None,
+                 catalog_path: Optional[str] = None, spotify_manager: Optional[SpotifyManager] = None,
+                 profiler: Optional[RunProfiler] = None, youtube_extractor: Optional[YouTubeExtractor] = None):
+        """
+        Initialise le pipeline.
+
+        Args:
+            config: Configuration complète (voir config.settings.load_config)
+            search_only: Recherche seule (pas de playlist, client credentials)
+            cache_path: Cache local des correspondances (None = pas de cache)
+            catalog_path: Catalogue local pour la recherche hors ligne (None = API seulement)
+            spotify_manager: Gestionnaire Spotify existant à réutiliser
+            profiler: Profileur par étape (None = aucun surcoût)
+            youtube_extractor: Extracteur YouTube existant à réutiliser
+        """
+        self.config = config
+        self.search_only = search_only
+        self.catalog_path = catalog_path
+        self.profiler = profiler
+
+        self.spotify_manager = spotify_manager or SpotifyManager(
+            {**config['spotify'], **config['errors']}, search_only=search_only
+        )
+        self.youtube_extractor = youtube_extractor or YouTubeExtractor(config['youtube'])
+        self.title_cleaner = TitleCleaner(config={**config['cleaning'], **config['spotify']})
+        self.match_cache = MatchCache(cache_path, config['cache']) if cache_path else None
+        self.naming_engine = PlaylistNamingEngine()
+
+        # Le cache est partagé entre les transferts simultanés
+        self._cache_lock = threading.Lock()
+        self._authenticated = False
+
+    def authenticate(self) -> bool:
+        """Authentifie Spotify une seule fois pour toute la durée de vie du pipeline."""
+        if not self._authenticated:
+            self._authenticated = self.spotify_manager.authenticate()
+        return self._authenticated
+
+    def with_spotify_manager(self, spotify_manager: SpotifyManager) -> 'TransferPipeline':
+        """
+        Même pipeline pour un autre compte Spotify (service multi-utilisateurs).
+
+        Le cache des correspondances, l'extracteur YouTube et le nettoyeur sont partagés.
+
+        Args:
+            spotify_manager: Gestionnaire Spotify de l'utilisateur (voir TokenManager.manager_for)
+
+        Returns:
+            Nouveau pipeline
+        """
+        pipeline = copy.copy(self)
+        pipeline.spotify_manager = spotify_manager
+        pipeline._authenticated = False
+        return pipeline
+
+    def extract_videos(self, youtube_url: str, max_tracks: int = 0) -> Optional[List[Video]]:
+        """
+        Extrait les vidéos d'une playlist YouTube.
+
+        Args:
+            youtube_url: URL de la playlist
+            max_tracks: Limite du nombre de vidéos (0 = toutes)
+
+        Returns:
+            Liste des vidéos (éventuellement vide), ou None si l'URL est invalide
+        """
+        if not self.youtube_extractor.is_valid_youtube_url(youtube_url):
+            logger.error("❌ URL YouTube invalide!")
+            return None
+
+        videos = self.youtube_extractor.extract_videos(youtube_url)
+
+        # Limiter le nombre de pistes si demandé
+        if max_tracks > 0 and len(videos) > max_tracks:
+            videos = videos[:max_tracks]
+            logger.warning(f"⚠️  Limitation à {max_tracks} pistes")
+
+        return videos
+
+    def match_videos(self, videos: List[Video], report: PlaylistTransferReport,
+                     analyzer: Optional[IncrementalPlaylistAnalyzer] = None) -> List[Optional[TrackCandidate]]:
+        """
+        Cherche la piste Spotify de chaque vidéo (cache, puis catalogue local, puis API).
+
+        Args:
+            videos: Vidéos à traiter
+            report: Rapport à compléter
+            analyzer: Analyseur de nommage alimenté à chaque piste trouvée
+
+        Returns:
+            Piste retenue (ou None) pour chaque vidéo, dans le même ordre
+        """
+        spotify_manager = self.spotify_manager
+        title_cleaner = self.title_cleaner
+        match_cache = self.match_cache
+
+        # Cache local: rafraîchir en lots les pistes déjà connues pour cette playlist
+        if match_cache:
+            with self._cache_lock:
+                cached_ids = list({
+                    cached.id for video in videos
+                    if (cached := match_cache.get(video.title, video.id))
+                })
+            if cached_ids:
+                logger.info(f"♻️  Rafraîchissement de {len(cached_ids)} pistes en cache...")
+                refreshed = spotify_manager.refresh_tracks(cached_ids, market=self.config['spotify'].get('market'))
+                with self._cache_lock:
+                    updated, removed = match_cache.merge_refreshed(refreshed)
+                logger.info(f"✅ {updated} pistes à jour, {removed} indisponibles retirées du cache")
+
+        # Catalogue local: correspondances hors ligne (multi-cœurs), l'API ne sert qu'aux échecs
+        catalog_matches: Dict[str, TrackCandidate] = {}
+        if self.catalog_path:
+            with self._cache_lock:
+                pending = [
+                    video for video in videos
+                    if not (match_cache and (match_cache.get(video.title, video.id)
+                                             or match_cache.get_miss(video.title, video.id)))
+                ]
+            logger.info(f"💾 Recherche de {len(pending)} titres dans le catalogue local...")
+            offline_results = match_many(
+                self.catalog_path,
+                [(*self._search_input(video), video.duration) for video in pending],
+                self.config['spotify']
+            )
+            catalog_matches = {
+                video.title: match for video, match in zip(pending, offline_results) if match
+            }
+            logger.info(f"✅ {len(catalog_matches)}/{len(pending)} titres trouvés hors ligne")
+
+        # Recherche des pistes
+        matches: List[Optional[TrackCandidate]] = []
+        progress = ProgressBar(len(videos), "🔍 Recherche", logger)
+
+        for progress_count, video in enumerate(videos, 1):
+            title = video.title
+
+            # Une ligne par vidéo seulement en --verbose (arguments formatés à la demande)
+            logger.debug("🔍 [%d/%d] %s...", progress_count, len(videos), title[:60])
+
+            source = 'search'
+            best_match = None
+            known_miss = None
+            if match_cache:
+                with self._cache_lock:
+                    best_match = match_cache.get(title, video.id)
+                    known_miss = match_cache.get_miss(title, video.id) if not best_match else None
+            if best_match:
+                source = 'cache'
+                report.cached_matches += 1
+            elif known_miss:
+                # Échec connu: pas de recherche avant la prochaine vérification planifiée
+                pass
+            elif title in catalog_matches:
+                best_match = catalog_matches[title]
+                source = 'catalog'
+                report.catalog_matches += 1
+            else:
+                # Générer les requêtes de recherche
+                search_started = time.perf_counter()
+                search_queries, search_title = self._search_input(video)
+
+                # Chercher sur Spotify (plans propres à cette vidéo: le gestionnaire est partagé entre threads)
+                plans: List[QueryPlan] = []
+                best_match = spotify_manager.find_best_match(search_queries, search_title, video.duration, plans)
+
+                if video.artist:
+                    report.structured_lookups += 1
+                    if not best_match:
+                        # Source structurée sans résultat: variantes heuristiques habituelles
+                        search_queries = title_cleaner.create_search_queries(search_title)
+                        best_match = spotify_manager.find_best_match(search_queries, search_title,
+                                                                     video.duration, plans)
+
+                for plan in plans:
+                    report.add_query_plan(title, plan)
+
+                report.searched_videos += 1
+                report.found_searched += bool(best_match)
+                report.search_seconds += time.perf_counter() - search_started
+
+                if match_cache:
+                    with self._cache_lock:
+                        if best_match:
+                            match_cache.put(title, best_match, video.id)
+                        else:
+                            match_cache.put_miss(title, video.id)
+
+            if best_match:
+                report.add_found_track(title, best_match, source)
+                if analyzer:
+                    analyzer.add_track(best_match)
+                logger.debug("✅ → %s - %s", best_match.name, best_match.artists_text)
+            elif known_miss:
+                report.add_not_found_track(title, retry_at=known_miss['retry_at'])
+                logger.debug("🚫 → Non trouvé (cache négatif, %d échec(s))", known_miss['misses'])
+            else:
+                report.add_not_found_track(title)
+                logger.debug("❌ → Non trouvé")
+            matches.append(best_match)
+            progress.update(found=best_match is not None)
+
+        progress.close()
+
+        if match_cache:
+            with self._cache_lock:
+                match_cache.save()
+
+        return matches
+
+    def _search_input(self, video: Video) -> Tuple[List[str], str]:
+        """
+        Requêtes et titre de référence d'une vidéo.
+
+        Les sources structurées (chaîne Topic, VEVO) donnent directement une requête
+        track:/artist:; les autres passent par les heuristiques de TitleCleaner.
+
+        Args:
+            video: Vidéo à chercher
+
+        Returns:
+            Tuple (requêtes, titre utilisé pour le score)
+        """
+        if video.artist and video.track:
+            return (self.title_cleaner.create_structured_queries(video.artist, video.track),
+                    f"{video.artist} - {video.track}")
+        return self.title_cleaner.create_search_queries(video.title), video.title
+
+    def playlist_identity(self, found_tracks: List[TrackCandidate], name: Optional[str] = None,
+                          description: Optional[str] = None,
+                          analyzer: Optional[IncrementalPlaylistAnalyzer] = None) -> Tuple[str, Optional[str]]:
+        """
+        Détermine le nom et la description de la playlist (générés si absents).
+
+        Args:
+            found_tracks: Pistes trouvées
+            name: Nom imposé
+            description: Description imposée
+            analyzer: Analyseur déjà alimenté pendant la recherche (évite de réanalyser les titres)
+
+        Returns:
+            Tuple (nom, description)
+        """
+        if not name and found_tracks:
+            logger.info("🧠 Génération automatique du nom de playlist...")
+            if analyzer is None:
+                analyzer = self.naming_engine.incremental_analyzer()
+                for track in found_tracks:
+                    analyzer.add_track(track)
+            name, auto_description = analyzer.identity()
+            logger.info(f"🎯 Nom généré: '{name}'")
+
+            # Utiliser la description automatique si aucune n'est fournie
+            if not description:
+                description = auto_description
+                logger.info(f"📝 Description générée: '{description[:100]}{'...' if len(description) > 100 else ''}'")
+
+        # Nom par défaut
+        if not name:
+            name = f"Playlist YouTube {datetime.now().strftime('%d-%m-%Y')}"
+
+        return name, description
+
+    def publish(self, report: PlaylistTransferReport, found_tracks: List[TrackCandidate],
+                description: Optional[str] = None, private: bool = False, force: bool = False,
+                replace: bool = False) -> Optional[str]:
+        """
+        Crée (ou remplace) la playlist Spotify et y écrit les pistes.
+
+        Appelée une fois la recherche terminée: la playlist n'est pas créée pendant la
+        recherche et les pistes ne sont pas écrites au fil de l'eau. Seul le nom généré
+        est calculé incrémentalement (IncrementalPlaylistAnalyzer), ce qui supprime la
+        seconde analyse des titres en fin de transfert.
+
+        Args:
+            report: Rapport du transfert (report.playlist_name doit être défini)
+            found_tracks: Pistes à écrire
+            description: Description de la playlist
+            private: Créer une playlist privée
+            force: Créer une nouvelle playlist même si le nom existe
+            replace: Réutiliser la playlist existante et remplacer son contenu
+
+        Returns:
+            ID de la playlist, ou None en cas d'échec
+        """
+        spotify_manager = self.spotify_manager
+        playlist_name = report.playlist_name
+        logger.info("🎯 Création de la playlist Spotify...")
+
+        # Vérifier si la playlist existe déjà
+        existing_playlist = spotify_manager.playlist_exists(playlist_name)
+        if existing_playlist and not (force or replace):
+            logger.warning(f"⚠️  Une playlist '{playlist_name}' existe déjà!\n"
+                           "Utilisez --replace pour remplacer son contenu, --force pour en créer une nouvelle,\n"
+                           "ou choisissez un autre nom.")
+            return None
+
+        if existing_playlist and replace:
+            logger.info(f"♻️  Remplacement du contenu de la playlist existante '{playlist_name}'")
+            playlist_id = existing_playlist
+        else:
+            # Créer la playlist
+            final_description = description or f"Importée depuis YouTube le {datetime.now().strftime('%d/%m/%Y')}"
+            playlist_id = spotify_manager.create_playlist(
+                name=playlist_name,
+                description=final_description,
+                public=not private
+            )
+
+        if not playlist_id:
+            logger.error("❌ Erreur lors de la création de la playlist")
+            return None
+
+        # Écrire les pistes lot par lot (seuls les lots en échec sont réessayés)
+        track_uris = [track.uri for track in found_tracks]
+        write_result = spotify_manager.write_playlist_tracks(
+            playlist_id, track_uris, replace=bool(existing_playlist and replace)
+        )
+        report.write_result = write_result
+        report.playlist_url = spotify_manager.get_playlist_url(playlist_id)
+        if write_result.success:
+            logger.info("🎉 Playlist créée avec succès!")
+        else:
+            logger.error(f"❌ {len(write_result.pending_uris)} pistes n'ont pas pu être ajoutées (détail dans le rapport)")
+
+        return playlist_id
+
+    def run(self, youtube_url: str, name: Optional[str] = None, description: Optional[str] = None,
+            private: bool = False, force: bool = False, replace: bool = False, max_tracks: int = 0,
+            report: Optional[PlaylistTransferReport] = None) -> Tuple[int, PlaylistTransferReport]:
+        """
+        Exécute un transfert complet: extraction, recherche, création de la playlist.
+
+        Args:
+            youtube_url: URL de la playlist YouTube
+            name: Nom de la playlist Spotify (généré si absent)
+            description: Description de la playlist
+            private: Créer une playlist privée
+            force: Créer une nouvelle playlist même si le nom existe
+            replace: Remplacer le contenu d'une playlist existante du même nom
+            max_tracks: Limite du nombre de vidéos (0 = toutes)
+            report: Rapport à compléter (créé si absent)
+
+        Returns:
+            Tuple (code de retour, rapport): 0 succès, 1 échec, 2 moins de 50% de réussite
+        """
+        report = report or PlaylistTransferReport()
+        start_time = datetime.now()
+
+        # 1. Extraction YouTube
+        logger.info("📥 Extraction de la playlist YouTube...")
+        with stage_context(self.profiler, 'extract'):
+            videos = self.extract_videos(youtube_url, max_tracks)
+        if videos is None:
+            return 1, report
+        if not videos:
+            logger.error("❌ Aucune vidéo trouvée dans la playlist!")
+            return 1, report
+
+        report.total_youtube_videos = len(videos)
+        logger.info(f"✅ {len(videos)} vidéos extraites")
+
+        # 2. Nettoyage et recherche
+        logger.info("🧹 Nettoyage des titres et recherche Spotify...")
+
+        # Authentification Spotify
+        with stage_context(self.profiler, 'auth'):
+            authenticated = self.authenticate()
+        if not authenticated:
+            logger.error("❌ Échec de l'authentification Spotify!")
+            return 1, report
+
+        # Le nom est analysé au fil des correspondances: pas de seconde passe sur les titres
+        analyzer = self.naming_engine.incremental_analyzer()
+        usage_before = self.spotify_manager.credential_stats()
+        with stage_context(self.profiler, 'match'):
+            found_tracks = [track for track in self.match_videos(videos, report, analyzer) if track]
+        # Utilisation du pool pendant ce transfert (le pool est partagé entre les transferts)
+        report.credential_usage = {
+            label: {key: value - usage_before[label][key] for key, value in usage.items()}
+            for label, usage in self.spotify_manager.credential_stats().items()
+        }
+
+        # 2.5. Génération automatique du nom de playlist si nécessaire
+        with stage_context(self.profiler, 'naming'):
+            report.playlist_name, description = self.playlist_identity(found_tracks, name, description, analyzer)
+
+        # 3. Création de la playlist (si pas en mode rapport seulement)
+        if not self.search_only and found_tracks:
+            with stage_context(self.profiler, 'publish'):
+                playlist_id = self.publish(report, found_tracks, description, private, force, replace)
+            if playlist_id is None and not report.write_result:
+                # Playlist existante sans --force/--replace, ou création impossible
+                report.processing_time = (datetime.now() - start_time).total_seconds()
+                return 1, report
+
+        report.processing_time = (datetime.now() - start_time).total_seconds()
+
+        # Code de retour
+        if len(found_tracks) == 0:
+            return 1, report  # Aucune piste trouvée
+        elif len(found_tracks) < len(videos) * 0.5:
+            return 2, report  # Moins de 50% de réussite
+        else:
+            return 0, report  # Succès
@@ -5,19 +5,49 @@ Extrait les vidéos et métadonnées depuis YouTube en utilisant yt-dlp
 
 import yt_dlp
 import re
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
 
+from app_logging import get_logger
+from models import Video
+
+logger = get_logger('youtube_extractor')
+
+
+# Champs conservés des métadonnées yt-dlp (le reste n'est pas utilisé)
+PLAYLIST_FIELDS = ('title', 'id', 'uploader', 'description')
+ENTRY_FIELDS = ('title', 'id', 'duration', 'uploader', 'channel', 'url')
+
+# Chaînes générées par YouTube Music: "Artiste - Topic", titre = nom exact de la piste
+TOPIC_CHANNEL = re.compile(r'^(?P<artist>.+?)\s+-\s+Topic$')
+# Chaînes VEVO: "ArtisteVEVO", titres au format "Artiste - Titre"
+VEVO_CHANNEL = re.compile(r'^(?P<name>.+?)\s*VEVO$', re.IGNORECASE)
+
 
 class YouTubeExtractor:
-    def __init__(self):
-        """Initialise l'extracteur YouTube avec les options yt-dlp."""
+    def __init__(self, config: Optional[Dict] = None,
+                 info_extractor: Optional[Callable[[str], Optional[Dict]]] = None):
+        """
+        Initialise l'extracteur YouTube avec les options yt-dlp.
+        
+        Args:
+            config: Section 'youtube' de la configuration (voir config/settings.py)
+            info_extractor: Fonction URL → métadonnées remplaçant yt-dlp (ex: relecture d'une cassette)
+        """
+        config = config or {}
+        self.info_extractor = info_extractor or self._extract_info
+        self.min_duration = config.get('min_duration', 30)
+        self.max_duration = config.get('max_duration')
+        self.skip_shorts = config.get('skip_shorts', False)
+        
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
             'extract_flat': True,  # Ne télécharge pas, juste les métadonnées
             'ignoreerrors': True,
         }
+        if config.get('extraction_timeout'):
+            self.ydl_opts['socket_timeout'] = config['extraction_timeout']
     
     def extract_playlist_info(self, url: str) -> Optional[Dict]:
         """
@@ -30,25 +60,78 @@ class YouTubeExtractor:
             Dict avec les infos de la playlist ou None si erreur
         """
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                if info is None:
-                    print(f"❌ Impossible d'extraire les informations depuis {url}")
-                    return None
-                
-                return {
-                    'title': info.get('title', 'Playlist sans nom'),
-                    'id': info.get('id'),
-                    'uploader': info.get('uploader'),
-                    'description': info.get('description', ''),
-                    'entries': info.get('entries', [])
-                }
+            info = self.info_extractor(url)
+            
+            if info is None:
+                logger.error(f"❌ Impossible d'extraire les informations depuis {url}")
+                return None
+            
+            return {
+                'title': info.get('title') or 'Playlist sans nom',
+                'id': info.get('id'),
+                'uploader': info.get('uploader'),
+                'description': info.get('description') or '',
+                'entries': info.get('entries') or []
+            }
         except Exception as e:
-            print(f"❌ Erreur lors de l'extraction de la playlist: {e}")
+            logger.error(f"❌ Erreur lors de l'extraction de la playlist: {e}")
+            return None
+    
+    def _extract_info(self, url: str) -> Optional[Dict]:
+        """
+        Appelle yt-dlp et ne garde que les champs utilisés et renseignés (dict compact, sérialisable en JSON).
+        
+        Args:
+            url: URL de la playlist ou mix YouTube
+            
+        Returns:
+            Métadonnées de la playlist ou None
+        """
+        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+        
+        if info is None:
+            return None
+        
+        compact = {key: info.get(key) for key in PLAYLIST_FIELDS}
+        compact['entries'] = [
+            {key: entry[key] for key in ENTRY_FIELDS if entry.get(key) is not None} if entry else None
+            for entry in info.get('entries') or []
+        ]
+        return compact
+    
+    @staticmethod
+    def split_structured(title: str, uploader: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        Reconnaît les sources structurées dont l'artiste et le titre sont fiables.
+        
+        - "Artiste - Topic" (YouTube Music): le titre est le nom de la piste
+        - "ArtisteVEVO": titre "Artiste - Titre", accepté si l'artiste correspond à la chaîne
+        
+        Args:
+            title: Titre de la vidéo
+            uploader: Nom de la chaîne
+            
+        Returns:
+            Tuple (artiste, titre), ou None si la source n'est pas structurée
+        """
+        if not uploader or not title:
             return None
+        
+        topic = TOPIC_CHANNEL.match(uploader.strip())
+        if topic:
+            return topic.group('artist').strip(), title.strip()
+        
+        vevo = VEVO_CHANNEL.match(uploader.strip())
+        if vevo and ' - ' in title:
+            artist, track = (part.strip() for part in title.split(' - ', 1))
+            compact = re.sub(r'\W', '', artist.lower())
+            if artist and track and compact.startswith(re.sub(r'\W', '', vevo.group('name').lower())):
+                return artist, track
+        
+        return None
     
-    def extract_videos(self, url: str) -> List[Dict]:
+    def extract_videos(self, url: str) -> List[Video]:
         """
         Extrait toutes les vidéos d'une playlist/mix YouTube.
         
@@ -56,7 +139,7 @@ class YouTubeExtractor:
             url: URL de la playlist ou mix YouTube
             
         Returns:
-            Liste de dictionnaires contenant les infos des vidéos
+            Liste des vidéos
         """
         playlist_info = self.extract_playlist_info(url)
         if not playlist_info:
@@ -65,25 +148,35 @@ class YouTubeExtractor:
         videos = []
         entries = playlist_info.get('entries', [])
         
-        print(f"🎵 {len(entries)} vidéos trouvées dans la playlist")
+        logger.info(f"🎵 {len(entries)} vidéos trouvées dans la playlist")
         
         for entry in entries:
             if entry is None:  # Vidéo indisponible
                 continue
                 
-            video_info = {
-                'title': entry.get('title', 'Titre inconnu'),
-                'id': entry.get('id'),
-                'duration': entry.get('duration'),
-                'uploader': entry.get('uploader'),
-                'url': f"https://www.youtube.com/watch?v={entry.get('id')}" if entry.get('id') else None
-            }
+            video = Video(
+                title=entry.get('title') or 'Titre inconnu',
+                id=entry.get('id'),
+                duration=entry.get('duration'),
+                uploader=entry.get('uploader') or entry.get('channel')
+            )
+            structured = self.split_structured(video.title, video.uploader)
+            if structured:
+                video.artist, video.track = structured
             
             # Filtrer les vidéos trop courtes (probablement des intros/outros)
-            if video_info['duration'] and video_info['duration'] < 30:
+            if video.duration and video.duration < self.min_duration:
+                continue
+            
+            # Filtrer les vidéos trop longues (mixes d'une heure, albums complets)
+            if video.duration and self.max_duration and video.duration > self.max_duration:
+                continue
+            
+            # Filtrer les YouTube Shorts
+            if self.skip_shorts and '/shorts/' in (entry.get('url') or ''):
                 continue
                 
-            videos.append(video_info)
+            videos.append(video)
         
         return videos
     
@@ -136,7 +229,7 @@ def main():
         videos = extractor.extract_videos(test_url)
         print(f"Trouvé {len(videos)} vidéos:")
         for i, video in enumerate(videos[:5], 1):  # Affiche les 5 premières
-            print(f"{i}. {video['title']} ({video['duration']}s)")
+            print(f"{i}. {video.title} ({video.duration}s)")
     else:
         print("URL YouTube invalide")
 
@@ -136,6 +136,1532 @@ def test_spotify_manager():
         return False
 
 
+def test_keyword_matcher():
+    """Test the Aho-Corasick keyword matcher and the naming engine analysis."""
+    print("\n🧠 Testing Keyword Matcher...")
+    
+    from keyword_matcher import KeywordMatcher
+    from playlist_naming import PlaylistNamingEngine
+    
+    matcher = KeywordMatcher({'hip_hop': ['rap', 'hip hop'], 'amapiano': ['sa']})
+    
+    # Word boundaries: "trap" and "Asake" must not match "rap" / "sa"
+    assert matcher.count_matches("Asake - Trap Queen") == {}
+    assert matcher.count_matches("Hip Hop & RAP (rap)") == {'hip_hop': 3}
+    assert matcher.distinct_keywords("Hip Hop & RAP (rap)") == {'hip_hop': 2}
+    
+    # Recompiling after add_keyword must not duplicate inherited outputs
+    nested = KeywordMatcher({'x': ['boy', 'burna boy']})
+    assert nested.count_matches("burna boy") == {'x': 2}
+    nested.add_keyword("na boy", 'y')
+    nested.compile()
+    nested.compile()
+    assert nested.count_matches("burna boy") == {'x': 2}
+    assert sorted(label for _, _, label in nested.iter_matches("na boy")) == ['x', 'y']
+    
+    engine = PlaylistNamingEngine()
+    analysis = engine.analyze_tracks([
+        "Asake - Joha #afrobeats",
+        "Burna Boy - Last Last (Live)",
+        "Central Cee - Drill Freestyle",
+    ])
+    genres = dict(analysis['genres'])
+    assert genres.get('afrobeat') == 1
+    assert genres.get('hip_hop') == 2
+    assert 'amapiano' not in genres
+    assert 'live' in analysis['contexts']
+    
+    print("✅ Keyword Matcher test passed!")
+    return True
+
+
+def test_artist_dictionary():
+    """Test artist/title splitting with the local artist dictionary."""
+    print("\n🎤 Testing Artist Dictionary...")
+    
+    from artist_dictionary import ArtistDictionary
+    from title_cleaner import TitleCleaner
+    
+    dictionary = ArtistDictionary(["Asake", "Tiakola", "Fireboy DML", "Mellow & Sleazy"])
+    
+    assert "asake" in dictionary
+    assert dictionary.split_title("Asake & Tiakola BADMAN GANGSTA") == ("Asake & Tiakola", "BADMAN GANGSTA")
+    assert dictionary.split_title("Fireboy DML, Asake - Bandana") == ("Fireboy DML, Asake", "Bandana")
+    assert dictionary.split_title("Mellow & Sleazy - Bopha") == ("Mellow & Sleazy", "Bopha")
+    # Unknown featured artist or unknown leading artist: no dictionary split
+    assert dictionary.split_title("Asake ft. Nobody - Song") is None
+    assert dictionary.split_title("Unknown - Song") is None
+    
+    cleaner = TitleCleaner(artist_dictionary=dictionary)
+    assert cleaner.extract_artist_title("Asake & Tiakola BADMAN GANGSTA (Official Video)") == ("Asake & Tiakola", "BADMAN GANGSTA")
+    queries = cleaner.create_search_queries("Asake & Tiakola BADMAN GANGSTA")
+    assert queries[0] == "track:BADMAN GANGSTA artist:Asake"
+    
+    # The bundled dictionary is loaded by default
+    assert "didi b" in TitleCleaner().artist_dictionary
+    
+    print("✅ Artist Dictionary test passed!")
+    return True
+
+
+def test_spell_corrector():
+    """Test the deletion-index spelling correction."""
+    print("\n✏️  Testing Spell Corrector...")
+    
+    from spell_corrector import SpellCorrector, edit_distance
+    from artist_dictionary import ArtistDictionary
+    from title_cleaner import TitleCleaner
+    
+    assert edit_distance("burna", "bruna", 2) == 1  # transposition
+    assert edit_distance("wizkid", "davido", 2) == 3
+    
+    corrector = SpellCorrector()
+    for text in ["Burna Boy", "Wizkid", "Last Last", "Essence"]:
+        corrector.add_text(text)
+    
+    assert corrector.lookup("wizkd") == "wizkid"
+    assert corrector.lookup("BWOII") == "boy"
+    assert corrector.lookup("burna") is None  # known word: no correction
+    assert corrector.correct_text("Bruna Boy Lsat Last") == "burna boy last last"
+    assert corrector.correct_text("Burna Boy Last Last") is None
+    
+    cleaner = TitleCleaner(ArtistDictionary(["Burna Boy"]), corrector)
+    queries = cleaner.create_search_queries("Bruna Boy - Lsat Last (Official Video)")
+    assert queries[0] == "Bruna Boy Lsat Last"
+    assert queries[-1] == "track:last last artist:Burna Boy"  # after the variants, never cut
+    assert len(queries) <= 5
+    
+    # Valid words missing from the dictionary are left alone
+    default_cleaner = TitleCleaner()
+    for title in ["Adele - Hello", "Coldplay - Yellow"]:
+        cleaned = default_cleaner.clean_title(title)
+        assert default_cleaner.spell_corrector.correct_text(cleaned) is None, title
+        queries = default_cleaner.create_search_queries(title)
+        assert queries[0] == cleaned.replace(" - ", " "), queries
+        assert all(q.lower().split() != ["adele", "bella"] and "mellow" not in q.lower() for q in queries)
+    assert corrector.correct_text("Lsat") is None  # a single word is not a known phrase
+    
+    print("✅ Spell Corrector test passed!")
+    return True
+
+
+def test_performance_profiles():
+    """Test that the performance profiles reach the modules."""
+    print("\n⚙️  Testing Performance Profiles...")
+    
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config.settings import load_config
+    from title_cleaner import TitleCleaner
+    from youtube_extractor import YouTubeExtractor
+    
+    fast = load_config('fast')
+    thorough = load_config('thorough')
+    assert fast['spotify']['max_search_queries'] < thorough['spotify']['max_search_queries']
+    assert load_config()['profile'] == 'balanced'
+    
+    # The default profile behaves like the modules without any configuration
+    balanced = load_config()
+    assert YouTubeExtractor(balanced['youtube']).max_duration is None
+    assert not YouTubeExtractor(balanced['youtube']).skip_shorts
+    assert balanced['spotify']['search_limit'] == 5 and balanced['spotify']['rate_limit_delay'] == 0.0
+    
+    cleaner = TitleCleaner(config={**fast['cleaning'], **fast['spotify']})
+    assert len(cleaner.create_search_queries("Unknown Dude - Some Song (Official Video)")) == 2
+    
+    extractor = YouTubeExtractor(thorough['youtube'])
+    assert extractor.min_duration == 20 and extractor.max_duration == 900
+    
+    try:
+        load_config('turbo')
+        assert False, "unknown profile accepted"
+    except ValueError:
+        pass
+    
+    print("✅ Performance Profiles test passed!")
+    return True
+
+
+def make_api_track(track_id, name="Song", artists=("Artist",), popularity=50, duration_ms=200000):
+    """Build a track object shaped like the Spotify Web API response."""
+    return {
+        'id': track_id,
+        'name': name,
+        'artists': [{'name': artist} for artist in artists],
+        'album': {'name': 'Album'},
+        'uri': f"spotify:track:{track_id}",
+        'popularity': popularity,
+        'duration_ms': duration_ms,
+        'preview_url': None,
+    }
+
+
+def make_offline_spotify_manager(client, config=None):
+    """Create a SpotifyManager whose API client is replaced by a local fake."""
+    from spotify_manager import SpotifyManager
+    
+    os.environ.setdefault('SPOTIFY_CLIENT_ID', 'test-client-id')
+    os.environ.setdefault('SPOTIFY_CLIENT_SECRET', 'test-client-secret')
+    manager = SpotifyManager(config)
+    manager.sp = client
+    return manager
+
+
+def test_batched_refresh():
+    """Test refreshing cached matches through the several-tracks endpoint."""
+    print("\n♻️  Testing Batched Refresh...")
+    
+    import tempfile
+    from match_cache import MatchCache
+    from models import TrackCandidate
+    
+    class FakeClient:
+        def __init__(self):
+            self.calls = []
+        
+        def tracks(self, ids, market=None):
+            self.calls.append(list(ids))
+            # "gone" tracks have been removed from Spotify
+            return {'tracks': [None if i.startswith('gone') else make_api_track(i, name=f"Fresh {i}") for i in ids]}
+    
+    client = FakeClient()
+    manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0})
+    
+    ids = [f"id{i}" for i in range(118)] + ["gone1", "gone2"]
+    refreshed = manager.refresh_tracks(ids)
+    assert [len(call) for call in client.calls] == [50, 50, 20]
+    assert refreshed['id7'].name == "Fresh id7"
+    assert refreshed['gone1'] is None
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = MatchCache(os.path.join(tmp, 'cache.json'))
+        old = TrackCandidate.from_api(make_api_track('id1', name='Old'))
+        old.relevance_score = 0.8
+        cache.put("Rema - DND", old, video_id='v1')
+        cache.put("Gone - Song", TrackCandidate.from_api(make_api_track('gone1')), video_id='v2')
+        
+        assert cache.merge_refreshed(refreshed) == (1, 1)
+        cache.save()
+        
+        reloaded = MatchCache(cache.path)
+        assert reloaded.get("rema  -  dnd").name == "Fresh id1"
+        assert reloaded.get("anything", video_id='v1').relevance_score == 0.8
+        assert reloaded.get("Gone - Song") is None
+        
+        # Several processes sharing the file: each save merges its own entries instead of overwriting
+        reloaded.put("Asake - Joha", TrackCandidate.from_api(make_api_track('joha')), video_id='v3')
+        cache.put_miss("Nobody - Nothing", video_id='v4')
+        reloaded.save()
+        cache.save()
+        merged = MatchCache(cache.path)
+        assert merged.get("Asake - Joha").id == 'joha' and merged.get_miss("Nobody - Nothing")
+        assert merged.get("Rema - DND").name == "Fresh id1" and cache.get("anything", video_id='v3')
+        assert not [name for name in os.listdir(tmp) if name.endswith('.tmp')]
+    
+    print("✅ Batched Refresh test passed!")
+    return True
+
+
+def test_async_spotify_manager():
+    """Test bounded concurrency of AsyncSpotifyManager without network."""
+    print("\n⚡ Testing Async Spotify Manager...")
+    
+    import asyncio
+    import time
+    
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        print("⚠️  aiohttp not installed, skipping")
+        return True
+    
+    from async_spotify_manager import AsyncSpotifyManager
+    
+    os.environ.setdefault('SPOTIFY_CLIENT_ID', 'test-client-id')
+    os.environ.setdefault('SPOTIFY_CLIENT_SECRET', 'test-client-secret')
+    
+    in_flight = {'now': 0, 'max': 0, 'calls': 0}
+    
+    async def fake_send(method, url, token, params, json):
+        in_flight['now'] += 1
+        in_flight['calls'] += 1
+        first_call = in_flight['calls'] == 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        await asyncio.sleep(0.001)
+        in_flight['now'] -= 1
+        if first_call:
+            return 429, {'Retry-After': '0'}, None
+        query = params['q']
+        track = make_api_track(query, name=query.split(' - ')[-1], artists=(query.split(' - ')[0],), popularity=80)
+        return 200, {}, {'tracks': {'items': [track]}}
+    
+    async def run():
+        async with AsyncSpotifyManager({'relevance_threshold': 0.3}, max_concurrency=4) as spotify:
+            spotify._token_info = {'access_token': 'token', 'expires_at': time.time() + 3600}
+            spotify._send = fake_send
+            items = [([f"Artist{i} - Song{i}"], f"Artist{i} - Song{i}") for i in range(50)]
+            return await spotify.find_best_matches(items)
+    
+    matches = asyncio.run(run())
+    assert len(matches) == 50
+    assert matches[7].name == "Song7"
+    assert in_flight['max'] <= 4
+    assert in_flight['calls'] == 51  # one retry after the 429
+    
+    # Token about to expire or rejected by many requests at once: a single refresh
+    refreshes = []
+    
+    class FakeAuth:
+        class cache_handler:
+            @staticmethod
+            def get_cached_token():
+                return {'access_token': 'old', 'refresh_token': 'r', 'expires_at': time.time() + 30}
+        
+        @staticmethod
+        def refresh_access_token(refresh_token):
+            refreshes.append(refresh_token)
+            return {'access_token': f"new{len(refreshes)}", 'refresh_token': 'r', 'expires_at': time.time() + 3600}
+    
+    async def unauthorized_once(method, url, token, params, json):
+        await asyncio.sleep(0.001)
+        if token == 'stale':
+            return 401, {}, None
+        return 200, {}, {'tracks': {'items': []}}
+    
+    async def refresh_run():
+        async with AsyncSpotifyManager({'token_cache_path': '.other_cache'}) as spotify:
+            assert spotify.token_cache_path == '.other_cache'
+            spotify.auth_manager = FakeAuth()
+            assert await spotify._get_token() == 'new1'  # refreshed ahead of expiry
+            spotify._token_info = {'access_token': 'stale', 'refresh_token': 'r', 'expires_at': time.time() + 3600}
+            spotify._send = unauthorized_once
+            await asyncio.gather(*(spotify.search_track(f"q{i}") for i in range(20)))
+            return spotify._token_info['access_token']
+    
+    assert asyncio.run(refresh_run()) == 'new2' and len(refreshes) == 2
+    
+    print("✅ Async Spotify Manager test passed!")
+    return True
+
+
+def test_local_catalog():
+    """Test offline matching against a memory-mapped catalogue (no network)."""
+    print("\n💾 Testing Local Catalog...")
+    
+    import csv
+    import tempfile
+    from local_catalog import LocalCatalog, LocalCatalogMatcher, build_catalog, match_many
+    from title_cleaner import TitleCleaner
+    
+    rows = [
+        {'id': 'calm', 'name': 'Calm Down', 'artists': 'Rema', 'album': 'Rave & Roses', 'popularity': 85, 'duration_ms': 239000},
+        {'id': 'calmsg', 'name': 'Calm Down (with Selena Gomez)', 'artists': 'Rema;Selena Gomez', 'album': 'Rave & Roses Ultra', 'popularity': 90, 'duration_ms': 239000},
+        {'id': 'joha', 'name': 'Joha', 'artists': 'Asake', 'album': 'Mr. Money', 'popularity': 70, 'duration_ms': 180000},
+        {'id': 'fora', 'name': 'Forévà', 'artists': 'Tayc', 'album': 'Fleur Froide', 'popularity': 60, 'duration_ms': 200000},
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'dump.csv')
+        with open(source, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        
+        path = os.path.join(tmp, 'catalog.bin')
+        assert build_catalog(source, path) == 4
+        
+        catalog = LocalCatalog(path)
+        assert len(catalog) == 4
+        assert catalog.search("track:Joha artist:Asake", 1)[0].id == 'joha'
+        assert catalog.search("tayc foreva", 1)[0].name == 'Forévà'  # accent-insensitive
+        assert catalog.search("unknown words", 5) == []
+        assert catalog.postings('rema') == [0, 1] and catalog.postings('zzz') == []
+        assert catalog.postings('a') == []  # before the first token of the sorted index
+        catalog.close()
+        
+        cleaner = TitleCleaner()
+        matcher = LocalCatalogMatcher(path)
+        title = "Asake - Joha (Official Video)"
+        assert matcher.find_best_match(cleaner.create_search_queries(title), title).id == 'joha'
+        
+        # Large inputs are spread over several processes
+        items = [(["Asake Joha"], "Asake - Joha"), (["Nobody Nothing"], "Nobody - Nothing")] * 150
+        results = match_many(path, items, workers=2)
+        assert results[0].id == 'joha' and results[1] is None and len(results) == 300
+    
+    print("✅ Local Catalog test passed!")
+    return True
+
+
+def test_slotted_records():
+    """Test the slotted pipeline records and guard their memory footprint."""
+    print("\n📦 Testing Slotted Records...")
+    
+    import tracemalloc
+    from models import Video, TrackCandidate
+    
+    count = 10000
+    
+    def build_dicts():
+        return [{
+            'title': f"Artist - Song {i}",
+            'id': f"vid{i:08d}",
+            'duration': 200,
+            'uploader': "Uploader",
+            'url': f"https://www.youtube.com/watch?v=vid{i:08d}"
+        } for i in range(count)]
+    
+    def build_videos():
+        return [Video(f"Artist - Song {i}", f"vid{i:08d}", 200, "Uploader") for i in range(count)]
+    
+    def measure(builder):
+        tracemalloc.start()
+        data = builder()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del data
+        return size
+    
+    dict_size = measure(build_dicts)
+    video_size = measure(build_videos)
+    print(f"10k videos: dicts {dict_size / 1024:.0f} KiB, slotted {video_size / 1024:.0f} KiB")
+    assert video_size < dict_size * 0.6
+    assert not hasattr(Video("t"), '__dict__')
+    
+    # Round trip through the cache format
+    track = TrackCandidate.from_api(make_api_track('abc', artists=("Rema", "Selena Gomez")))
+    assert TrackCandidate.from_dict(track.to_dict()) == track
+    
+    # Candidates returned by several queries are merged by track id
+    class FakeClient:
+        def search(self, q, type, limit):
+            return {'tracks': {'items': [make_api_track('calm', name='Calm Down', artists=('Rema',))]}}
+    
+    manager = make_offline_spotify_manager(FakeClient(), {'rate_limit_delay': 0})
+    candidates = {}
+    for query in ["Rema Calm Down", "Calm Down Rema", "Rema - Calm Down"]:
+        for candidate in manager.search_track(query):
+            candidate.relevance_score = manager._calculate_relevance_score(candidate, "Rema - Calm Down", query)
+            manager._merge_candidate(candidates, candidate)
+    assert list(candidates) == ['calm']
+    assert manager.find_best_match(["Rema Calm Down", "Calm Down Rema"], "Rema - Calm Down").id == 'calm'
+    
+    print("✅ Slotted Records test passed!")
+    return True
+
+
+def test_non_interactive_auth():
+    """Test client-credentials mode and headless token handling without network."""
+    print("\n🔑 Testing Non-Interactive Auth...")
+    
+    import json
+    import tempfile
+    import time
+    from spotify_manager import SpotifyManager
+    
+    os.environ.setdefault('SPOTIFY_CLIENT_ID', 'test-client-id')
+    os.environ.setdefault('SPOTIFY_CLIENT_SECRET', 'test-client-secret')
+    
+    # Search-only runs never touch the user token nor call /me
+    search_only = SpotifyManager(search_only=True)
+    assert search_only.authenticate()
+    assert search_only.create_playlist("Test") is None
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'token_cache')
+        
+        # Headless without a cached token: fail fast instead of waiting for a browser
+        headless = SpotifyManager({'token_cache_path': cache_path}, interactive=False)
+        assert not headless.has_cached_token()
+        headless.start_warm_up()
+        assert headless._warm_up_thread is None
+        assert not headless.authenticate()
+        
+        # A valid cached token is reused and its refresh is scheduled ahead of expiry
+        with open(cache_path, 'w') as f:
+            json.dump({
+                'access_token': 'token', 'refresh_token': 'refresh', 'token_type': 'Bearer',
+                'scope': headless.scope, 'expires_in': 3600, 'expires_at': int(time.time()) + 3600
+            }, f)
+        manager = SpotifyManager({'token_cache_path': cache_path}, interactive=False)
+        assert manager.has_cached_token()
+        manager._refresh_token()
+        assert manager._refresh_timer is not None and manager._refresh_timer.interval > 3000
+        manager.close()
+        assert manager._refresh_timer is None
+    
+    print("✅ Non-Interactive Auth test passed!")
+    return True
+
+
+def test_chunked_playlist_write():
+    """Test per-chunk retry and resume of playlist writes without network."""
+    print("\n🧱 Testing Chunked Playlist Write...")
+    
+    class FlakyClient:
+        def __init__(self, failures):
+            self.failures = failures  # {position: nombre d'échecs restants}
+            self.calls = []
+        
+        def playlist_add_items(self, playlist_id, items, position=None):
+            self.calls.append(('add', position, len(items)))
+            if self.failures.get(position, 0) > 0:
+                self.failures[position] -= 1
+                raise RuntimeError("HTTP 502")
+            return {'snapshot_id': f"snap-{position}"}
+        
+        def playlist_replace_items(self, playlist_id, items):
+            self.calls.append(('replace', 0, len(items)))
+            return {'snapshot_id': "snap-replace"}
+    
+    uris = [f"spotify:track:{i}" for i in range(250)]
+    
+    # A transient failure only retries the failing chunk, at its own position
+    client = FlakyClient({100: 1})
+    manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0, 'retry_delay': 0})
+    result = manager.write_playlist_tracks('pl', uris, offset=0)
+    assert result.success and result.landed_uris == uris
+    assert client.calls == [('add', 0, 100), ('add', 100, 100), ('add', 100, 100), ('add', 200, 50)]
+    assert result.snapshot_id == "snap-200"
+    
+    # A persistent failure stops the write so later positions stay valid, then resumes
+    client = FlakyClient({100: 10})
+    manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0, 'retry_delay': 0, 'max_retries': 2})
+    result = manager.write_playlist_tracks('pl', uris, offset=0)
+    assert not result.success
+    assert result.landed_uris == uris[:100] and result.pending_uris == uris[100:]
+    assert result.chunks[1].attempts == 3 and result.chunks[2].attempts == 0
+    client.failures.clear()
+    client.calls.clear()
+    assert manager.resume_playlist_write(result).success
+    assert client.calls == [('add', 100, 100), ('add', 200, 50)]
+    
+    # Re-runs replace the content with the first chunk instead of appending
+    client = FlakyClient({})
+    manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0})
+    assert manager.add_tracks_to_playlist('pl', uris[:10])
+    result = manager.write_playlist_tracks('pl', uris, replace=True)
+    assert [call[0] for call in client.calls] == ['add', 'replace', 'add', 'add']
+    assert [call[1] for call in client.calls[2:]] == [100, 200]  # explicit positions after the replace
+    assert result.chunks[0].snapshot_id == "snap-replace"
+    
+    # Without an offset, tracks go after the existing ones instead of at the top
+    class PlaylistClient:
+        def __init__(self, items):
+            self.items = list(items)
+        
+        def playlist_add_items(self, playlist_id, items, position=None):
+            if position is None:
+                self.items.extend(items)
+            else:
+                self.items[position:position] = items
+            return {'snapshot_id': f"snap-{len(self.items)}"}
+    
+    client = PlaylistClient(["spotify:track:old1", "spotify:track:old2"])
+    manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0})
+    assert manager.add_tracks_to_playlist('pl', uris[:150])
+    assert client.items == ["spotify:track:old1", "spotify:track:old2"] + uris[:150]
+    assert manager.write_playlist_tracks('pl', uris[150:160], offset=1).success
+    assert client.items[1:11] == uris[150:160]
+    
+    print("✅ Chunked Playlist Write test passed!")
+    return True
+
+
+def test_negative_cache():
+    """Test the negative cache re-check schedule and persistence."""
+    print("\n🚫 Testing Negative Cache...")
+    
+    import tempfile
+    from match_cache import MatchCache
+    from models import TrackCandidate
+    
+    config = {'negative_ttl': 100, 'negative_backoff': 2.0, 'negative_max_ttl': 350}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = MatchCache(os.path.join(tmp, 'cache.json'), config)
+        title = "DJ Edit - Unreleased Freestyle"
+        
+        assert cache.get_miss(title, now=0) is None
+        assert cache.put_miss(title, video_id='v1', now=0)['retry_at'] == 100
+        assert cache.get_miss("dj edit  -  unreleased freestyle", now=50)['misses'] == 1
+        assert cache.get_miss("Renamed video", video_id='v1', now=50) is not None
+        assert cache.get_miss(title, now=100) is None  # due for a re-check
+        
+        # Each new miss doubles the delay, up to the maximum
+        assert cache.put_miss(title, now=100)['retry_at'] == 300
+        assert cache.put_miss(title, now=300)['retry_at'] == 650
+        assert cache.put_miss(title, now=650)['retry_at'] == 1000
+        cache.save()
+        
+        reloaded = MatchCache(cache.path, config)
+        assert reloaded.get_miss(title, now=999)['misses'] == 4
+        
+        # A later match clears the miss
+        reloaded.put(title, TrackCandidate.from_api(make_api_track('found')))
+        assert reloaded.get_miss(title, now=999) is None
+        assert reloaded.get(title).id == 'found'
+    
+    print("✅ Negative Cache test passed!")
+    return True
+
+
+def test_query_planner():
+    """Test that equivalent queries are sent once and candidates merged by id."""
+    print("\n🧮 Testing Query Planner...")
+    
+    from query_planner import plan_queries, query_signature
+    
+    assert query_signature("Rema Calm Down") == query_signature("calm down - REMA")
+    assert query_signature("Forévà Tayc") == query_signature("tayc foreva")
+    assert query_signature("track:Joha artist:Asake") == query_signature("artist:asake track:joha")
+    assert query_signature("track:Joha artist:Asake") != query_signature("Joha Asake")
+    assert query_signature('"DND"') != query_signature("DND Rema")
+    
+    plan = plan_queries(["Rema DND", "DND Rema", "track:DND artist:Rema", "DND", '"DND"', "rema - dnd"])
+    assert plan.queries == ["Rema DND", "track:DND artist:Rema", "DND", '"DND"']
+    assert plan.saved_requests == 2 and plan.eliminated["DND Rema"] == "Rema DND"
+    
+    class FakeClient:
+        def __init__(self):
+            self.queries = []
+        
+        def search(self, q, type, limit):
+            self.queries.append(q)
+            return {'tracks': {'items': [
+                make_api_track('dnd', name='DND', artists=('Rema',), popularity=70),
+                make_api_track('dnd-live', name='DND', artists=('Rema', 'Someone'), popularity=40),
+            ]}}
+    
+    client = FakeClient()
+    manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0})
+    plans = []
+    top = manager.find_top_matches(["Rema DND", "DND Rema", "dnd rema", "track:DND artist:Rema"], "Rema - DND",
+                                   k=2, plans=plans)
+    assert client.queries == ["Rema DND", "track:DND artist:Rema"]
+    assert [track.id for track in top] == ['dnd', 'dnd-live']
+    assert len(plans) == 1 and plans[0].saved_requests == 2
+    assert not hasattr(manager, 'last_query_plan')  # no plan shared between threads
+    
+    print("✅ Query Planner test passed!")
+    return True
+
+
+def test_playlist_sync():
+    """Test incremental watch-mode syncs with a shared pipeline (no network)."""
+    print("\n🔁 Testing Playlist Sync...")
+    
+    import tempfile
+    from config.settings import load_config
+    from models import Video
+    from playlist_sync import PlaylistWatcher, SyncPair, SyncState
+    from transfer_pipeline import TransferPipeline
+    
+    class FakeClient:
+        def __init__(self):
+            self.playlist = []
+            self.created = 0
+        
+        def search(self, q, type, limit):
+            items = [make_api_track(name.split()[0].lower(), name=name, artists=('Rema',), popularity=80)
+                     for name in ('Calm Down', 'Dumebi') if name.lower() in q.lower()]
+            return {'tracks': {'items': items}}
+        
+        def current_user(self):
+            return {'id': 'me', 'display_name': 'Me'}
+        
+        def user_playlist_create(self, user, name, public, description):
+            self.created += 1
+            return {'id': 'pl'}
+        
+        def playlist_items(self, playlist_id, fields, limit):
+            return {'total': len(self.playlist)}
+        
+        def playlist_add_items(self, playlist_id, items, position=None):
+            assert position == len(self.playlist)
+            self.playlist.extend(items)
+            return {'snapshot_id': str(len(self.playlist))}
+    
+    client = FakeClient()
+    config = load_config('fast')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0, 'token_cache_path': os.path.join(tmp, 'token')})
+        pipeline = TransferPipeline(config, cache_path=os.path.join(tmp, 'cache.json'), spotify_manager=manager)
+        pipeline._authenticated = True
+        manager.user_id = 'me'
+        
+        videos = [Video("Rema - Calm Down", 'v1'), Video("Rema - Unreleased", 'v2')]
+        pipeline.youtube_extractor.extract_videos = lambda url: list(videos)
+        
+        pair = SyncPair("https://youtube.com/playlist?list=PL1", name="Rema", interval=0.05)
+        watcher = PlaylistWatcher(pipeline, [pair], SyncState(os.path.join(tmp, 'state.json')), jitter=0)
+        
+        assert watcher.sync_once(pair) == 1
+        assert client.playlist == ['spotify:track:calm'] and client.created == 1
+        
+        # Only the new video is searched and appended; nothing new means no Spotify call
+        videos.append(Video("Rema - Dumebi", 'v3'))
+        assert watcher.sync_once(pair) == 1
+        assert client.playlist[-1] == 'spotify:track:dumebi' and client.created == 1
+        assert watcher.sync_once(pair) == 0
+        assert SyncState(watcher.state.path).entry(pair.youtube_url)['seen'] == ['v1', 'v3']
+        
+        # Entries are snapshots: changes only go through update(), under the lock
+        snapshot = watcher.state.entry(pair.youtube_url)
+        snapshot['seen'].append('ghost')
+        assert watcher.state.entry(pair.youtube_url)['seen'] == ['v1', 'v3']
+        watcher.state.update(pair.youtube_url, lambda entry: entry['seen'].append('v4'))
+        assert watcher.state.entry(pair.youtube_url)['seen'][-1] == 'v4'
+        
+        # Failures are retried with backoff instead of stopping the watcher
+        calls = {'n': 0}
+        
+        def flaky_extract(url):
+            calls['n'] += 1
+            if calls['n'] == 1:
+                raise OSError("network down")
+            return list(videos)
+        
+        pipeline.youtube_extractor.extract_videos = flaky_extract
+        watcher.retry_delay = 0.01
+        watcher.run(duration=0.3)
+        assert calls['n'] >= 2 and watcher.failures[pair.youtube_url] == 0
+    
+    print("✅ Playlist Sync test passed!")
+    return True
+
+
+def test_job_service():
+    """Test the local HTTP job service end to end (fake pipeline, real sockets)."""
+    print("\n🌐 Testing Job Service...")
+    
+    import json
+    import threading
+    import time
+    import urllib.error
+    import urllib.request
+    from job_service import JobService, make_server
+    
+    class FakePipeline:
+        config = {'profile': 'fast'}
+        
+        def __init__(self):
+            self.calls = []
+        
+        def run(self, youtube_url, report, **options):
+            self.calls.append((youtube_url, options))
+            report.playlist_name = options.get('name', 'Auto')
+            report.total_youtube_videos = 3
+            return (1 if 'broken' in youtube_url else 0), report
+    
+    pipeline = FakePipeline()
+    service = JobService(pipeline, workers=2)
+    service.start()
+    server, port = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{port}"
+    
+    def request(path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        try:
+            with urllib.request.urlopen(urllib.request.Request(base + path, data=data), timeout=5) as response:
+                return response.status, response.read().decode()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode()
+    
+    def wait_finished(job_id):
+        for _ in range(200):
+            job = json.loads(request(f"/jobs/{job_id}")[1])
+            if job['status'] in ('done', 'failed'):
+                return job
+            time.sleep(0.01)
+        raise AssertionError("job did not finish")
+    
+    try:
+        assert json.loads(request("/health")[1])['workers_alive'] == 2 == service.alive_workers()
+        
+        status, body = request("/jobs", {'youtube': "https://youtube.com/playlist?list=A", 'name': "Mix"})
+        assert status == 202
+        job = wait_finished(json.loads(body)['id'])
+        assert job['status'] == 'done' and job['summary']['playlist_name'] == "Mix"
+        assert pipeline.calls[0] == ("https://youtube.com/playlist?list=A", {'name': "Mix"})
+        
+        status, report = request(f"/jobs/{job['id']}/report")
+        assert status == 200 and "Playlist: Mix" in report
+        
+        failed = wait_finished(json.loads(request("/jobs", {'youtube': "broken"})[1])['id'])
+        assert failed['status'] == 'failed' and failed['exit_code'] == 1
+        
+        assert request("/jobs", {'youtube': "x", 'unknown': 1})[0] == 400
+        assert request("/jobs", {'youtube': "x", 'report': "overwrite"})[0] == 400  # run() argument, not an option
+        assert request("/jobs", {'youtube': "x", 'private': "yes"})[0] == 400
+        assert request("/jobs", {'youtube': "x", 'max_tracks': True})[0] == 400
+        assert request("/jobs", {'youtube': "x", 'max_tracks': -1})[0] == 400
+        assert request("/jobs", ["not", "an", "object"])[0] == 400
+        assert request("/jobs", {'name': "no url"})[0] == 400
+        assert request("/jobs/ffffff")[0] == 404
+        
+        metrics = json.loads(request("/metrics")[1])
+        assert metrics['completed'] == 1 and metrics['failed'] == 1 and metrics['queue_depth'] == 0
+        assert metrics['run_seconds']['p95'] >= 0
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+    
+    print("✅ Job Service test passed!")
+    return True
+
+
+def test_job_queue():
+    """Test leases, visibility timeouts and retries of the SQLite job queue."""
+    print("\n🗃️  Testing Job Queue...")
+    
+    import tempfile
+    import time
+    from job_queue import JobQueue, run_worker
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jobs.db')
+        queue_a = JobQueue(path, retry_delay=0)
+        queue_b = JobQueue(path, retry_delay=0)  # second worker, own connection
+        
+        first = queue_a.enqueue("https://youtube.com/playlist?list=A", {'name': "A"})
+        second = queue_a.enqueue("https://youtube.com/playlist?list=B", max_attempts=2)
+        
+        # Two workers never lease the same job
+        job_a = queue_a.lease('a', visibility_timeout=60)
+        job_b = queue_b.lease('b', visibility_timeout=0.05)
+        assert {job_a.id, job_b.id} == {first, second} and job_a.options == {'name': "A"}
+        assert queue_b.lease('b') is None
+        
+        # An expired lease becomes visible again; the stale owner can no longer complete it
+        time.sleep(0.06)
+        retried = queue_a.lease('c', visibility_timeout=60)
+        assert retried.id == second and retried.attempts == 2
+        assert not queue_b.complete(second, 'b', 0)
+        
+        # Out of attempts: the failure is final
+        assert queue_a.fail(second, 'c', "HTTP 502")
+        assert queue_a.get(second)['status'] == 'failed'
+        
+        assert queue_a.heartbeat(first, 'a') and not queue_a.heartbeat(first, 'b')
+        assert queue_a.complete(first, 'a', 0, {'found': 3}, "report")
+        assert queue_b.get(first)['result'] == {'found': 3}
+        assert queue_b.stats() == {'done': 1, 'failed': 1}
+        
+        # The worker loop drains the queue with the existing pipeline and retries errors
+        class FakePipeline:
+            def __init__(self):
+                self.runs = 0
+            
+            def run(self, youtube_url, report, **options):
+                self.runs += 1
+                if self.runs == 1:
+                    raise OSError("network down")
+                report.playlist_name = youtube_url
+                return 0, report
+        
+        for i in range(3):
+            queue_a.enqueue(f"url{i}")
+        pipeline = FakePipeline()
+        assert run_worker(queue_b, pipeline, 'w', exit_when_empty=True) == 4
+        assert pipeline.runs == 4 and queue_b.stats()['done'] == 4
+        
+        # A transfer that ends with exit code 1 (nothing found, invalid URL) is failed, not done
+        partial = queue_a.enqueue("partial")
+        queue_a.lease('a', visibility_timeout=60)
+        assert queue_a.complete(partial, 'a', 2)
+        assert queue_a.get(partial)['status'] == 'done'
+        broken = queue_a.enqueue("broken")
+        queue_a.lease('a', visibility_timeout=60)
+        assert queue_a.complete(broken, 'a', 1, {'found': 0}, "report")
+        job = queue_a.get(broken)
+        assert job['status'] == 'failed' and job['exit_code'] == 1 and job['report'] == "report"
+        
+        # Lease taken over while the transfer runs: the stale worker drops its result
+        class SlowPipeline:
+            def run(self, youtube_url, report, **options):
+                with queue_a._lock:
+                    queue_a._db.execute("UPDATE jobs SET lease_owner = 'thief', lease_expires = ? WHERE youtube = 'stolen'", (time.time() + 60,))
+                time.sleep(0.1)
+                return 0, report
+        
+        stolen = queue_a.enqueue("stolen")
+        assert run_worker(queue_b, SlowPipeline(), 'w', visibility_timeout=0.09, exit_when_empty=True) == 1
+        job = queue_a.get(stolen)
+        assert job['status'] == 'leased' and job['lease_owner'] == 'thief' and job['result'] is None
+        
+        queue_a.close()
+        queue_b.close()
+    
+    print("✅ Job Queue test passed!")
+    return True
+
+
+def test_run_profiler():
+    """Test per-stage profiling output and the disabled fast path."""
+    print("\n🔬 Testing Run Profiler...")
+    
+    import contextlib
+    import pstats
+    import tempfile
+    from run_profiler import RunProfiler, stage_context
+    from title_cleaner import TitleCleaner
+    
+    # Disabled: a plain nullcontext, nothing is profiled
+    assert isinstance(stage_context(None, 'match'), contextlib.nullcontext)
+    
+    cleaner = TitleCleaner()
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RunProfiler(tmp, memory=True)
+        with stage_context(profiler, 'clean'):
+            for i in range(200):
+                cleaner.create_search_queries(f"Burna Boy - Last Last {i} (Official Video) #afrobeats")
+        with stage_context(profiler, 'idle'):
+            pass
+        
+        clean = profiler.stages[0]
+        assert [stage.name for stage in profiler.stages] == ['clean', 'idle']
+        assert os.path.basename(clean.files[0]) == '01_clean.pstats'
+        assert pstats.Stats(clean.files[0]).total_calls > 0
+        
+        with open(clean.files[1], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+        assert any('create_search_queries' in line for line in lines)
+        
+        assert clean.hotspots and clean.components.get('cleaning', 0) > 0
+        assert clean.memory_peak and clean.memory_peak > 0
+        assert any(line.startswith('[clean]') for line in profiler.summary_lines())
+    
+    print("✅ Run Profiler test passed!")
+    return True
+
+
+def test_cassette():
+    """Test recording responses into a cassette and replaying them offline."""
+    print("\n📼 Testing Cassette Record/Replay...")
+    
+    import tempfile
+    import time
+    from cassette import Cassette, CassetteMiss, RecordedError
+    from spotify_manager import SpotifyManager
+    from youtube_extractor import YouTubeExtractor
+    
+    class FakeClient:
+        def current_user(self):
+            return {'id': 'me', 'display_name': 'Me'}
+        
+        def search(self, q, type='track', limit=10):
+            if q == 'boom':
+                raise RuntimeError("rate limited")
+            return {'tracks': {'items': [make_api_track('calm', 'Calm Down', ('Rema',))]}}
+    
+    def fake_extract(url):
+        return {'title': 'Mix', 'id': 'PL1', 'entries': [{'id': 'v1', 'title': 'Rema - Calm Down'}]}
+    
+    url = 'https://www.youtube.com/playlist?list=PL1'
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.cassette.gz')
+        
+        # Enregistrement à travers les points d'entrée du manager et de l'extracteur
+        recorder = Cassette(path, 'record')
+        manager = make_offline_spotify_manager(None)
+        manager.sp = recorder.wrap('spotify', FakeClient())
+        extractor = YouTubeExtractor(info_extractor=recorder.wrap_function('youtube', 'extract_info', fake_extract))
+        recorded_info = extractor.extract_playlist_info(url)
+        assert manager.sp.current_user()['id'] == 'me'
+        recorded_tracks = manager.search_track('Calm Down Rema')
+        try:
+            manager.sp.search(q='boom', type='track', limit=10)
+            assert False, "recorded call should raise"
+        except RuntimeError:
+            pass
+        manager.close()
+        recorder.save()
+        assert len(recorder) == 4
+        
+        # Relecture sans client réel ni identifiants
+        player = Cassette(path)
+        assert len(player) == 4
+        extractor = YouTubeExtractor(info_extractor=player.wrap_function('youtube', 'extract_info'))
+        manager = SpotifyManager(client=player.wrap('spotify'))
+        assert extractor.extract_playlist_info(url) == recorded_info
+        assert manager.authenticate() and manager.user_id == 'me'
+        assert manager.search_track('Calm Down Rema') == recorded_tracks
+        # Appel répété plus souvent qu'à l'enregistrement: dernière réponse connue
+        assert manager.search_track('Calm Down Rema') == recorded_tracks
+        try:
+            manager.sp.search(q='boom', type='track', limit=10)
+            assert False, "recorded error should be replayed"
+        except RecordedError as e:
+            assert 'rate limited' in str(e)
+        
+        # Appel absent: réponse vide comptée, ou erreur en mode strict
+        import contextlib
+        import io
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            assert manager.sp.search(q='Unknown', type='track', limit=10) is None
+        assert player.misses == 1 and player.replayed == 5
+        assert "spotify.search" in output.getvalue() and "Unknown" in output.getvalue()  # key logged
+        try:
+            Cassette(path, strict=True).wrap('spotify').search(q='Unknown', type='track', limit=10)
+            assert False, "strict replay should raise"
+        except CassetteMiss:
+            pass
+        
+        # Relecture au temps d'origine divisé par speed
+        scaled = Cassette(path, speed=1000.0)
+        for interactions in scaled._interactions.values():
+            for interaction in interactions:
+                interaction['elapsed'] = 50.0
+        start = time.perf_counter()
+        scaled.wrap_function('youtube', 'extract_info')(url)
+        assert 0.04 <= time.perf_counter() - start < 1.0
+        
+        # Recherches réparties sur un pool de credentials: enregistrées, puis rejouées sans pool
+        from credential_pool import CredentialPool
+        pooled_path = os.path.join(tmp, 'pooled.cassette.gz')
+        recorder = Cassette(pooled_path, 'record')
+        manager = make_offline_spotify_manager(None)
+        manager.sp = FakeClient()
+        manager.search_pool = CredentialPool([('app-one', 's1')], client_factory=lambda client_id, secret: FakeClient())
+        recorder.record_spotify(manager)
+        recorded_tracks = manager.search_track('Calm Down Rema')
+        assert recorded_tracks and manager.credential_stats()['#1 app-on…']['requests'] == 1
+        manager.close()
+        recorder.save()
+        assert [interaction['call'] for interaction in recorder.recorded] == ['search']
+        
+        manager = SpotifyManager(client=Cassette(pooled_path, strict=True).wrap('spotify'))
+        assert manager.search_pool is None
+        assert manager.search_track('Calm Down Rema') == recorded_tracks
+    
+    print("✅ Cassette test passed!")
+    return True
+
+
+def test_incremental_naming():
+    """Test that the streaming naming analyzer matches a full re-analysis at every step."""
+    print("\n🧠 Testing Incremental Naming Analyzer...")
+    
+    import random
+    from collections import Counter
+    from playlist_naming import PlaylistNamingEngine
+    
+    engine = PlaylistNamingEngine()
+    artists = ['Rema', 'Asake', 'Burna Boy', 'Tayc', 'Wizkid', 'Omah Lay', 'Ayra Starr']
+    songs = ['Calm Down', 'Joha (Live)', 'Last Last [Afrobeats Remix]', 'Love Vibe', 'Drill Freestyle', 'Hit Mix']
+    rng = random.Random(7)
+    titles = [f"{rng.choice(artists)} - {rng.choice(songs)}" for _ in range(60)] + ["Untitled"]
+    
+    analyzer = engine.incremental_analyzer()
+    assert analyzer.identity()[0] == "Mix Playlist"
+    for count, title in enumerate(titles, 1):
+        analyzer.add_title(title)
+        if count % 10 and count != len(titles):
+            continue
+        # Référence: analyse complète, comme l'ancien passage de fin de transfert
+        seen = titles[:count]
+        hits = engine.keyword_matcher.distinct_keywords('\n'.join(seen))
+        current = analyzer.analysis()
+        assert current['track_count'] == count
+        assert current['top_artists'] == Counter(current['artists']).most_common(5)
+        assert dict(current['genres']) == {
+            label.split(':', 1)[1]: score for label, score in hits.items() if label.startswith('genre:')
+        }
+        assert set(current['contexts']) == {
+            label.split(':', 1)[1] for label in hits if label.startswith('context:')
+        }
+    
+    assert engine.analyze_tracks(titles) == analyzer.analysis()
+    name, description = analyzer.identity()
+    assert name and description
+    
+    print("✅ Incremental Naming Analyzer test passed!")
+    return True
+
+
+def test_credential_pool():
+    """Test spreading searches across several app credentials with 429 back-off."""
+    print("\n🔑 Testing Credential Pool...")
+    
+    import spotipy
+    from credential_pool import CredentialPool, parse_credentials
+    
+    assert parse_credentials(" a:1, b:2 ,") == [('a', '1'), ('b', '2')]
+    try:
+        parse_credentials("missing-secret")
+        assert False, "invalid entry should be rejected"
+    except ValueError:
+        pass
+    
+    class FakeSearchClient:
+        def __init__(self, client_id):
+            self.client_id = client_id
+            self.calls = 0
+            self.limited = 0
+        
+        def search(self, q, type='track', limit=10):
+            self.calls += 1
+            if self.limited:
+                self.limited -= 1
+                raise spotipy.SpotifyException(429, -1, "rate limited", headers={'Retry-After': '60'})
+            return {'tracks': {'items': [make_api_track(f"{self.client_id}-{self.calls}")]}}
+    
+    class UserClient:
+        def __init__(self):
+            self.writes = []
+        
+        def search(self, **kwargs):
+            raise AssertionError("searches must go through the pool")
+        
+        def playlist_add_items(self, playlist_id, uris, position=None):
+            self.writes.append(uris)
+            return {'snapshot_id': 'snap'}
+    
+    clients = {}
+    pool = CredentialPool(
+        [('app-one', 's1'), ('app-two', 's2'), ('app-three', 's3')],
+        client_factory=lambda client_id, secret: clients.setdefault(client_id, FakeSearchClient(client_id))
+    )
+    manager = make_offline_spotify_manager(UserClient())
+    manager.search_pool = pool
+    
+    # Répartition: le moins chargé d'abord
+    for i in range(6):
+        assert manager.search_track(f"song {i}")
+    assert [client.calls for client in clients.values()] == [2, 2, 2]
+    
+    # 429: le credential est mis en pause, la recherche est relancée sur un autre
+    clients['app-one'].limited = 1
+    for i in range(6):
+        assert manager.search_track(f"again {i}")
+    stats = manager.credential_stats()
+    first = stats['#1 app-on…']
+    assert first['rate_limited'] == 1 and first['requests'] == 3
+    assert sum(usage['requests'] for usage in stats.values()) == 13
+    assert pool.credentials[0].backoff_until > 0 and all(c.in_flight == 0 for c in pool.credentials)
+    
+    # Les écritures restent sur le client de l'utilisateur
+    assert manager.write_playlist_tracks('pl', ['spotify:track:x']).success
+    assert manager.sp.writes == [['spotify:track:x']]
+    
+    print("✅ Credential Pool test passed!")
+    return True
+
+
+def test_duration_pruning():
+    """Test duration agreement: wrong versions penalised (pruned on opt-in), confident matches stop the search."""
+    print("\n⏱️  Testing Duration-Aware Matching...")
+    
+    class FakeClient:
+        def __init__(self):
+            self.queries = []
+        
+        def search(self, q, type='track', limit=10):
+            self.queries.append(q)
+            return {'tracks': {'items': [
+                make_api_track('extended', 'Calm Down', ('Rema',), popularity=90, duration_ms=420000),
+                make_api_track('snippet', 'Calm Down', ('Rema',), popularity=90, duration_ms=30000),
+                make_api_track('album', 'Calm Down', ('Rema',), popularity=60, duration_ms=239000),
+            ]}}
+    
+    client = FakeClient()
+    manager = make_offline_spotify_manager(client)
+    queries = ["Rema Calm Down", "track:Calm Down artist:Rema", "Calm Down"]
+    
+    # Par défaut: la durée ne fait que pénaliser les mauvaises versions, aucune n'est écartée
+    plans = []
+    best = manager.find_best_match(queries, "Rema - Calm Down (Official Music Video)", duration=241, plans=plans)
+    assert best.id == 'album' and client.queries == ["Rema Calm Down"]
+    assert plans[0].pruned_candidates == 0
+    
+    # Clip plus long que la piste (scènes, générique): 6:00 pour 3:30 reste un bon candidat
+    clip_track = manager._track_to_info(make_api_track('single', 'Calm Down', ('Rema',), duration_ms=210000))
+    assert 0 < manager._duration_agreement(clip_track, 360) < 0.5
+    assert manager._duration_agreement(clip_track, 60) < 0  # l'inverse reste une autre version
+    
+    # duration_prune (profil fast): versions longues et extraits écartés, arrêt après la première requête
+    client.queries.clear()
+    manager = make_offline_spotify_manager(client, {'duration_prune': True})
+    plans = []
+    best = manager.find_best_match(queries, "Rema - Calm Down (Official Music Video)", duration=241, plans=plans)
+    plan = plans[0]
+    assert best.id == 'album'
+    assert client.queries == ["Rema Calm Down"]
+    assert plan.pruned_candidates == 2 and plan.skipped == queries[1:] and plan.sent == 1
+    
+    # Accord de durée dans le score: une durée proche vaut mieux qu'une durée à la limite
+    track = best
+    close = manager._calculate_relevance_score(track, "Rema - Calm Down", "q", duration=239)
+    far = manager._calculate_relevance_score(track, "Rema - Calm Down", "q", duration=200)
+    assert close > far
+    assert manager._duration_agreement(track, None) is None
+    
+    # Durée inconnue: comportement inchangé, toutes les requêtes sont envoyées
+    client.queries.clear()
+    plans = []
+    best = manager.find_best_match(queries, "Rema - Calm Down", plans=plans)
+    assert best.id == 'extended' and len(client.queries) == 3
+    assert plans[0].pruned_candidates == 0
+    
+    # Rapport
+    from transfer_pipeline import PlaylistTransferReport
+    report = PlaylistTransferReport()
+    report.add_query_plan("Rema - Calm Down", plan)
+    assert report.queries_sent == 1 and report.skipped_queries == 2 and report.pruned_candidates == 2
+    assert "Duration pruning: 2 candidates rejected" in report.to_text()
+    
+    print("✅ Duration-Aware Matching test passed!")
+    return True
+
+
+def test_structured_sources():
+    """Test the Topic/VEVO fast path: pre-split artist/track and a single filtered query."""
+    print("\n🎼 Testing Structured Source Fast Path...")
+    
+    from config.settings import load_config
+    from transfer_pipeline import PlaylistTransferReport, TransferPipeline
+    from youtube_extractor import YouTubeExtractor
+    
+    split = YouTubeExtractor.split_structured
+    assert split("Essence (feat. Tems)", "Wizkid - Topic") == ("Wizkid", "Essence (feat. Tems)")
+    assert split("Burna Boy - Last Last (Official Music Video)", "BurnaBoyVEVO") == ("Burna Boy", "Last Last (Official Music Video)")
+    assert split("Last Last - Burna Boy", "BurnaBoyVEVO") is None  # artiste de la chaîne absent en tête
+    assert split("Rema - Calm Down", "Afro Hits Daily") is None
+    assert split("Calm Down", None) is None
+    
+    entries = [
+        {'title': 'Essence (feat. Tems)', 'id': 'v1', 'duration': 249, 'channel': 'Wizkid - Topic'},
+        {'title': 'Rema & Selena Gomez - Calm Down (Official Music Video)', 'id': 'v2', 'duration': 240, 'uploader': 'RemaVEVO'},
+        {'title': 'Unknown Upload', 'id': 'v3', 'duration': 200, 'uploader': 'Someone'},
+    ]
+    extractor = YouTubeExtractor(info_extractor=lambda url: {'title': 'Mix', 'entries': entries})
+    videos = extractor.extract_videos('https://www.youtube.com/playlist?list=PL1')
+    assert [(video.artist, video.track) for video in videos] == [
+        ('Wizkid', 'Essence (feat. Tems)'),
+        ('Rema & Selena Gomez', 'Calm Down (Official Music Video)'),
+        (None, None),
+    ]
+    
+    # Vidéo sans titre (cassettes anciennes: clé présente mais à None)
+    untitled = YouTubeExtractor(info_extractor=lambda url: {'entries': [{'title': None, 'id': 'v4', 'duration': 200}, {'id': 'v5'}]})
+    assert [video.title for video in untitled.extract_videos('https://www.youtube.com/playlist?list=PL2')] == ['Titre inconnu'] * 2
+    
+    class FakeClient:
+        def __init__(self):
+            self.queries = []
+        
+        def search(self, q, type='track', limit=10):
+            self.queries.append(q)
+            tracks = {
+                'track:Essence artist:Wizkid': make_api_track('essence', 'Essence (feat. Tems)', ('Wizkid', 'Tems'), duration_ms=248000),
+                'track:Calm Down artist:Rema': make_api_track('calm', 'Calm Down (with Selena Gomez)', ('Rema', 'Selena Gomez'), duration_ms=239000),
+            }
+            return {'tracks': {'items': [tracks[q]] if q in tracks else []}}
+    
+    client = FakeClient()
+    manager = make_offline_spotify_manager(client, {'rate_limit_delay': 0})
+    pipeline = TransferPipeline(load_config('balanced'), spotify_manager=manager, youtube_extractor=extractor)
+    report = PlaylistTransferReport()
+    matches = pipeline.match_videos(videos, report)
+    
+    # Une requête par vidéo structurée; la vidéo ordinaire garde ses variantes
+    assert [track.id if track else None for track in matches] == ['essence', 'calm', None]
+    assert client.queries[:2] == ['track:Essence artist:Wizkid', 'track:Calm Down artist:Rema']
+    assert report.structured_lookups == 2
+    
+    print("✅ Structured Source Fast Path test passed!")
+    return True
+
+
+def test_cost_estimator():
+    """Test the dry-run estimate: local caches, planned queries, history calibration."""
+    print("\n🔮 Testing Cost Estimator...")
+    
+    import tempfile
+    from config.settings import load_config
+    from cost_estimator import RunStats, estimate_transfer
+    from match_cache import MatchCache
+    from models import TrackCandidate, Video
+    from transfer_pipeline import PlaylistTransferReport
+    
+    config = load_config('balanced')
+    videos = [
+        Video("Rema - Calm Down (Official Video)", 'v1', 240),
+        Video("Asake - Joha", 'v2', 180),
+        Video("Essence", 'v3', 249, 'Wizkid - Topic', 'Wizkid', 'Essence'),
+        Video("Unknown Artist - Lost Song", 'v4', 200),
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = MatchCache(os.path.join(tmp, 'cache.json'))
+        cache.put(videos[0].title, TrackCandidate.from_api(make_api_track('calm')), 'v1')
+        cache.put_miss(videos[3].title, 'v4')
+        
+        # Sans historique: valeurs par défaut, aucun appel réseau
+        estimate = estimate_transfer(videos, config, match_cache=cache)
+        assert (estimate.cached, estimate.known_misses, estimate.to_search) == (1, 1, 2)
+        assert estimate.search_calls == estimate.planned_queries > 0
+        assert estimate.other_calls == 1 + 3 + 1  # rafraîchissement, playlist, une écriture
+        assert not estimate.calibrated and estimate.sequential_seconds > 0
+        assert estimate.concurrent_seconds <= estimate.sequential_seconds
+        assert any("Risque de 429" in line for line in estimate.lines())
+        
+        # Historique: une recherche sur deux envoyée, 1s par requête
+        stats_path = os.path.join(tmp, 'stats.json')
+        report = PlaylistTransferReport()
+        report.searched_videos, report.found_searched = 10, 5
+        report.queries_sent, report.skipped_queries, report.search_seconds = 20, 20, 20.0
+        RunStats(stats_path).record(report)
+        stats = RunStats(stats_path)
+        assert stats.sent_ratio == 0.5 and stats.hit_rate == 0.5 and stats.seconds_per_query() == 1.0
+        
+        calibrated = estimate_transfer(videos, config, match_cache=cache, stats=stats, publish=False)
+        assert calibrated.calibrated and calibrated.other_calls == 1
+        assert calibrated.search_calls == round(calibrated.planned_queries * 0.5)
+        assert calibrated.sequential_seconds == calibrated.total_calls * 1.0
+    
+    print("✅ Cost Estimator test passed!")
+    return True
+
+
+def test_token_manager():
+    """Test the multi-user token store: background refresh ahead of expiry, one refresher per token."""
+    print("\n🔑 Testing Token Manager...")
+    
+    import json
+    import tempfile
+    import time
+    from token_manager import StoreCacheHandler, TokenManager, TokenStore
+    
+    class FakeOAuth:
+        def __init__(self, store, user_key, fail=False):
+            self.cache_handler = StoreCacheHandler(store, user_key)
+            self.fail = fail
+            self.refreshes = 0
+        
+        def refresh_access_token(self, refresh_token):
+            if self.fail:
+                raise RuntimeError("invalid_grant")
+            self.refreshes += 1
+            token_info = {'access_token': f"new-{refresh_token}", 'refresh_token': refresh_token,
+                          'expires_at': int(time.time()) + 3600}
+            self.cache_handler.save_token_to_cache(token_info)
+            return token_info
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tokens.db")
+        store = TokenStore(path)
+        now = int(time.time())
+        store.save('alice', {'access_token': 'a', 'refresh_token': 'ra', 'expires_at': now + 100})
+        store.save('bob', {'access_token': 'b', 'refresh_token': 'rb', 'expires_at': now + 3600})
+        assert store.users() == ['alice', 'bob']
+        assert store.due(now + 300) == ['alice']
+        
+        auth = {}
+        tokens = TokenManager(store, refresh_margin=300, client_id='id', client_secret='secret',
+                              auth_factory=lambda user: auth.setdefault(user, FakeOAuth(store, user)))
+        
+        # Un autre processus rafraîchit déjà ce token: pas de second rafraîchissement
+        other = TokenStore(path)
+        assert other.claim_refresh('alice', 'other-host:1')
+        assert store.due(now + 300) == []
+        assert tokens.refresh_due() == 0
+        other.release_refresh('alice', 'other-host:1')
+        other.close()
+        
+        # Rafraîchissement anticipé, une seule fois
+        assert tokens.refresh_due() == 1
+        assert store.get('alice')['access_token'] == 'new-ra'
+        assert store.get('alice')['expires_at'] > now + 3000
+        assert tokens.refresh_due() == 0 and auth['alice'].refreshes == 1
+        
+        # Échec: erreur gardée, réservation libérée
+        store.save('carol', {'access_token': 'c', 'refresh_token': 'rc', 'expires_at': now - 10})
+        auth['carol'] = FakeOAuth(store, 'carol', fail=True)
+        assert tokens.refresh_due() == 0
+        assert 'invalid_grant' in tokens.failures['carol'] and store.due(now + 300) == ['carol']
+        
+        # Le thread d'arrière-plan rafraîchit sans appel du transfert
+        store.save('alice', {'access_token': 'old', 'refresh_token': 'ra', 'expires_at': now + 10})
+        tokens.interval = 0.01
+        tokens.start()
+        deadline = time.time() + 2
+        while store.get('alice')['access_token'] == 'old' and time.time() < deadline:
+            time.sleep(0.01)
+        tokens.stop()
+        assert store.get('alice')['access_token'] == 'new-ra'
+        
+        # SpotifyManager reçoit un token prêt et ne le rafraîchit pas lui-même
+        manager = tokens.manager_for('bob', {'token_refresh_margin': 300})
+        assert manager.auth_manager is auth['bob'] and manager.external_refresh
+        manager._refresh_token()
+        assert manager._refresh_timer is None and auth['bob'].refreshes == 0
+        try:
+            tokens.manager_for('nobody')
+            assert False, "unknown user should be rejected"
+        except KeyError:
+            pass
+        
+        # Réservation perdue: attendre le token rafraîchi par l'autre processus
+        import threading
+        store.save('bob', {'access_token': 'b', 'refresh_token': 'rb', 'expires_at': now - 10})
+        assert store.claim_refresh('bob', 'other-host:1')
+        
+        def other_refreshes():
+            time.sleep(0.1)
+            store.save('bob', {'access_token': 'fresh-b', 'refresh_token': 'rb', 'expires_at': now + 3600})
+        
+        refresher = threading.Thread(target=other_refreshes)
+        refresher.start()
+        tokens.claim_wait = 2
+        tokens.manager_for('bob')
+        refresher.join()
+        assert store.get('bob')['access_token'] == 'fresh-b' and auth['bob'].refreshes == 0
+        
+        # Personne ne rafraîchit un token expiré: erreur au lieu d'un gestionnaire inutilisable
+        store.save('bob', {'access_token': 'b', 'refresh_token': 'rb', 'expires_at': now - 10})
+        assert store.claim_refresh('bob', 'other-host:1')
+        tokens.claim_wait = 0.1
+        try:
+            tokens.manager_for('bob')
+            assert False, "expired token should be rejected"
+        except RuntimeError as e:
+            assert 'expiré' in str(e)
+        
+        # Reprise d'un .spotify_cache mono-utilisateur
+        cache_path = os.path.join(tmp, ".spotify_cache")
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'access_token': 'd', 'refresh_token': 'rd', 'expires_at': now + 3600}, f)
+        assert tokens.import_token_file('dave', cache_path)
+        assert not tokens.import_token_file('erin', os.path.join(tmp, "missing"))
+        assert store.get('dave')['refresh_token'] == 'rd'
+        store.close()
+    
+    print("✅ Token Manager test passed!")
+    return True
+
+
+def test_app_logging():
+    """Test leveled JSON logging through the background queue and the throttled progress bar."""
+    print("\n📜 Testing App Logging...")
+    
+    import io
+    import json
+    import time
+    from app_logging import ProgressBar, get_logger, setup_logging, shutdown_logging
+    
+    logger = get_logger('test')
+    stream = io.StringIO()
+    try:
+        setup_logging(log_format='json', stream=stream)
+        logger.debug("🔍 hidden at info level")
+        logger.info("✅ %d pistes", 3, extra={'event': 'write', 'playlist': 'pl'})
+        logger.error("❌ échec")
+        
+        # Progression hors terminal: première ligne, puis rien avant log_interval, sauf la dernière
+        progress = ProgressBar(100, "🔍 Recherche", logger, log_interval=60.0, stream=io.StringIO())
+        assert not progress.interactive
+        for i in range(100):
+            progress.update(found=i % 2)
+        progress.close()
+        shutdown_logging()
+        
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [event['level'] for event in events] == ['info', 'error', 'info', 'info']
+        assert events[0]['message'] == "✅ 3 pistes" and events[0]['playlist'] == 'pl'
+        assert events[0]['logger'] == 'test' and events[0]['event'] == 'write'
+        final = events[-1]
+        assert final['event'] == 'progress' and final['done'] == final['total'] == 100 and final['found'] == 50
+        assert "100/100 (100%)" in final['message']
+        
+        # --quiet: avertissements et erreurs seulement
+        stream = io.StringIO()
+        setup_logging(quiet=True, stream=stream)
+        logger.info("✅ hidden")
+        logger.warning("⚠️  shown")
+        shutdown_logging()
+        assert stream.getvalue() == "⚠️  shown\n"
+        
+        # Barre sur un terminal: redessinée au plus une fois par intervalle
+        class Terminal(io.StringIO):
+            def isatty(self):
+                return True
+        
+        terminal = Terminal()
+        setup_logging(stream=io.StringIO())
+        bar = ProgressBar(1000, "🔍", refresh=60.0, stream=terminal)
+        assert bar.interactive
+        for _ in range(1000):
+            bar.update()
+        bar.close()
+        assert terminal.getvalue().count("\r") == 2 and terminal.getvalue().endswith("\n")
+        assert "1000/1000" in terminal.getvalue()
+        assert "reste" in bar.status(elapsed=time.perf_counter() - bar.started)
+    finally:
+        shutdown_logging()
+    
+    print("✅ App Logging test passed!")
+    return True
+
+
+def test_cleaning_profiler():
+    """Test per-rule hit counts, dead/shadowed rule detection and precompiled cleaning rules."""
+    print("\n🧹 Testing Cleaning Profiler...")
+    
+    import re
+    from cleaning_profiler import profile_rules
+    from title_cleaner import TitleCleaner
+    
+    cleaner = TitleCleaner()
+    titles = [
+        "Rema - Calm Down (Official Music Video)",
+        "Burna Boy | Last Last [Official Video] #afrobeats",
+        "Asake - Joha (Lyric Video)",
+        "Tems - Free Mind",
+        "Wizkid ft. Tems - Essence (Official Video) (2021)",
+    ]
+    
+    # Règles précompilées, sautées sans caractère déclencheur: même résultat que re.sub pattern par pattern
+    def reference(title):
+        for pattern in cleaner.remove_patterns:
+            title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+        return re.sub(r'\s+', ' ', title).strip(' -–—|•:/')
+    assert all(cleaner.clean_title(title) == reference(title) for title in titles)
+    assert cleaner.rules[0].trigger == '(' and cleaner.rules[2].trigger is None
+    
+    profile = profile_rules(titles, cleaner)
+    rules = {rule.pattern: rule for rule in profile.rules}
+    assert profile.titles == 5 and profile.changed_titles == 4
+    assert rules[r'\(Official.*?\)'].hits == 2 and rules[r'#\w+'].matches == 1
+    assert rules[r'\(20\d{2}\)'].hits == 1
+    # "(Lyric Video)" est déjà supprimé par "(.*?Video.*?)": règle redondante, pas morte
+    assert rules[r'\(Lyric.*?\)'].shadowed and not rules[r'\(Lyric.*?\)'].dead
+    # Regex évaluée seulement si "(" reste dans le titre à ce stade: "(2021)" du dernier titre
+    assert rules[r'\(HD\)'].dead and rules[r'\(HD\)'].evaluated == 1
+    assert rules['Official Video'].shadowed
+    
+    # Ordre recommandé: règles fréquentes d'abord, mortes à la fin, résultat comparé sur le corpus
+    assert profile.proposed_order[0] == rules[r'\(Official.*?\)'].index
+    assert profile.proposed_order[-1] == profile.dead_rules[-1].index
+    assert profile.order_differences == 0
+    report = '\n'.join(profile.lines())
+    assert "Règle morte" in report and "Règle redondante" in report
+    assert profile.to_dict()['rules'][0]['hits'] == 2
+    
+    # Réaffecter remove_patterns recompile les règles
+    cleaner.remove_patterns = [r'\(Live\)']
+    assert len(cleaner.rules) == 1 and cleaner.clean_title("Song (Live)") == "Song"
+    
+    print("✅ Cleaning Profiler test passed!")
+    return True
+
+
 def main():
     """Run all tests."""
     print("🧪 YouTube to Spotify Automator - Component Tests")
@@ -145,13 +1671,42 @@ def main():
         test_environment,
         test_title_cleaner,
         test_youtube_extractor,
-        test_spotify_manager
+        test_spotify_manager,
+        test_keyword_matcher,
+        test_artist_dictionary,
+        test_spell_corrector,
+        test_performance_profiles,
+        test_batched_refresh,
+        test_async_spotify_manager,
+        test_local_catalog,
+        test_slotted_records,
+        test_non_interactive_auth,
+        test_chunked_playlist_write,
+        test_negative_cache,
+        test_query_planner,
+        test_playlist_sync,
+        test_job_service,
+        test_job_queue,
+        test_run_profiler,
+        test_cassette,
+        test_incremental_naming,
+        test_credential_pool,
+        test_duration_pruning,
+        test_structured_sources,
+        test_cost_estimator,
+        test_token_manager,
+        test_app_logging,
+        test_cleaning_profiler,
     ]
     
     results = []
     
     for test in tests:
-        result = test()
+        try:
+            result = test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            result = False
         results.append(result)
     
     print("\n" + "=" * 55)
@@ -7,6 +7,7 @@ Teste spécifiquement les cas d'échec identifiés.
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
 
 from src.title_cleaner import TitleCleaner
 from src.spotify_manager import SpotifyManager
@@ -62,8 +63,7 @@ def test_failed_cases():
                 tracks = spotify.search_track(query)
                 if tracks:
                     best_track = tracks[0]
-                    artists_str = ", ".join(best_track['artists'])
-                    print(f"   ✅ TROUVÉ: {best_track['name']} - {artists_str}")
+                    print(f"   ✅ TROUVÉ: {best_track.name} - {best_track.artists_text}")
                     results['improved'] += 1
                     found = True
                     break
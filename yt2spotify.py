@@ -6,104 +6,73 @@ Script principal pour automatiser le transfert de playlists YouTube vers Spotify
 
 Usage:
     python yt2spotify.py --youtube "URL" --name "Playlist Name" [options]
+    python yt2spotify.py watch playlists.json [options]
+    python yt2spotify.py serve [--port 8765] [options]
+    python yt2spotify.py enqueue --queue jobs.db "URL" [--name "Playlist Name"]
+    python yt2spotify.py worker --queue jobs.db [--processes 4] [--token-store tokens.db]
+    python yt2spotify.py tokens authorize|import|list KEY [--store tokens.db]
 
 Auteur: Votre nom
 Date: 2025
 """
 
 import argparse
+import multiprocessing
 import sys
 import os
-from datetime import datetime
-from typing import List, Dict
+import time
+from dotenv import load_dotenv
 
 # Ajouter le dossier src au path pour les imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from youtube_extractor import YouTubeExtractor
-from title_cleaner import TitleCleaner
+from app_logging import LOG_FORMATS, get_logger, setup_logging, shutdown_logging
+from transfer_pipeline import PlaylistTransferReport, TransferPipeline
+from run_profiler import RunProfiler
+from cassette import Cassette
+from cost_estimator import RunStats, estimate_transfer
+from credential_pool import CREDENTIALS_ENV, parse_credentials
+from match_cache import MatchCache
 from spotify_manager import SpotifyManager
-from playlist_naming import PlaylistNamingEngine
-
-
-class PlaylistTransferReport:
-    """Gestionnaire de rapport de transfert."""
-    
-    def __init__(self):
-        self.found_tracks: List[Dict] = []
-        self.not_found_tracks: List[str] = []
-        self.total_youtube_videos = 0
-        self.processing_time = 0.0
-        self.playlist_url = ""
-        self.playlist_name = ""
-    
-    def add_found_track(self, youtube_title: str, spotify_track: Dict):
-        """Ajoute une piste trouvée au rapport."""
-        self.found_tracks.append({
-            'youtube_title': youtube_title,
-            'spotify_name': spotify_track['name'],
-            'spotify_artists': ', '.join(spotify_track['artists']),
-            'spotify_id': spotify_track['id'],
-            'relevance_score': spotify_track.get('relevance_score', 0)
-        })
-    
-    def add_not_found_track(self, youtube_title: str):
-        """Ajoute une piste non trouvée au rapport."""
-        self.not_found_tracks.append(youtube_title)
-    
-    def print_summary(self):
-        """Affiche un résumé du transfert."""
-        print("\n" + "="*60)
-        print("📊 RÉSUMÉ DU TRANSFERT")
-        print("="*60)
-        print(f"🎵 Vidéos YouTube analysées: {self.total_youtube_videos}")
-        print(f"✅ Pistes trouvées sur Spotify: {len(self.found_tracks)}")
-        print(f"❌ Pistes non trouvées: {len(self.not_found_tracks)}")
-        print(f"📈 Taux de réussite: {len(self.found_tracks)/max(self.total_youtube_videos, 1)*100:.1f}%")
-        
-        if self.playlist_url:
-            print(f"🎯 Playlist créée: {self.playlist_url}")
-        
-        print(f"⏱️  Temps de traitement: {self.processing_time:.1f}s")
-        print("="*60)
-    
-    def save_to_file(self, filename: str | None = None):
-        """Sauvegarde le rapport détaillé dans un fichier."""
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"reports/rapport_transfert_{timestamp}.txt"
-        
-        # Créer le dossier reports s'il n'existe pas
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"🎵 YouTube → Spotify Playlist Transfer Report\n")
-            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Playlist: {self.playlist_name}\n")
-            f.write("="*60 + "\n\n")
-            
-            f.write(f"📊 SUMMARY:\n")
-            f.write(f"  - YouTube videos analyzed: {self.total_youtube_videos}\n")
-            f.write(f"  - Tracks found on Spotify: {len(self.found_tracks)}\n")
-            f.write(f"  - Tracks not found: {len(self.not_found_tracks)}\n")
-            f.write(f"  - Success rate: {len(self.found_tracks)/max(self.total_youtube_videos, 1)*100:.1f}%\n")
-            f.write(f"  - Playlist URL: {self.playlist_url}\n\n")
-            
-            if self.found_tracks:
-                f.write("✅ FOUND TRACKS:\n")
-                f.write("-" * 40 + "\n")
-                for i, track in enumerate(self.found_tracks, 1):
-                    f.write(f"{i:2d}. {track['youtube_title']}\n")
-                    f.write(f"    → {track['spotify_name']} - {track['spotify_artists']}\n")
-                    f.write(f"    Score: {track['relevance_score']:.2f}\n\n")
-            
-            if self.not_found_tracks:
-                f.write("❌ NOT FOUND TRACKS:\n")
-                f.write("-" * 40 + "\n")
-                for i, track in enumerate(self.not_found_tracks, 1):
-                    f.write(f"{i:2d}. {track}\n")
-        
-        print(f"📄 Rapport sauvegardé: {filename}")
+from youtube_extractor import YouTubeExtractor
+from playlist_sync import PlaylistWatcher, SyncState, load_pairs
+from job_service import JobService, make_server
+from job_queue import JobQueue, run_worker
+from token_manager import TokenManager, TokenStore
+from config.settings import load_config, PERFORMANCE_PROFILES, DEFAULT_PROFILE
+
+logger = get_logger('cli')
+
+
+def add_logging_arguments(parser):
+    """Options de journalisation communes aux commandes."""
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Avertissements et erreurs seulement, sans barre de progression'
+    )
+    verbosity.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Une ligne par vidéo traitée (titre et piste retenue)'
+    )
+    parser.add_argument(
+        '--log-format',
+        choices=LOG_FORMATS,
+        default='text',
+        help='text: messages lisibles, json: un événement JSON par ligne (agrégateurs de logs)'
+    )
+
+
+def configure_logging(args, progress=True):
+    """Applique les options de journalisation (progress: barre interactive sur un terminal)."""
+    setup_logging(
+        level='debug' if args.verbose else 'info',
+        log_format=args.log_format,
+        quiet=args.quiet,
+        progress=progress
+    )
 
 
 def setup_argument_parser():
@@ -162,158 +131,604 @@ Exemples d'utilisation:
         help='Limite le nombre de pistes à traiter (0 = toutes)'
     )
     
+    parser.add_argument(
+        '--cache',
+        metavar='FICHIER',
+        help='Cache local des correspondances (rafraîchi par lots au lieu de relancer les recherches)'
+    )
+    
+    parser.add_argument(
+        '--catalog',
+        metavar='FICHIER',
+        help='Catalogue local (créé par src/local_catalog.py): recherche hors ligne, API seulement en cas d\'échec'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        choices=list(PERFORMANCE_PROFILES),
+        default=DEFAULT_PROFILE,
+        help='Profil de performance: fast (moins d\'appels API), balanced, thorough (meilleur rappel)'
+    )
+    
+    parser.add_argument(
+        '--replace',
+        action='store_true',
+        help='Réutilise la playlist existante du même nom et remplace son contenu (relance idempotente)'
+    )
+    
+    parser.add_argument(
+        '--profile-run',
+        metavar='DOSSIER',
+        help='Profile chaque étape (cProfile): fichiers .pstats et .collapsed (flamegraph) dans DOSSIER'
+    )
+    
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        '--record',
+        metavar='CASSETTE',
+        help='Enregistre toutes les réponses YouTube et Spotify dans une cassette (.gz)'
+    )
+    cassette_group.add_argument(
+        '--replay',
+        metavar='CASSETTE',
+        help='Rejoue une cassette hors ligne (ni YouTube ni Spotify ne sont contactés)'
+    )
+    
+    parser.add_argument(
+        '--replay-speed',
+        type=float,
+        default=0.0,
+        help='Avec --replay: 0 = instantané, 1 = temps d\'origine, 2 = deux fois plus vite'
+    )
+    
+    parser.add_argument(
+        '--replay-lenient',
+        action='store_true',
+        help='Avec --replay: réponse vide (au lieu d\'une erreur) pour un appel absent de la cassette'
+    )
+    
+    parser.add_argument(
+        '--estimate',
+        action='store_true',
+        help='Estime les appels Spotify, la durée et le risque de 429 sans lancer de recherche'
+    )
+    
+    parser.add_argument(
+        '--stats',
+        metavar='FICHIER',
+        default='.run_stats.json',
+        help='Historique des transferts utilisé par --estimate (mis à jour après chaque transfert)'
+    )
+    
+    parser.add_argument(
+        '--profile-memory',
+        action='store_true',
+        help='Avec --profile-run: suivre aussi les allocations mémoire (tracemalloc, plus lent)'
+    )
+    
+    add_logging_arguments(parser)
+    
+    return parser
+
+
+def setup_watch_parser():
+    """Configure l'analyseur d'arguments de la commande watch."""
+    parser = argparse.ArgumentParser(
+        prog='yt2spotify.py watch',
+        description="🔁 Garde des playlists YouTube synchronisées avec Spotify (processus longue durée)"
+    )
+    
+    parser.add_argument(
+        'playlists',
+        metavar='FICHIER',
+        help='Fichier JSON des playlists à surveiller: {"playlists": [{"youtube": URL, "name": ..., "interval": 3600}]}'
+    )
+    
+    parser.add_argument(
+        '--state',
+        default='.sync_state.json',
+        help='Fichier d\'état (vidéos déjà traitées par playlist)'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        metavar='FICHIER',
+        default='.match_cache.json',
+        help='Cache local des correspondances partagé par toutes les playlists'
+    )
+    
+    parser.add_argument(
+        '--catalog',
+        metavar='FICHIER',
+        help='Catalogue local pour la recherche hors ligne'
+    )
+    
+    parser.add_argument(
+        '--max-concurrent',
+        type=int,
+        default=2,
+        help='Nombre maximum de playlists synchronisées simultanément'
+    )
+    
+    parser.add_argument(
+        '--jitter',
+        type=float,
+        default=0.1,
+        help='Variation aléatoire des intervalles (0.1 = ±10%%)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        choices=list(PERFORMANCE_PROFILES),
+        default=DEFAULT_PROFILE,
+        help='Profil de performance'
+    )
+    
+    add_logging_arguments(parser)
+    
     return parser
 
 
-def main():
+def watch(argv):
+    """Commande watch: synchronise des playlists en continu."""
+    args = setup_watch_parser().parse_args(argv)
+    configure_logging(args, progress=False)
+    config = load_config(args.profile)
+    
+    pairs = load_pairs(args.playlists)
+    if not pairs:
+        logger.error(f"❌ Aucune playlist à surveiller dans {args.playlists}")
+        return 1
+    
+    logger.info(f"🔁 Surveillance de {len(pairs)} playlists (Ctrl+C pour arrêter)")
+    pipeline = TransferPipeline(config, cache_path=args.cache, catalog_path=args.catalog)
+    pipeline.spotify_manager.start_warm_up()
+    if not pipeline.authenticate():
+        logger.error("❌ Échec de l'authentification Spotify!")
+        return 1
+    
+    watcher = PlaylistWatcher(
+        pipeline,
+        pairs,
+        SyncState(args.state),
+        max_concurrent=args.max_concurrent,
+        jitter=args.jitter
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.warning("⚠️  Surveillance interrompue, fin des synchronisations en cours...")
+        watcher.stop()
+    finally:
+        pipeline.spotify_manager.close()
+    return 0
+
+
+def setup_serve_parser():
+    """Configure l'analyseur d'arguments de la commande serve."""
+    parser = argparse.ArgumentParser(
+        prog='yt2spotify.py serve',
+        description="🌐 Service HTTP local de transferts (POST /jobs, GET /jobs/<id>, /health, /metrics)"
+    )
+    
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Adresse d\'écoute (locale par défaut)'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port d\'écoute'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=2,
+        help='Nombre de transferts traités simultanément'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        metavar='FICHIER',
+        default='.match_cache.json',
+        help='Cache local des correspondances partagé par tous les transferts'
+    )
+    
+    parser.add_argument(
+        '--catalog',
+        metavar='FICHIER',
+        help='Catalogue local pour la recherche hors ligne'
+    )
+    
+    parser.add_argument(
+        '--report-only',
+        action='store_true',
+        help='Recherche seule: aucune playlist n\'est créée'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        choices=list(PERFORMANCE_PROFILES),
+        default=DEFAULT_PROFILE,
+        help='Profil de performance'
+    )
+    
+    add_logging_arguments(parser)
+    
+    return parser
+
+
+def serve(argv):
+    """Commande serve: service HTTP local de transferts."""
+    args = setup_serve_parser().parse_args(argv)
+    configure_logging(args, progress=False)
+    config = load_config(args.profile)
+    
+    pipeline = TransferPipeline(
+        config,
+        search_only=args.report_only,
+        cache_path=args.cache,
+        catalog_path=args.catalog
+    )
+    pipeline.spotify_manager.start_warm_up()
+    if not pipeline.authenticate():
+        logger.error("❌ Échec de l'authentification Spotify!")
+        return 1
+    
+    service = JobService(pipeline, workers=args.workers)
+    service.start()
+    server, port = make_server(service, args.host, args.port)
+    logger.info(f"🌐 Service de transferts sur http://{args.host}:{port} ({args.workers} workers, Ctrl+C pour arrêter)")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.warning("⚠️  Arrêt du service, fin des transferts en cours...")
+    finally:
+        server.server_close()
+        service.stop()
+        pipeline.spotify_manager.close()
+    return 0
+
+
+def setup_enqueue_parser():
+    """Configure l'analyseur d'arguments de la commande enqueue."""
+    parser = argparse.ArgumentParser(
+        prog='yt2spotify.py enqueue',
+        description="📥 Ajoute des transferts à la file SQLite"
+    )
+    
+    parser.add_argument('youtube', nargs='+', help='URL(s) de playlist YouTube')
+    parser.add_argument('--queue', default='jobs.db', help='Fichier de la file SQLite')
+    parser.add_argument('--name', '-n', help='Nom de la playlist Spotify (une seule URL)')
+    parser.add_argument('--description', '-d', help='Description de la playlist')
+    parser.add_argument('--private', action='store_true', help='Créer des playlists privées')
+    parser.add_argument('--replace', action='store_true', help='Remplacer le contenu des playlists existantes')
+    parser.add_argument('--max-tracks', type=int, default=0, help='Limite le nombre de pistes (0 = toutes)')
+    parser.add_argument('--max-attempts', type=int, default=3, help='Nombre maximum de tentatives par tâche')
+    parser.add_argument('--user', metavar='CLÉ',
+                        help='Compte Spotify du magasin de tokens qui reçoit les playlists (voir la commande tokens)')
+    
+    return parser
+
+
+def enqueue(argv):
+    """Commande enqueue: ajoute des transferts à la file."""
+    args = setup_enqueue_parser().parse_args(argv)
+    if args.name and len(args.youtube) > 1:
+        print("❌ --name ne s'utilise qu'avec une seule URL")
+        return 1
+    
+    options = {'private': args.private, 'replace': args.replace, 'max_tracks': args.max_tracks}
+    if args.name:
+        options['name'] = args.name
+    if args.description:
+        options['description'] = args.description
+    if args.user:
+        options['user'] = args.user
+    
+    job_queue = JobQueue(args.queue)
+    for url in args.youtube:
+        job_id = job_queue.enqueue(url, options, max_attempts=args.max_attempts)
+        print(f"📥 Tâche {job_id}: {url}")
+    print(f"📊 File: {job_queue.stats()}")
+    job_queue.close()
+    return 0
+
+
+def setup_worker_parser():
+    """Configure l'analyseur d'arguments de la commande worker."""
+    parser = argparse.ArgumentParser(
+        prog='yt2spotify.py worker',
+        description="⚙️  Traite les transferts de la file SQLite (plusieurs workers sur cette machine)"
+    )
+    
+    parser.add_argument('--queue', default='jobs.db', help='Fichier de la file SQLite')
+    parser.add_argument('--processes', type=int, default=1, help='Nombre de processus workers sur cette machine')
+    parser.add_argument('--visibility-timeout', type=float, default=600,
+                        help='Durée du bail d\'une tâche (secondes), prolongée tant qu\'elle tourne')
+    parser.add_argument('--poll-interval', type=float, default=2.0, help='Attente quand la file est vide (secondes)')
+    parser.add_argument('--exit-when-empty', action='store_true', help='S\'arrêter quand la file est vide')
+    parser.add_argument('--cache', metavar='FICHIER', help='Cache local des correspondances')
+    parser.add_argument('--catalog', metavar='FICHIER', help='Catalogue local pour la recherche hors ligne')
+    parser.add_argument('--report-only', action='store_true', help='Recherche seule: aucune playlist créée')
+    parser.add_argument('--profile', choices=list(PERFORMANCE_PROFILES), default=DEFAULT_PROFILE,
+                        help='Profil de performance')
+    parser.add_argument('--token-store', metavar='FICHIER',
+                        help='Magasin de tokens multi-utilisateurs pour les tâches ajoutées avec --user')
+    
+    add_logging_arguments(parser)
+    
+    return parser
+
+
+def _worker_process(args):
+    """Un processus worker: son propre pipeline et sa propre connexion à la file."""
+    configure_logging(args, progress=False)
+    config = load_config(args.profile)
+    pipeline = TransferPipeline(
+        config,
+        search_only=args.report_only,
+        cache_path=args.cache,
+        catalog_path=args.catalog
+    )
+    if not pipeline.authenticate():
+        logger.error("❌ Échec de l'authentification Spotify!")
+        return 0
+    
+    # Comptes des tâches --user: tokens rafraîchis en arrière-plan, un pipeline par compte
+    tokens = pipeline_for_user = None
+    if args.token_store:
+        tokens = TokenManager(TokenStore(args.token_store), refresh_margin=config['spotify']['token_refresh_margin'])
+        tokens.start()
+        user_pipelines = {}
+        
+        def pipeline_for_user(user):
+            if user not in user_pipelines:
+                spotify_manager = tokens.manager_for(user, {**config['spotify'], **config['errors']})
+                user_pipelines[user] = pipeline.with_spotify_manager(spotify_manager)
+            return user_pipelines[user]
+    
+    job_queue = JobQueue(args.queue)
+    try:
+        return run_worker(
+            job_queue,
+            pipeline,
+            visibility_timeout=args.visibility_timeout,
+            poll_interval=args.poll_interval,
+            exit_when_empty=args.exit_when_empty,
+            pipeline_for_user=pipeline_for_user
+        )
+    finally:
+        job_queue.close()
+        pipeline.spotify_manager.close()
+        if tokens:
+            tokens.stop()
+            tokens.store.close()
+        # Les processus du pool ne passent pas par atexit: vider la file de logs ici
+        shutdown_logging()
+
+
+def worker(argv):
+    """Commande worker: vide la file de transferts."""
+    args = setup_worker_parser().parse_args(argv)
+    configure_logging(args, progress=False)
+    
+    try:
+        if args.processes <= 1:
+            processed = _worker_process(args)
+        else:
+            with multiprocessing.Pool(args.processes) as pool:
+                processed = sum(pool.map(_worker_process, [args] * args.processes))
+    except KeyboardInterrupt:
+        logger.warning("⚠️  Worker interrompu (les tâches en cours redeviendront visibles à l'expiration du bail)")
+        return 130
+    
+    logger.info(f"✅ {processed} tâches traitées")
+    return 0
+
+
+def setup_tokens_parser():
+    """Configure l'analyseur d'arguments de la commande tokens."""
+    parser = argparse.ArgumentParser(
+        prog='yt2spotify.py tokens',
+        description="🔑 Comptes Spotify du magasin de tokens multi-utilisateurs (worker --token-store)"
+    )
+    
+    parser.add_argument('action', choices=['authorize', 'import', 'list'],
+                        help='authorize: autoriser un compte, import: reprendre un cache spotipy, list: comptes connus')
+    parser.add_argument('user', nargs='?', metavar='CLÉ', help='Clé du compte (authorize, import)')
+    parser.add_argument('--store', default='tokens.db', help='Fichier SQLite du magasin de tokens')
+    parser.add_argument('--from', dest='source', default='.spotify_cache',
+                        help='Avec import: cache de token spotipy à reprendre')
+    
+    return parser
+
+
+def tokens(argv):
+    """Commande tokens: ajoute et liste les comptes du magasin de tokens."""
+    args = setup_tokens_parser().parse_args(argv)
+    if args.action != 'list' and not args.user:
+        print(f"❌ {args.action} attend la clé du compte")
+        return 1
+    
+    token_manager = TokenManager(TokenStore(args.store))
+    try:
+        if args.action == 'list':
+            for user in token_manager.store.users():
+                token_info = token_manager.store.get(user) or {}
+                remaining = (token_info.get('expires_at', 0) - time.time()) / 60
+                print(f"🔑 {user}: token valide encore {remaining:.0f} min" if remaining > 0
+                      else f"🔑 {user}: token expiré (rafraîchi au prochain passage du worker)")
+            return 0
+        
+        if args.action == 'import':
+            if not token_manager.import_token_file(args.user, args.source):
+                print(f"❌ Aucun token réutilisable dans {args.source}")
+                return 1
+            print(f"✅ Token de {args.source} importé pour {args.user}")
+            return 0
+        
+        print(f"🌐 Ouvrez cette adresse avec le compte Spotify de {args.user}:")
+        print(f"   {token_manager.authorize_url(args.user)}")
+        response = input("🔗 Collez l'URL de redirection (ou le code): ").strip()
+        token_manager.complete_authorization(args.user, response)
+        print(f"✅ Compte {args.user} enregistré dans {args.store}")
+        return 0
+    finally:
+        token_manager.store.close()
+
+
+def estimate(args, config, youtube_extractor):
+    """Mode --estimate: extraction seule, puis prévision du transfert sans recherche Spotify."""
+    if not youtube_extractor.is_valid_youtube_url(args.youtube):
+        logger.error("❌ URL YouTube invalide!")
+        return 1
+    
+    logger.info("📥 Extraction de la playlist YouTube...")
+    videos = youtube_extractor.extract_videos(args.youtube)
+    if args.max_tracks > 0:
+        videos = videos[:args.max_tracks]
+    if not videos:
+        logger.error("❌ Aucune vidéo trouvée dans la playlist!")
+        return 1
+    
+    load_dotenv()
+    result = estimate_transfer(
+        videos,
+        config,
+        match_cache=MatchCache(args.cache, config['cache']) if args.cache else None,
+        catalog_path=args.catalog,
+        stats=RunStats(args.stats),
+        publish=not args.report_only,
+        credentials=len(parse_credentials(os.getenv(CREDENTIALS_ENV, ''))) or 1
+    )
+    
+    print("\n" + "="*60)
+    print("🔮 ESTIMATION DU TRANSFERT (aucune recherche envoyée)")
+    print("="*60)
+    for line in result.lines():
+        print(line)
+    print("="*60)
+    return 0
+
+
+def main(argv=None):
     """Fonction principale du script."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'watch':
+        return watch(argv[1:])
+    if argv and argv[0] == 'serve':
+        return serve(argv[1:])
+    if argv and argv[0] == 'enqueue':
+        return enqueue(argv[1:])
+    if argv and argv[0] == 'worker':
+        return worker(argv[1:])
+    if argv and argv[0] == 'tokens':
+        return tokens(argv[1:])
+    
     # Configuration des arguments
     parser = setup_argument_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    configure_logging(args)
     
-    # Initialisation du rapport
+    # Initialisation du rapport et de la configuration
     report = PlaylistTransferReport()
-    start_time = datetime.now()
+    config = load_config(args.profile)
+    report.profile = config['profile']
+    report.profile_settings = {
+        key: config['spotify'][key]
+        for key in ('search_limit', 'max_search_queries', 'relevance_threshold', 'rate_limit_delay')
+    }
     
-    print("🎵 YouTube Mix → Spotify Playlist Automator")
-    print("="*50)
+    logger.info("🎵 YouTube Mix → Spotify Playlist Automator\n" + "="*50)
     
     try:
-        # 1. Extraction YouTube
-        print(f"📥 Extraction de la playlist YouTube...")
-        youtube_extractor = YouTubeExtractor()
-        
-        # Vérifier l'URL
-        if not youtube_extractor.is_valid_youtube_url(args.youtube):
-            print("❌ URL YouTube invalide!")
-            return 1
-        
-        # Extraire les vidéos
-        videos = youtube_extractor.extract_videos(args.youtube)
-        if not videos:
-            print("❌ Aucune vidéo trouvée dans la playlist!")
-            return 1
-        
-        # Limiter le nombre de pistes si demandé
-        if args.max_tracks > 0:
-            videos = videos[:args.max_tracks]
-            print(f"⚠️  Limitation à {args.max_tracks} pistes")
-        
-        report.total_youtube_videos = len(videos)
-        print(f"✅ {len(videos)} vidéos extraites")
+        # Spotify: client credentials pour --report-only, sinon token utilisateur
+        # validé en arrière-plan pendant l'extraction YouTube
+        profiler = RunProfiler(args.profile_run, memory=args.profile_memory) if args.profile_run else None
         
-        # 2. Nettoyage et recherche
-        print(f"\n🧹 Nettoyage des titres et recherche Spotify...")
-        title_cleaner = TitleCleaner()
-        spotify_manager = SpotifyManager()
-        
-        # Authentification Spotify
-        if not spotify_manager.authenticate():
-            print("❌ Échec de l'authentification Spotify!")
-            return 1
-        
-        # Recherche des pistes
-        found_tracks = []
-        progress_count = 0
-        
-        for video in videos:
-            progress_count += 1
-            title = video['title']
-            
-            print(f"🔍 [{progress_count}/{len(videos)}] {title[:60]}...")
-            
-            # Générer les requêtes de recherche
-            search_queries = title_cleaner.create_search_queries(title)
-            
-            # Chercher sur Spotify
-            best_match = spotify_manager.find_best_match(search_queries, title)
-            
-            if best_match:
-                found_tracks.append(best_match)
-                report.add_found_track(title, best_match)
-                artists = ', '.join(best_match['artists'])
-                print(f"✅ → {best_match['name']} - {artists}")
+        # Cassette: enregistrement d'une exécution réelle, ou relecture hors ligne
+        cassette = None
+        youtube_extractor = spotify_manager = None
+        spotify_config = {**config['spotify'], **config['errors']}
+        if args.record or args.replay:
+            cassette = Cassette(args.record or args.replay, 'record' if args.record else 'replay', args.replay_speed,
+                                strict=not args.replay_lenient)
+            youtube_extractor = YouTubeExtractor(config['youtube'])
+            youtube_extractor.info_extractor = cassette.wrap_function(
+                'youtube', 'extract_info', youtube_extractor.info_extractor if args.record else None
+            )
+            if args.record:
+                spotify_manager = SpotifyManager(spotify_config, search_only=args.report_only)
+                cassette.record_spotify(spotify_manager)
             else:
-                report.add_not_found_track(title)
-                print(f"❌ → Non trouvé")
+                logger.info(f"📼 Relecture de {args.replay} ({len(cassette)} appels enregistrés)")
+                spotify_manager = SpotifyManager(spotify_config, search_only=args.report_only,
+                                                 client=cassette.wrap('spotify'))
         
-        # 2.5. Génération automatique du nom de playlist si nécessaire
-        playlist_name = args.name
-        playlist_description = args.description
+        if args.estimate:
+            return estimate(args, config, youtube_extractor or YouTubeExtractor(config['youtube']))
         
-        if not playlist_name and found_tracks:
-            print(f"\n🧠 Génération automatique du nom de playlist...")
-            naming_engine = PlaylistNamingEngine()
-            
-            # Extraire les titres pour l'analyse
-            track_titles = [f"{track['name']} - {', '.join(track['artists'])}" for track in found_tracks]
-            playlist_name, auto_description = naming_engine.create_playlist_identity(track_titles)
-            print(f"🎯 Nom généré: '{playlist_name}'")
-            
-            # Utiliser la description automatique si aucune n'est fournie
-            if not playlist_description:
-                playlist_description = auto_description
-                print(f"📝 Description générée: '{playlist_description[:100]}{'...' if len(playlist_description) > 100 else ''}'")
+        pipeline = TransferPipeline(
+            config,
+            search_only=args.report_only,
+            cache_path=args.cache,
+            catalog_path=args.catalog,
+            spotify_manager=spotify_manager,
+            profiler=profiler,
+            youtube_extractor=youtube_extractor
+        )
+        pipeline.spotify_manager.start_warm_up()
         
-        # Définir le nom final pour le rapport
-        if not playlist_name:
-            playlist_name = f"Playlist YouTube {datetime.now().strftime('%d-%m-%Y')}"
+        exit_code, report = pipeline.run(
+            args.youtube,
+            name=args.name,
+            description=args.description,
+            private=args.private,
+            force=args.force,
+            replace=args.replace,
+            max_tracks=args.max_tracks,
+            report=report
+        )
         
-        report.playlist_name = playlist_name
+        if not args.replay:
+            RunStats(args.stats).record(report)
         
-        # 3. Création de la playlist (si pas en mode rapport seulement)
-        playlist_id = None
-        if not args.report_only and found_tracks:
-            print(f"\n🎯 Création de la playlist Spotify...")
-            
-            # Vérifier si la playlist existe déjà
-            existing_playlist = spotify_manager.playlist_exists(playlist_name)
-            if existing_playlist and not args.force:
-                print(f"⚠️  Une playlist '{playlist_name}' existe déjà!")
-                print("Utilisez --force pour forcer la création ou choisissez un autre nom.")
-                return 1
-            
-            # Créer la playlist
-            final_description = playlist_description or f"Importée depuis YouTube le {datetime.now().strftime('%d/%m/%Y')}"
-            playlist_id = spotify_manager.create_playlist(
-                name=playlist_name,
-                description=final_description,
-                public=not args.private
-            )
-            
-            if playlist_id:
-                # Ajouter les pistes
-                track_uris = [track['uri'] for track in found_tracks]
-                if spotify_manager.add_tracks_to_playlist(playlist_id, track_uris):
-                    report.playlist_url = spotify_manager.get_playlist_url(playlist_id)
-                    print(f"🎉 Playlist créée avec succès!")
-                else:
-                    print("❌ Erreur lors de l'ajout des pistes")
-            else:
-                print("❌ Erreur lors de la création de la playlist")
+        if cassette and args.record:
+            cassette.save()
+            logger.info(f"📼 {len(cassette)} appels enregistrés dans {args.record}")
+        elif cassette and cassette.misses and args.replay_lenient:
+            logger.warning(f"⚠️  {cassette.misses} appels absents de la cassette (réponses vides)")
+        elif cassette and cassette.misses:
+            # Relecture stricte: le résultat ne reproduit pas l'enregistrement
+            logger.error(f"❌ {cassette.misses} appels absents de la cassette (options différentes de "
+                         f"l'enregistrement ?), relecture incomplète")
+            exit_code = 1
         
-        # 4. Génération du rapport
-        end_time = datetime.now()
-        report.processing_time = (end_time - start_time).total_seconds()
+        if profiler:
+            report.profile_lines = profiler.summary_lines()
+            logger.info(f"🔬 Profils écrits dans {args.profile_run}/ (.pstats, .collapsed)")
         
-        report.print_summary()
-        report.save_to_file()
+        # 4. Génération du rapport
+        if report.total_youtube_videos:
+            if args.log_format == 'json':
+                logger.info("📊 Résumé du transfert", extra={'event': 'summary', 'report': report.to_dict()})
+            else:
+                report.print_summary()
+            report.save_to_file()
         
-        # Code de retour
-        if len(found_tracks) == 0:
-            return 1  # Aucune piste trouvée
-        elif len(found_tracks) < len(videos) * 0.5:
-            return 2  # Moins de 50% de réussite
-        else:
-            return 0  # Succès
+        return exit_code
             
     except KeyboardInterrupt:
-        print("\n⚠️  Transfert interrompu par l'utilisateur")
+        logger.warning("⚠️  Transfert interrompu par l'utilisateur")
         return 130
     except Exception as e:
-        print(f"\n❌ Erreur inattendue: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Erreur inattendue: {e}")
         return 1
 
 